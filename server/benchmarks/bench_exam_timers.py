@@ -0,0 +1,175 @@
+"""
+Benchmark of exam timers with 10k simultaneous exams.
+
+``tasks`` path reproduces exam timers before ``ExamTimerService``: one sleeping ``asyncio.Task`` per exam. ``heap``
+path is ``ExamTimerService``. Both are measured for scheduling cost, memory held by pending timers and firing lateness.
+"""
+
+import asyncio
+import random
+import tracemalloc
+from datetime import datetime, UTC
+from time import perf_counter, time
+from typing import Any, Callable
+
+from common import measure, report
+
+from services.timer_service import ExamTimerService
+
+# Number of simulated exams
+EXAMS: int = 10_000
+# All deadlines fall into this window (seconds) when measuring lateness
+WINDOW: float = 2.0
+
+
+async def _schedule_tasks(deadlines: list[float]) -> list[asyncio.Task]:
+    """
+    Function, that starts one sleeping task per exam, like legacy ``handle_exam_timeout``.
+
+    :param deadlines: list of deadline timestamps
+    :return: list of started tasks
+    """
+
+    return [
+        asyncio.create_task(asyncio.sleep(deadline - time())) for deadline in deadlines
+    ]
+
+
+def _schedule_heap(service: ExamTimerService, deadlines: list[float]) -> None:
+    """
+    Function, that schedules exam timers in ``ExamTimerService``.
+
+    :param service: timer service instance
+    :param deadlines: list of deadline timestamps
+    """
+
+    for i, deadline in enumerate(deadlines):
+        service.schedule(str(i), datetime.fromtimestamp(deadline, UTC))
+
+
+def _deadlines(offset: float, window: float) -> list[float]:
+    """
+    Function, that generates random deadlines.
+
+    :param offset: seconds before the earliest deadline
+    :param window: seconds between the earliest and the latest deadline
+    :return: list of deadline timestamps
+    """
+
+    now = time()
+    return [now + offset + random.random() * window for _ in range(EXAMS)]
+
+
+async def _tasks_cycle() -> None:
+    """Function, that schedules and cancels ``EXAMS`` task timers."""
+
+    tasks = await _schedule_tasks(_deadlines(3600, 0))
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _heap_cycle() -> None:
+    """Function, that schedules and cancels ``EXAMS`` heap timers."""
+
+    service = ExamTimerService()
+    _schedule_heap(service, _deadlines(3600, 0))
+    for i in range(EXAMS):
+        service.cancel(str(i))
+
+
+async def _memory(heap: bool) -> int:
+    """
+    Function, that measures memory allocated by ``EXAMS`` pending timers.
+
+    :param heap: ``True`` to measure ``ExamTimerService``, ``False`` for tasks
+    :return: allocated bytes
+    """
+
+    deadlines = _deadlines(3600, 0)
+    tracemalloc.start()
+    if heap:
+        service = ExamTimerService()
+        _schedule_heap(service, deadlines)
+    else:
+        tasks = await _schedule_tasks(deadlines)
+        # Let tasks reach their sleep
+        await asyncio.sleep(0)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if not heap:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return allocated
+
+
+async def _lateness(heap: bool) -> list[float]:
+    """
+    Function, that measures how late timers fire, when all ``EXAMS`` deadlines fall into ``WINDOW`` seconds.
+
+    :param heap: ``True`` to measure ``ExamTimerService``, ``False`` for tasks
+    :return: sorted list of delays in seconds
+    """
+
+    deadlines = _deadlines(1, WINDOW)
+    delays = []
+
+    if heap:
+        done = asyncio.Event()
+
+        async def on_expire(telegram_ids: list[str]) -> None:
+            now = time()
+            delays.extend(now - deadlines[int(i)] for i in telegram_ids)
+            if len(delays) == EXAMS:
+                done.set()
+
+        service = ExamTimerService()
+        _schedule_heap(service, deadlines)
+        service.start(on_expire)
+        await done.wait()
+        await service.stop()
+    else:
+
+        async def timer(deadline: float) -> None:
+            await asyncio.sleep(deadline - time())
+            delays.append(time() - deadline)
+
+        await asyncio.gather(*(timer(deadline) for deadline in deadlines))
+
+    return sorted(delays)
+
+
+def benchmarks() -> dict[str, Callable[[], Any]]:
+    """
+    Function, that prepares benchmarked callables: schedule and cancel ``EXAMS`` timers.
+
+    :return: dictionary of benchmark names and callables
+    """
+
+    random.seed(0)
+    return {
+        f"timers.tasks_cycle_{EXAMS}": lambda: asyncio.run(_tasks_cycle()),
+        f"timers.heap_cycle_{EXAMS}": lambda: asyncio.run(_heap_cycle()),
+    }
+
+
+def main() -> None:
+    """Function, that runs all measurements and prints results."""
+
+    report({name: measure(func, repeat=3) for name, func in benchmarks().items()})
+    for name, heap in (("tasks", False), ("heap", True)):
+        allocated = asyncio.run(_memory(heap))
+        start = perf_counter()
+        delays = asyncio.run(_lateness(heap))
+        elapsed = perf_counter() - start
+        print(
+            f"timers.{name}: {allocated / 1024:.0f} KiB pending, "
+            f"lateness p50={delays[len(delays) // 2] * 1e3:.2f} ms "
+            f"p99={delays[int(len(delays) * 0.99)] * 1e3:.2f} ms "
+            f"max={delays[-1] * 1e3:.2f} ms, run {elapsed:.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Benchmark of pure CPU-bound helpers, which run on every update.
+
+Inputs are taken from ``static/parsed.json``: answers and titles of questions, titles of themes. Full names of users
+are built from words of question titles, so transliteration gets realistic Cyrillic text.
+"""
+
+import itertools
+import logging
+import random
+from typing import Any, Callable
+
+from common import SERVER_DIR, build_catalog_entries, load_bank, measure, report
+
+from aiogram.types import CallbackQuery, Chat, Message, PollAnswer, User
+from catalog.storage import CATALOG
+from database.models import ThemeProgress
+from enums.logs import Logs
+from enums.markups import Markups
+from handlers.exam_handler import exam_question_text
+from handlers.quiz_handler import quiz_question_text
+from loggers.setup import CustomFormatter, JsonFormatter
+from middlewares.miscellaneous import collect_username
+from services.utility_service import (
+    parse_answers_from_question,
+    parse_answers_from_poll,
+    transliterate,
+)
+
+# Number of prepared inputs of each kind, benchmarks cycle through them
+INPUTS: int = 500
+
+
+def _full_names(titles: list[str]) -> list[str]:
+    """
+    Function, that builds Cyrillic full names from words of question titles.
+
+    :param titles: titles of questions
+    :return: list of full names
+    """
+
+    words = [
+        word.strip(".,:;()«»?").capitalize()
+        for title in titles
+        for word in title.split()
+        if len(word) > 3 and word.isalpha()
+    ]
+    return [f"{words[i]} {words[i + 1]}" for i in range(0, 2 * INPUTS, 2)]
+
+
+def _events(names: list[str]) -> list[tuple[Message | CallbackQuery | PollAnswer, str]]:
+    """
+    Function, that creates events for ``collect_username``: without username (transliterated) and with username.
+
+    :param names: full names of users
+    :return: list of events and their flags
+    """
+
+    events = []
+    for i, name in enumerate(names):
+        first_name, last_name = name.split(" ")
+        user = User(
+            id=100000 + i,
+            is_bot=False,
+            first_name=first_name,
+            last_name=last_name,
+            username=None if i % 2 else f"user_{i}",
+        )
+        chat = Chat(id=user.id, type="private")
+        message = Message(
+            message_id=i, date=0, chat=chat, from_user=user, text="/start"
+        )
+        match i % 3:
+            case 0:
+                events.append((message, "m"))
+            case 1:
+                events.append(
+                    (
+                        CallbackQuery(
+                            id=str(i),
+                            from_user=user,
+                            chat_instance="x",
+                            message=message,
+                            data="quiz",
+                        ),
+                        "q",
+                    )
+                )
+            case _:
+                events.append((PollAnswer(poll_id="1", user=user, option_ids=[0]), "p"))
+    return events
+
+
+def _records(names: list[str]) -> list[logging.LogRecord]:
+    """
+    Function, that creates records like ``LoggingMiddleware`` does for callbacks.
+
+    :param names: full names of users
+    :return: list of log records
+    """
+
+    pathname = str(SERVER_DIR / "src" / "middlewares" / "log_middleware.py")
+    return [
+        logging.LogRecord(
+            name="root",
+            level=logging.INFO,
+            pathname=pathname,
+            lineno=66,
+            msg=f'[🔓{Logs.CALLBACK}] Callback "quiz" from {100000 + i}@'
+            f'{transliterate(name.replace(" ", "_")).lower()} in 0.01234',
+            args=None,
+            exc_info=None,
+            func="__call__",
+        )
+        for i, name in enumerate(names)
+    ]
+
+
+def benchmarks() -> dict[str, Callable[[], Any]]:
+    """
+    Function, that prepares benchmarked callables. Each call handles one input.
+
+    :return: dictionary of benchmark names and callables
+    """
+
+    random.seed(0)
+    bank = load_bank()
+    sections, themes, questions = build_catalog_entries(bank)
+    CATALOG.fill(sections, themes, questions)
+    sample = random.sample(questions, INPUTS)
+    names = _full_names([q.title for q in sample])
+
+    raw_answers = itertools.cycle([list(q.answers) for q in sample])
+    poll_answers = itertools.cycle(
+        [
+            (
+                parse_answers_from_question(list(q.answers))[0],
+                sorted(random.sample(range(len(q.rendered.poll_options)), 2)),
+            )
+            for q in sample
+            if len(q.rendered.poll_options) > 1
+        ]
+    )
+    names_cycle = itertools.cycle(names)
+    events = itertools.cycle(_events(names))
+    records = _records(names)
+    color, plain, json_ = (
+        CustomFormatter(),
+        CustomFormatter(colored=False),
+        JsonFormatter(),
+    )
+    records_cycle = itertools.cycle(records)
+    theme_states = itertools.cycle(
+        [
+            (random.choice(themes), random.choice(list(ThemeProgress)))
+            for _ in range(INPUTS)
+        ]
+    )
+    pages = itertools.cycle(
+        [
+            (section.id, page, random.getrandbits(10))
+            for section in sections
+            for page in range(1, len(CATALOG.themes_by_section[section.id]) // 5 + 2)
+        ]
+    )
+    quiz_texts = itertools.cycle(
+        [(i % 35, 35, q.theme.title, q) for i, q in enumerate(sample)]
+    )
+    exam_texts = itertools.cycle([(i % 35, 35, q) for i, q in enumerate(sample)])
+    themes_page_markup = Markups.themes_page_markup.__wrapped__
+
+    return {
+        "hot.parse_answers_from_question": lambda: parse_answers_from_question(
+            next(raw_answers)
+        ),
+        "hot.parse_answers_from_poll": lambda: parse_answers_from_poll(
+            *next(poll_answers)
+        ),
+        "hot.transliterate": lambda: transliterate(next(names_cycle)),
+        "hot.collect_username": lambda: collect_username(*next(events)),
+        "hot.format_color": lambda: color.format(next(records_cycle)),
+        "hot.format_plain": lambda: plain.format(next(records_cycle)),
+        "hot.format_json": lambda: json_.format(next(records_cycle)),
+        "hot.sections_markup": lambda: Markups.sections_markup(sections),
+        "hot.theme_chosen_markup": lambda: Markups.theme_chosen_markup(
+            *next(theme_states)
+        ),
+        "hot.next_question_markup": lambda: Markups.next_question_markup(True, "quiz"),
+        "hot.themes_page_markup": lambda: themes_page_markup(*next(pages)),
+        "hot.quiz_question_text": lambda: quiz_question_text(*next(quiz_texts)),
+        "hot.exam_question_text": lambda: exam_question_text(*next(exam_texts)),
+    }
+
+
+if __name__ == "__main__":
+    report({name: measure(func) for name, func in benchmarks().items()})
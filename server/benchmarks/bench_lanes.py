@@ -0,0 +1,121 @@
+"""
+Benchmark of per-user lanes and check of double tap detection.
+
+Each call handles ``UPDATES`` callback updates of ``USERS`` users through ``UserLanes``. Run directly, script also
+checks, that a tap on the same button of another message goes through while the first tap is still handled, and that a
+second tap on the same message is dropped. Script exits with 1, if check fails.
+"""
+
+import asyncio
+import sys
+from datetime import datetime, UTC
+from typing import Any, Callable
+
+from aiogram.types import CallbackQuery, Chat, Message, User
+
+from common import measure, report
+
+from middlewares.lane_middleware import callback_key
+from services.lanes import UserLanes
+
+# Number of updates per call
+UPDATES: int = 10_000
+# Number of users, which send updates
+USERS: int = 100
+
+
+def _callback(user_id: int, message_id: int, data: str) -> CallbackQuery:
+    """
+    Function, that creates callback query of a button, pressed under bot's message.
+
+    :param user_id: Telegram id of user
+    :param message_id: id of message with the button
+    :param data: data of the button
+    :return: ``CallbackQuery`` object
+    """
+
+    user = User(id=user_id, is_bot=False, first_name="bench")
+    return CallbackQuery(
+        id=f"{user_id}:{message_id}:{data}",
+        from_user=user,
+        chat_instance="bench",
+        data=data,
+        message=Message(
+            message_id=message_id,
+            date=datetime.now(UTC),
+            chat=Chat(id=user_id, type="private"),
+        ),
+    )
+
+
+async def _updates(callbacks: list[CallbackQuery]) -> None:
+    """
+    Function, that handles callbacks concurrently in lanes of their users, like ``LaneMiddleware`` does.
+
+    :param callbacks: list of callback queries
+    """
+
+    lanes = UserLanes()
+
+    async def handle() -> None:
+        await asyncio.sleep(0)
+
+    await asyncio.gather(
+        *(
+            lanes.run(callback.from_user.id, key, handle)
+            for callback in callbacks
+            if not lanes.is_duplicate(
+                callback.from_user.id, key := callback_key(callback)
+            )
+        )
+    )
+
+
+def benchmarks() -> dict[str, Callable[[], Any]]:
+    """
+    Function, that prepares benchmarked callables.
+
+    :return: dictionary of benchmark names and callables
+    """
+
+    callbacks = [_callback(i % USERS, i, "next") for i in range(UPDATES)]
+    return {f"lanes.callbacks_{UPDATES}": lambda: asyncio.run(_updates(callbacks))}
+
+
+async def _double_taps() -> dict[str, bool]:
+    """
+    Function, that taps buttons with the same data while the first tap is still handled.
+
+    :return: dictionary of tap names and flags, whether tap was dropped as duplicate
+    """
+
+    lanes = UserLanes()
+    release = asyncio.Event()
+    first = _callback(1, 10, "next")
+    first_key = callback_key(first)
+    running = asyncio.create_task(lanes.run(1, first_key, release.wait))
+    await asyncio.sleep(0)
+
+    dropped = {
+        "same data, other message": lanes.is_duplicate(
+            1, callback_key(_callback(1, 11, "next"))
+        ),
+        "same data, same message": lanes.is_duplicate(
+            1, callback_key(_callback(1, 10, "next"))
+        ),
+    }
+    release.set()
+    await running
+    return dropped
+
+
+if __name__ == "__main__":
+    report({name: measure(func) for name, func in benchmarks().items()})
+    print()
+    dropped = asyncio.run(_double_taps())
+    expected = {"same data, other message": False, "same data, same message": True}
+    width = max(len(name) for name in dropped)
+    for name, is_dropped in dropped.items():
+        print(f"{name:<{width}}  {'dropped' if is_dropped else 'handled'}")
+    if dropped != expected:
+        sys.exit(1)
@@ -0,0 +1,209 @@
+"""
+Benchmark of logging pipeline.
+
+``legacy`` path reproduces ``CustomFormatter`` before the queue pipeline: regex compiled per record, several
+whole-message replaces and synchronous write from the caller. Other paths are ``loggers.setup`` formatters, written
+synchronously and through ``LazyQueueHandler``. Output goes to ``os.devnull``.
+
+For every path the cost of ``logger.info`` in the calling thread (event loop) is reported, for queued paths also
+the throughput of the listener thread. ``slow stdout`` paths write to a stream, which blocks for ``SLOW_WRITE`` seconds
+on every write, like a full pipe to a log collector does.
+"""
+
+import logging
+import os
+import queue
+import re
+import time
+from logging.handlers import QueueListener
+from time import perf_counter
+
+import common  # noqa: F401 (sets up ``sys.path`` and env)
+
+from enums.colors import Colors, LOG_LEVLES
+from enums.logs import Logs
+from loggers.setup import (
+    CustomFormatter,
+    JsonFormatter,
+    LazyQueueHandler,
+    RateLimitFilter,
+    RATE_LIMITED,
+)
+
+# Records per measurement
+RECORDS: int = 50_000
+# Duration of one write to slow stream
+SLOW_WRITE: float = 0.0001
+FMT: str = (
+    "[%(levelname)s:%(name)s] ...%(pathname)s/%(filename)s in %(funcName)s:%(lineno)s "
+    "%(message)s"
+)
+
+
+class LegacyFormatter(logging.Formatter):
+    """Copy of ``CustomFormatter`` before the queue pipeline."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Overriden function ``format`` from parent class.
+
+        :param record: ``logging.LogRecord`` instance
+        :return: formatted string
+        """
+
+        lvl_color = LOG_LEVLES.get(record.levelname, Colors.END)
+        username_color = Colors.LIGHT_BLUE
+        message_color = Colors.WHITE
+        path_color = Colors.LIGHT_CYAN
+        reset = Colors.END
+
+        if "src" not in (parts := record.pathname.split(os.sep)):
+            record.pathname = "venv"
+        else:
+            src_dir_id = len(parts) - 1 - parts[::-1].index("src")
+            record.pathname = "/".join(parts[src_dir_id:-1])
+        if record.funcName == "<module>":
+            record.funcName = "root"
+        record.name = record.name.split(".")[0]
+        msg = super().format(record)
+
+        lvl_str = "[" + record.levelname + ":" + record.name + "]"
+        path_str = (
+            "..."
+            + record.pathname
+            + "/"
+            + record.filename
+            + " in "
+            + record.funcName
+            + ":"
+            + str(record.lineno)
+        )
+
+        msg = msg.replace(lvl_str, f"{lvl_color}{lvl_str}{reset}")
+        msg = msg.replace(path_str, f"{path_color}{path_str}{reset}")
+        msg = msg.replace(record.message, f"{message_color}{record.message}{reset}")
+
+        at_pattern = re.compile(r"(@\w+)")
+        msg = at_pattern.sub(f"{username_color}\\1{reset}{message_color}", msg)
+
+        return msg
+
+
+class SlowStream:
+    """Stream, which blocks on every write."""
+
+    def write(self, _text: str) -> None:
+        """
+        Method, that imitates blocked write.
+
+        :param _text: written text
+        """
+
+        time.sleep(SLOW_WRITE)
+
+    def flush(self) -> None:
+        """Method, that does nothing."""
+
+
+def _logger(name: str, handler: logging.Handler) -> logging.Logger:
+    """
+    Function, that creates isolated logger with single handler.
+
+    :param name: logger name
+    :param handler: handler of logger
+    :return: logger
+    """
+
+    logger = logging.getLogger(f"bench.{name}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def _record_flags(enabled: bool) -> None:
+    """
+    Function, that switches collection of record attributes, which ``loggers.setup`` disables.
+
+    :param enabled: collect attributes or not
+    """
+
+    logging.logThreads = enabled
+    logging.logProcesses = enabled
+    logging.logMultiprocessing = enabled
+    logging.logAsyncioTasks = enabled
+
+
+def _emit(logger: logging.Logger, template: str | None = None) -> float:
+    """
+    Function, that logs ``RECORDS`` records, like middleware and handlers do.
+
+    :param logger: logger
+    :param template: template with lazy argument, pre-formatted event lines are logged if not specified
+    :return: seconds spent in calling thread
+    """
+
+    start = perf_counter()
+    for i in range(RECORDS):
+        if template is None:
+            logger.info(
+                f'[🔓📞] Callback "quiz_{i}" from {100000 + i}@user{i} in 0.01234'
+            )
+        else:
+            logger.info(template, f"{100000 + i}@user{i}")
+    return perf_counter() - start
+
+
+def main() -> None:
+    """Function, that runs all paths and prints results."""
+
+    devnull = open(os.devnull, "w", encoding="utf-8")
+    results: list[tuple[str, float, float | None]] = []
+
+    def sync_path(name: str, formatter: logging.Formatter, stream=devnull) -> None:
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(formatter)
+        # Legacy setup collected all record attributes
+        _record_flags(isinstance(formatter, LegacyFormatter))
+        results.append((name, _emit(_logger(name, handler)), None))
+        _record_flags(False)
+
+    def queued_path(
+        name: str,
+        formatter: logging.Formatter,
+        template: str | None = None,
+        stream=devnull,
+    ) -> None:
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(formatter)
+        queue_handler = LazyQueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(RateLimitFilter(20, RATE_LIMITED))
+        listener = QueueListener(queue_handler.queue, handler)
+        listener.start()
+        start = perf_counter()
+        caller = _emit(_logger(name, queue_handler), template)
+        listener.stop()
+        results.append((name, caller, perf_counter() - start))
+
+    sync_path("legacy, sync", LegacyFormatter(fmt=FMT))
+    sync_path("color, sync", CustomFormatter())
+    sync_path("json, sync", JsonFormatter())
+    queued_path("color, queue", CustomFormatter())
+    queued_path("plain, queue", CustomFormatter(colored=False))
+    queued_path("json, queue", JsonFormatter())
+    queued_path("json, queue, CORRECT_ANS", JsonFormatter(), Logs.CORRECT_ANS)
+    sync_path("legacy, sync, slow stdout", LegacyFormatter(fmt=FMT), SlowStream())
+    queued_path("color, queue, slow stdout", CustomFormatter(), stream=SlowStream())
+
+    print(f"{RECORDS} records")
+    print(f"{'path':<30}{'caller rec/s':>16}{'caller us/rec':>16}{'total rec/s':>16}")
+    for name, caller, total in results:
+        print(
+            f"{name:<30}{RECORDS / caller:>16,.0f}{caller / RECORDS * 1e6:>16.2f}"
+            f"{RECORDS / (total or caller):>16,.0f}"
+        )
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
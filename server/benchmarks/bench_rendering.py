@@ -0,0 +1,66 @@
+"""
+Benchmark of per-update CPU spent on question rendering and grading.
+
+``legacy`` path is what handlers did on each question send and poll answer before precompilation, ``precompiled`` path
+is what they do now with ``QuestionEntry.rendered``.
+"""
+
+import itertools
+import random
+from typing import Any, Callable
+
+from common import load_bank, measure, report
+
+from catalog.rendering import render_question
+from services.utility_service import (
+    parse_answers_from_question,
+    parse_answers_from_poll,
+)
+
+
+def benchmarks() -> dict[str, Callable[[], Any]]:
+    """
+    Function, that prepares benchmarked callables. Each call handles one "update" (question send + poll answer).
+
+    :return: dictionary of benchmark names and callables
+    """
+
+    random.seed(0)
+    bank = load_bank()
+    legacy_questions = itertools.cycle(
+        [(answers, correct, [0, 1]) for *_, answers, correct in bank]
+    )
+    precompiled_questions = itertools.cycle(
+        [(render_question(answers, correct), [0, 1]) for *_, answers, correct in bank]
+    )
+
+    def legacy() -> bool:
+        raw_answers, correct, option_ids = next(legacy_questions)
+        # Question send
+        answers, answers_str = parse_answers_from_question(raw_answers)
+        _ = [ans.lower()[:2] for ans in answers]
+        # Poll answer
+        answers, _ = parse_answers_from_question(raw_answers)
+        selected = parse_answers_from_poll(answers, option_ids)
+        return selected == "".join(sorted(correct))
+
+    def precompiled() -> bool:
+        rendered, option_ids = next(precompiled_questions)
+        # Question send
+        _ = rendered.answers_html
+        _ = list(rendered.poll_options)
+        # Poll answer
+        return rendered.is_correct(option_ids)
+
+    return {
+        "rendering.legacy_update": legacy,
+        "rendering.precompiled_update": precompiled,
+    }
+
+
+if __name__ == "__main__":
+    results = {name: measure(func) for name, func in benchmarks().items()}
+    report(results)
+    print(
+        f"speedup: x{results['rendering.legacy_update'] / results['rendering.precompiled_update']:.1f}"
+    )
@@ -0,0 +1,94 @@
+"""
+Benchmark of exam session sampling on the real question bank and on synthetic banks 10x and 100x bigger.
+
+``legacy`` path reproduces ``init_exam_session`` before the sampling index: random question from each theme, answers
+parsed for every question and ``not in`` filtering over the whole bank. ``indexed`` path is ``SamplingIndex.sample``.
+"""
+
+import random
+from typing import Any, Callable
+
+from common import build_catalog_entries, load_bank, measure, report
+
+from catalog.sampling import EXAM_PROFILES
+from catalog.storage import Catalog
+from services.utility_service import parse_answers_from_question
+
+# Bank sizes relative to ``static/parsed.json``
+SCALES: tuple[int, ...] = (1, 10, 100)
+
+
+class _OrmLikeQuestion:
+    """Question without value-based ``__eq__``, same as ORM objects used by legacy code."""
+
+    __slots__ = ("id", "answers")
+
+    def __init__(self, q_id: int, answers: tuple[str, ...]) -> None:
+        self.id = q_id
+        self.answers = answers
+
+
+def _legacy_sample(questions_by_theme: dict[int, list[_OrmLikeQuestion]]) -> list[int]:
+    """
+    Function, that reproduces legacy exam sampling.
+
+    :param questions_by_theme: dictionary of theme ids and questions of that theme
+    :return: list of question ids
+    """
+
+    selected_questions = []
+    for questions in questions_by_theme.values():
+        if questions:
+            randomed_q = random.choice(questions)
+            if len(parse_answers_from_question(randomed_q.answers)[0]) <= 4:
+                selected_questions.append(randomed_q)
+
+    num_remaining_questions = 35 - len(selected_questions)
+    if num_remaining_questions > 0:
+        all_questions = [
+            q for questions in questions_by_theme.values() for q in questions
+        ]
+        remaining_questions = [
+            q
+            for q in all_questions
+            if q not in selected_questions
+            and len(parse_answers_from_question(q.answers)[0]) <= 4
+        ]
+        selected_questions.extend(
+            random.sample(remaining_questions, num_remaining_questions)
+        )
+    random.shuffle(selected_questions)
+    return [q.id for q in selected_questions]
+
+
+def benchmarks() -> dict[str, Callable[[], Any]]:
+    """
+    Function, that prepares benchmarked callables for each bank size.
+
+    :return: dictionary of benchmark names and callables
+    """
+
+    random.seed(0)
+    bank = load_bank()
+    profile = EXAM_PROFILES["default"]
+    result = {}
+    for scale in SCALES:
+        sections, themes, questions = build_catalog_entries(bank, scale)
+        catalog = Catalog()
+        catalog.fill(sections, themes, questions)
+
+        legacy_bank = {
+            theme_id: [_OrmLikeQuestion(q.id, q.answers) for q in theme_questions]
+            for theme_id, theme_questions in catalog.questions_by_theme.items()
+        }
+        result[f"sampling.legacy_x{scale}"] = (
+            lambda legacy_bank=legacy_bank: _legacy_sample(legacy_bank)
+        )
+        result[f"sampling.indexed_x{scale}"] = (
+            lambda catalog=catalog: catalog.sampling.sample(profile)
+        )
+    return result
+
+
+if __name__ == "__main__":
+    report({name: measure(func, repeat=3) for name, func in benchmarks().items()})
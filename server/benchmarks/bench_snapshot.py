@@ -0,0 +1,36 @@
+"""
+Benchmark of catalog cold start.
+
+``render`` is CPU part of loading catalog from DB (rendering of every question, without DB round trips and ORM
+hydration), ``snapshot`` is reading of the whole catalog from binary snapshot. Each call loads the whole bank.
+"""
+
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+from common import build_catalog_entries, load_bank, measure, report
+
+from catalog.snapshot import read_snapshot, write_snapshot
+
+
+def benchmarks() -> dict[str, Callable[[], Any]]:
+    """
+    Function, that prepares benchmarked callables.
+
+    :return: dictionary of benchmark names and callables
+    """
+
+    bank = load_bank()
+    entries = build_catalog_entries(bank)
+    path = Path(tempfile.mkdtemp()) / "catalog.snapshot"
+    write_snapshot(path, 1, *entries)
+
+    return {
+        "catalog.render": lambda: build_catalog_entries(bank),
+        "catalog.snapshot": lambda: read_snapshot(path, 1),
+    }
+
+
+if __name__ == "__main__":
+    report({name: measure(func) for name, func in benchmarks().items()})
@@ -0,0 +1,110 @@
+"""
+Benchmark of storage backends, which don't need a DB server.
+
+Each ``answers`` call is ``ANSWERS`` answers to quiz questions, as ``ContextMiddleware`` and ``on_poll_answer`` do it:
+user with session is read, answer is recorded and message ids are saved. Each ``reads`` call is ``ANSWERS`` reads of
+user with session only. SQLite database is created in a temporary folder, its
+connections are closed after each call (connection threads would keep the process alive), so one connect is included.
+"""
+
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+from common import measure, report
+
+from repositories.base import Repository
+from repositories.memory import MemoryRepository
+from repositories.sqlite import SqliteRepository
+
+# Telegram id of benchmarked user
+TELEGRAM_ID: str = "100000"
+# Number of answers per call
+ANSWERS: int = 100
+
+
+async def _prepare(repository: Repository) -> int:
+    """
+    Function, that fills storage and creates quiz session of benchmarked user.
+
+    :param repository: storage instance
+    :return: id of created session
+    """
+
+    await repository.start()
+    sections, themes, questions = await repository.read_catalog()
+    await repository.create_session(
+        TELEGRAM_ID,
+        theme_id=themes[0].id,
+        incorrect_questions=[],
+        questions_queue=[q.id for q in questions if q.theme_id == themes[0].id],
+        questions_total=0,
+        hints=0,
+        hints_total=0,
+        progress=0,
+    )
+    user = await repository.get_user_with_session(TELEGRAM_ID)
+    await repository.close()
+    return user.session.id
+
+
+async def _answers(repository: Repository, session_id: int) -> None:
+    """
+    Function, that handles ``ANSWERS`` answers one by one.
+
+    :param repository: storage instance
+    :param session_id: id of user's session
+    """
+
+    for _ in range(ANSWERS):
+        user = await repository.get_user_with_session(TELEGRAM_ID)
+        await repository.record_answer(
+            session_id,
+            user.session.progress,
+            user.session.questions_queue[0],
+            True,
+            1,
+        )
+        await repository.save_session_msgs(session_id, {"q": 2, "p": 3})
+    await repository.close()
+
+
+async def _reads(repository: Repository) -> None:
+    """
+    Function, that reads user with session ``ANSWERS`` times one by one.
+
+    :param repository: storage instance
+    """
+
+    for _ in range(ANSWERS):
+        await repository.get_user_with_session(TELEGRAM_ID)
+    await repository.close()
+
+
+def benchmarks() -> dict[str, Callable[[], Any]]:
+    """
+    Function, that prepares benchmarked callables.
+
+    :return: dictionary of benchmark names and callables
+    """
+
+    loop = asyncio.new_event_loop()
+    path = Path(tempfile.mkdtemp()) / "bench.sqlite3"
+    result = {}
+    for name, repository in (
+        ("memory", MemoryRepository([TELEGRAM_ID])),
+        ("sqlite", SqliteRepository(str(path), [TELEGRAM_ID])),
+    ):
+        session_id = loop.run_until_complete(_prepare(repository))
+        result[f"storage.{name}_reads_{ANSWERS}"] = (
+            lambda r=repository: loop.run_until_complete(_reads(r))
+        )
+        result[f"storage.{name}_answers_{ANSWERS}"] = (
+            lambda r=repository, s=session_id: loop.run_until_complete(_answers(r, s))
+        )
+    return result
+
+
+if __name__ == "__main__":
+    report({name: measure(func) for name, func in benchmarks().items()})
@@ -0,0 +1,169 @@
+"""
+Benchmark of single-statement writes of ``entities_service`` on SQLite storage.
+
+Each call is ``WRITES`` calls of one write method, connections are closed after each call (see ``bench_storage``). Run
+directly, script also prints the number of DB queries per write and exits with 1, if some write takes more than
+``MAX_QUERIES``: every write has to be a single ``UPDATE``, that computes and returns the new value on the DB side.
+"""
+
+import asyncio
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Coroutine
+
+from common import measure, report
+
+from repositories.base import Repository
+from repositories.sqlite import SqliteRepository
+from services.metrics_service import METRICS
+
+# Telegram id of benchmarked user
+TELEGRAM_ID: str = "100000"
+# Number of writes per call
+WRITES: int = 100
+# Allowed number of DB queries per write
+MAX_QUERIES: int = 1
+
+# Write method of storage, called with storage and id of user's session
+Writer = Callable[[Repository, int], Coroutine[Any, Any, Any]]
+
+# Number of answers recorded in each storage, it is the expected ``progress`` of the next answer
+_ANSWERS: Counter[Repository] = Counter()
+
+
+async def _record_answer(repository: Repository, session_id: int) -> Any:
+    """
+    Function, that records the next answer of user, so every call passes the check of expected ``progress``.
+
+    :param repository: storage instance
+    :param session_id: id of user's session
+    :return: new state of session
+    """
+
+    progress = _ANSWERS[repository]
+    _ANSWERS[repository] += 1
+    return await repository.record_answer(session_id, progress, 1, True, 2)
+
+
+# Benchmarked writes
+WRITERS: dict[str, Writer] = {
+    "changelog_seen": lambda r, _: r.changelog_seen(TELEGRAM_ID),
+    "set_username": lambda r, _: r.set_username(TELEGRAM_ID, "@bench"),
+    "change_hints_policy": lambda r, _: r.change_hints_policy(TELEGRAM_ID),
+    "increase_help_alert_counter": lambda r, _: r.increase_help_alert_counter(
+        TELEGRAM_ID
+    ),
+    "update_exam_best": lambda r, _: r.update_exam_best(TELEGRAM_ID, 1, "default"),
+    "decrease_hints": lambda r, _: r.decrease_hints(TELEGRAM_ID),
+    "record_answer": _record_answer,
+}
+
+
+async def _prepare(repository: Repository) -> int:
+    """
+    Function, that fills storage and creates quiz session of benchmarked user.
+
+    :param repository: storage instance
+    :return: id of created session
+    """
+
+    await repository.start()
+    await repository.create_session(
+        TELEGRAM_ID,
+        theme_id=1,
+        incorrect_questions=[],
+        questions_queue=[1],
+        questions_total=1,
+        hints=0,
+        hints_total=0,
+        progress=0,
+    )
+    user = await repository.get_user_with_session(TELEGRAM_ID)
+    await repository.close()
+    return user.session.id
+
+
+async def _writes(repository: Repository, writer: Writer, session_id: int) -> None:
+    """
+    Function, that calls write method ``WRITES`` times one by one.
+
+    :param repository: storage instance
+    :param writer: coroutine function, which calls write method of storage
+    :param session_id: id of user's session
+    """
+
+    for _ in range(WRITES):
+        await writer(repository, session_id)
+    await repository.close()
+
+
+def benchmarks() -> dict[str, Callable[[], Any]]:
+    """
+    Function, that prepares benchmarked callables.
+
+    :return: dictionary of benchmark names and callables
+    """
+
+    loop = asyncio.new_event_loop()
+    repository = SqliteRepository(
+        str(Path(tempfile.mkdtemp()) / "bench.sqlite3"), [TELEGRAM_ID]
+    )
+    session_id = loop.run_until_complete(_prepare(repository))
+    return {
+        f"writes.{name}_{WRITES}": (
+            lambda w=writer: loop.run_until_complete(_writes(repository, w, session_id))
+        )
+        for name, writer in WRITERS.items()
+    }
+
+
+async def _count_queries(
+    repository: Repository, writer: Writer, session_id: int
+) -> float:
+    """
+    Function, that counts DB queries of write method. First call opens connection and is not counted.
+
+    :param repository: storage instance
+    :param writer: coroutine function, which calls write method of storage
+    :param session_id: id of user's session
+    :return: number of queries per call
+    """
+
+    await writer(repository, session_id)
+    before = METRICS.db_queries
+    for _ in range(WRITES):
+        await writer(repository, session_id)
+    queries = METRICS.db_queries - before
+    await repository.close()
+    return queries / WRITES
+
+
+def count_queries() -> dict[str, float]:
+    """
+    Function, that counts DB queries of each write.
+
+    :return: dictionary of write names and queries per write
+    """
+
+    loop = asyncio.new_event_loop()
+    repository = SqliteRepository(
+        str(Path(tempfile.mkdtemp()) / "queries.sqlite3"), [TELEGRAM_ID]
+    )
+    session_id = loop.run_until_complete(_prepare(repository))
+    return {
+        name: loop.run_until_complete(_count_queries(repository, writer, session_id))
+        for name, writer in WRITERS.items()
+    }
+
+
+if __name__ == "__main__":
+    report({name: measure(func) for name, func in benchmarks().items()})
+    print()
+    queries = count_queries()
+    width = max(len(name) for name in queries)
+    for name, per_write in queries.items():
+        print(f"{name:<{width}}  {per_write:6.2f} queries/write")
+    if any(per_write > MAX_QUERIES for per_write in queries.values()):
+        sys.exit(1)
@@ -0,0 +1,136 @@
+"""
+Module with shared helpers for benchmark scripts.
+
+Benchmarks are run from the ``server`` folder, e.g. ``python benchmarks/bench_rendering.py``.
+"""
+
+import json
+import os
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable
+
+# Paths
+SERVER_DIR: Path = Path(__file__).resolve().parent.parent
+PARSED_JSON: Path = SERVER_DIR / "static" / "parsed.json"
+
+# Make ``src`` modules importable
+sys.path.insert(0, str(SERVER_DIR / "src"))
+
+# ``config`` module requires these variables, benchmarks never connect anywhere
+for _key, _value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "bench",
+    "DB_USER": "bench",
+    "DB_PASS": "bench",
+    "WEB_SERVER_PORT": "8080",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+
+def load_bank() -> list[tuple[str, str, str, list[str], str]]:
+    """
+    Function, that reads ``static/parsed.json`` and returns questions in the same shape as they are stored in DB.
+
+    Variants are split on commas, like PostgreSQL does with unquoted ``TEXT[]`` literals in ``questions.sql``.
+
+    :return: list of tuples (section title, theme title, question title, raw answers, correct answer)
+    """
+
+    with open(PARSED_JSON, encoding="utf-8") as f:
+        parsed = json.load(f)
+
+    bank = []
+    for section_title, themes in parsed.items():
+        for theme_title, questions in themes.items():
+            for title, question in questions.items():
+                raw_answers = [
+                    part.strip()
+                    for variant in question["variants"]
+                    for part in variant.split(",")
+                    if part.strip()
+                ]
+                bank.append(
+                    (
+                        section_title,
+                        theme_title,
+                        title,
+                        raw_answers,
+                        question["correct"],
+                    )
+                )
+    return bank
+
+
+def build_catalog_entries(
+    bank: list[tuple[str, str, str, list[str], str]], scale: int = 1
+) -> tuple[list, list, list]:
+    """
+    Function, that converts bank from ``load_bank`` into catalog entries.
+
+    With ``scale > 1`` the bank is synthetically enlarged: every question is repeated ``scale`` times inside its theme.
+
+    :param bank: result of ``load_bank``
+    :param scale: multiplier of questions count
+    :return: tuple of lists with ``SectionEntry``, ``ThemeEntry`` and ``QuestionEntry`` objects
+    """
+
+    from catalog.entries import SectionEntry, ThemeEntry, QuestionEntry
+    from catalog.rendering import render_question
+
+    sections: dict[str, SectionEntry] = {}
+    themes: dict[tuple[str, str], ThemeEntry] = {}
+    questions: list[QuestionEntry] = []
+    for copy in range(scale):
+        for section_title, theme_title, title, raw_answers, correct in bank:
+            if section_title not in sections:
+                sections[section_title] = SectionEntry(
+                    id=len(sections) + 1, title=section_title
+                )
+            if (key := (section_title, theme_title)) not in themes:
+                themes[key] = ThemeEntry(
+                    id=len(themes) + 1,
+                    title=theme_title,
+                    section_id=sections[section_title].id,
+                )
+            questions.append(
+                QuestionEntry(
+                    id=len(questions) + 1,
+                    title=title if not copy else f"{title} ({copy})",
+                    answers=tuple(raw_answers),
+                    correct_answer=correct,
+                    theme_id=themes[key].id,
+                    theme=themes[key],
+                    rendered=render_question(raw_answers, correct),
+                )
+            )
+    questions.sort(key=lambda q: (q.theme_id, q.id))
+    return list(sections.values()), list(themes.values()), questions
+
+
+def measure(func: Callable[[], Any], repeat: int = 5) -> float:
+    """
+    Function, that measures a single call of ``func``.
+
+    :param func: callable without arguments
+    :param repeat: how many times auto-ranged measurement is repeated
+    :return: best time of a single call in seconds
+    """
+
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def report(results: dict[str, float]) -> None:
+    """
+    Function, that prints benchmark results as a table.
+
+    :param results: dictionary of benchmark names and seconds per call
+    """
+
+    width = max(len(name) for name in results)
+    for name, seconds in results.items():
+        print(f"{name:<{width}}  {seconds * 1e6:12.3f} us/call")
@@ -0,0 +1,187 @@
+"""
+EXPLAIN-based comparison of hot queries before and after ``migrations/versions``.
+
+Script creates a scratch schema in the database from ``.env`` with the baseline layout (``telegram_id TEXT``, no
+indexes), fills it with 100k users, runs ``EXPLAIN (ANALYZE, BUFFERS)`` for the queries of ``entities_service``, applies
+migrations to the same schema and runs them again. Schema is dropped at the end.
+
+Run from the ``server`` folder: ``python benchmarks/explain_indexes.py``.
+"""
+
+import asyncio
+import json
+import random
+import statistics
+
+import common  # noqa: F401 (sets up ``sys.path`` and env)
+
+from database.connection import engine
+from database.migrations import MIGRATIONS_DIR
+
+# Scratch schema name
+SCHEMA: str = "bench_explain"
+# Table sizes
+USERS: int = 100_000
+SESSIONS: int = 20_000
+THEMES: int = 31
+QUESTIONS: int = 10_000
+# How many times each query is explained, median is reported
+REPEAT: int = 7
+
+# Baseline layout from ``createdb.sql`` before migrations
+BASELINE_DDL: str = """
+CREATE TABLE sections (id SERIAL PRIMARY KEY, title TEXT);
+CREATE TABLE themes (
+    id SERIAL PRIMARY KEY, section_id INTEGER REFERENCES sections(id), title TEXT
+);
+CREATE TABLE questions (
+    id SERIAL PRIMARY KEY, theme_id INTEGER REFERENCES themes(id), title TEXT,
+    answers TEXT[], correct_answer TEXT
+);
+CREATE TABLE users (
+    id SERIAL PRIMARY KEY, telegram_id TEXT, username TEXT, exam_best INTEGER DEFAULT 0,
+    checked_update BOOLEAN DEFAULT false, hints_allowed BOOLEAN DEFAULT true,
+    help_alert_counter INTEGER DEFAULT 0,
+    themes_tried INTEGER[] DEFAULT ARRAY[]::INTEGER[],
+    themes_done_full INTEGER[] DEFAULT ARRAY[]::INTEGER[],
+    themes_done_particular INTEGER[] DEFAULT ARRAY[]::INTEGER[]
+);
+CREATE TABLE sessions (
+    id SERIAL PRIMARY KEY, created_at TIMESTAMP DEFAULT NOW(),
+    user_id INTEGER REFERENCES users(id), theme_id INTEGER REFERENCES themes(id),
+    questions_queue INTEGER[], progress INTEGER, incorrect_questions INTEGER[],
+    questions_total INTEGER, hints INTEGER, hints_total INTEGER,
+    cur_q_msg INTEGER, cur_p_msg INTEGER, cur_a_msg INTEGER, cur_s_msg INTEGER
+);
+"""
+
+FILL: str = f"""
+INSERT INTO sections (title) SELECT 'section ' || i FROM generate_series(1, 3) i;
+INSERT INTO themes (section_id, title) SELECT i % 3 + 1, 'theme ' || i FROM generate_series(1, {THEMES}) i;
+INSERT INTO questions (theme_id, title, answers, correct_answer)
+    SELECT i % {THEMES} + 1, 'question ' || i, ARRAY['а) a;', 'б) b;', 'в) c.'], 'а'
+    FROM generate_series(1, {QUESTIONS}) i;
+INSERT INTO users (telegram_id, username)
+    SELECT (100000000 + i * 7919)::TEXT, '@user' || i FROM generate_series(1, {USERS}) i;
+INSERT INTO sessions (user_id, theme_id, questions_queue, progress, incorrect_questions, questions_total, hints,
+                      hints_total)
+    SELECT i * {USERS // SESSIONS}, i % {THEMES} + 1, ARRAY[1, 2, 3], 0, ARRAY[]::INTEGER[], 3, 0, 0
+    FROM generate_series(1, {SESSIONS}) i;
+ANALYZE;
+"""
+
+
+def _telegram_id(i: int) -> str:
+    """
+    Function, that returns Telegram id of i-th generated user.
+
+    :param i: number of user
+    :return: Telegram id
+    """
+
+    return str(100000000 + i * 7919)
+
+
+def _queries() -> dict[str, str]:
+    """
+    Function, that builds hot queries with random parameters, in the shape ``entities_service`` issues them.
+
+    :return: dictionary of query names and SQL
+    """
+
+    tid = _telegram_id(random.randrange(1, USERS + 1))
+    batch = ", ".join(
+        f"'{_telegram_id(random.randrange(1, USERS + 1))}'" for _ in range(100)
+    )
+    return {
+        "user_context": "SELECT users.*, sessions.* FROM users "
+        "LEFT OUTER JOIN sessions ON users.id = sessions.user_id "
+        f"WHERE users.telegram_id = '{tid}'",
+        "users_with_session_x100": "SELECT users.*, sessions.* FROM users "
+        "LEFT OUTER JOIN sessions ON users.id = sessions.user_id "
+        f"WHERE users.telegram_id IN ({batch})",
+        "session_by_user": "SELECT * FROM sessions "
+        f"WHERE user_id = {random.randrange(1, SESSIONS + 1) * (USERS // SESSIONS)}",
+        "questions_by_theme": "SELECT * FROM questions "
+        f"WHERE theme_id = {random.randrange(1, THEMES + 1)} ORDER BY id",
+    }
+
+
+async def _explain(driver) -> dict[str, tuple[str, float, float, int]]:
+    """
+    Function, that explains every hot query ``REPEAT`` times.
+
+    :param driver: asyncpg connection
+    :return: dictionary of query names and (plan root, median planning ms, median execution ms, shared buffers)
+    """
+
+    samples: dict[str, list[tuple[str, float, float, int]]] = {}
+    for _ in range(REPEAT):
+        for name, query in _queries().items():
+            raw = await driver.fetchval(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}"
+            )
+            # JSON codec may be already registered on connection by SQLAlchemy
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+            node = plan["Plan"]
+            # Show the scan, which reads users/sessions/questions
+            while node.get("Plans") and "Scan" not in node["Node Type"]:
+                node = node["Plans"][-1 if "Join" in node["Node Type"] else 0]
+            samples.setdefault(name, []).append(
+                (
+                    node["Node Type"],
+                    plan["Planning Time"],
+                    plan["Execution Time"],
+                    plan["Plan"].get("Shared Hit Blocks", 0)
+                    + plan["Plan"].get("Shared Read Blocks", 0),
+                )
+            )
+    return {
+        name: (
+            rows[0][0],
+            statistics.median(r[1] for r in rows),
+            statistics.median(r[2] for r in rows),
+            int(statistics.median(r[3] for r in rows)),
+        )
+        for name, rows in samples.items()
+    }
+
+
+async def main() -> None:
+    """Function, that runs the comparison and prints results."""
+
+    random.seed(0)
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        await driver.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await driver.execute(f"CREATE SCHEMA {SCHEMA}")
+        try:
+            await driver.execute(f"SET search_path TO {SCHEMA}")
+            await driver.execute(BASELINE_DDL)
+            await driver.execute(FILL)
+            before = await _explain(driver)
+
+            for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+                await driver.execute(path.read_text(encoding="utf-8"))
+            await driver.execute("ANALYZE")
+            after = await _explain(driver)
+        finally:
+            await driver.execute("SET search_path TO DEFAULT")
+            await driver.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await engine.dispose()
+
+    print(f"{USERS} users, {SESSIONS} sessions, {QUESTIONS} questions")
+    print(
+        f"{'query':<26}{'before':>34}{'after':>34}\n"
+        f"{'':<26}{'scan / exec ms / buffers':>34}{'scan / exec ms / buffers':>34}"
+    )
+    for name in before:
+        row = [name]
+        for scan, _, execution, buffers in (before[name], after[name]):
+            row.append(f"{scan} / {execution:.3f} / {buffers}")
+        print(f"{row[0]:<26}{row[1]:>34}{row[2]:>34}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
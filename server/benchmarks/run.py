@@ -0,0 +1,221 @@
+"""
+Runner of benchmark suite.
+
+Runs ``benchmarks()`` of every ``bench_*.py`` module, stores results in ``benchmarks/results`` as JSON (with commit,
+Python version and platform) and compares them with a baseline: the latest stored run or a specified file.
+
+Usage from the ``server`` folder::
+
+    python benchmarks/run.py                        # run all, compare with the latest run, save
+    python benchmarks/run.py -k hot. --no-save      # run benchmarks, which names contain "hot."
+    python benchmarks/run.py --baseline results/base.json --check   # exit with 1 on regression
+
+Benchmark is a regression, when it is slower than baseline by more than ``--threshold``. Runs are comparable only on
+the same machine and Python version, it is printed if they differ.
+"""
+
+import importlib
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+import click
+
+from common import SERVER_DIR, measure
+
+# Folder with benchmark modules
+BENCH_DIR: Path = Path(__file__).resolve().parent
+# Folder with stored runs
+RESULTS_DIR: Path = BENCH_DIR / "results"
+
+
+def _commit() -> str:
+    """
+    Function, that returns short hash of current commit, marked with ``+`` if working tree has changes.
+
+    :return: commit hash or ``unknown`` if git is not available
+    """
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=SERVER_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--", "src"],
+            cwd=SERVER_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("+" if dirty else "")
+
+
+def collect() -> dict[str, Callable[[], Any]]:
+    """
+    Function, that imports benchmark modules and collects their benchmarks.
+
+    Modules without ``benchmarks`` function (e.g. ``bench_logging.py`` with its own report) are skipped.
+
+    :return: dictionary of benchmark names and callables
+    """
+
+    result = {}
+    for path in sorted(BENCH_DIR.glob("bench_*.py")):
+        module = importlib.import_module(path.stem)
+        if callable(prepare := getattr(module, "benchmarks", None)):
+            result.update(prepare())
+    return result
+
+
+def load_baseline(baseline: str | None) -> dict[str, Any] | None:
+    """
+    Function, that loads stored run.
+
+    :param baseline: path to run, ``latest`` for the latest stored run, ``None`` for no comparison
+    :return: stored run or ``None`` if there is nothing to compare with
+    """
+
+    if baseline is None:
+        return None
+    if baseline == "latest":
+        if not (runs := sorted(RESULTS_DIR.glob("*.json"))):
+            return None
+        path = runs[-1]
+    else:
+        path = Path(baseline)
+        if not path.is_absolute() and not path.exists():
+            path = BENCH_DIR / path
+    with open(path, encoding="utf-8") as f:
+        run = json.load(f)
+    run["path"] = str(path)
+    return run
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, Any] | None, threshold: float
+) -> list[str]:
+    """
+    Function, that prints results with changes against baseline.
+
+    :param results: dictionary of benchmark names and seconds per call
+    :param baseline: stored run or ``None``
+    :param threshold: relative slowdown, which is a regression
+    :return: names of regressed benchmarks
+    """
+
+    base = baseline["results"] if baseline else {}
+    if baseline:
+        print(f"Baseline: {baseline['path']} (commit {baseline['commit']})")
+        if (
+            baseline.get("python") != platform.python_version()
+            or baseline.get("machine") != platform.machine()
+        ):
+            print("Warning: baseline was measured on another Python or machine")
+
+    width = max(len(name) for name in results)
+    regressions = []
+    print(f"{'benchmark':<{width}}  {'us/call':>12}  {'baseline':>12}  {'change':>8}")
+    for name, seconds in results.items():
+        line = f"{name:<{width}}  {seconds * 1e6:12.3f}"
+        if (before := base.get(name)) is not None:
+            change = seconds / before - 1
+            line += f"  {before * 1e6:12.3f}  {change:+8.1%}"
+            if change > threshold:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+    return regressions
+
+
+def store(results: dict[str, float]) -> Path:
+    """
+    Function, that stores run in ``RESULTS_DIR``.
+
+    :param results: dictionary of benchmark names and seconds per call
+    :return: path of stored run
+    """
+
+    commit = _commit()
+    now = datetime.now()
+    RESULTS_DIR.mkdir(exist_ok=True)
+    path = RESULTS_DIR / f"{now:%Y%m%d-%H%M%S}-{commit.rstrip('+')}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "commit": commit,
+                "created": now.isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "platform": platform.platform(),
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    return path
+
+
+@click.command
+@click.option("-k", "--filter", "name_filter", default="", help="Substring of names")
+@click.option("--repeat", default=5, show_default=True, help="Repeats of measurement")
+@click.option(
+    "--baseline",
+    default="latest",
+    show_default=True,
+    help="Stored run to compare with, path or 'latest'",
+)
+@click.option("--no-compare", is_flag=True, help="Don't compare with baseline")
+@click.option("--threshold", default=0.1, show_default=True, help="Regression, share")
+@click.option("--save/--no-save", default=True, show_default=True)
+@click.option("--check", is_flag=True, help="Exit with 1 if there are regressions")
+def main(
+    name_filter: str,
+    repeat: int,
+    baseline: str,
+    no_compare: bool,
+    threshold: float,
+    save: bool,
+    check: bool,
+) -> None:
+    """
+    Click-decorated function for benchmarks runner CLI.
+
+    :param name_filter: only benchmarks, which names contain this substring, are run
+    :param repeat: how many times auto-ranged measurement is repeated
+    :param baseline: stored run to compare with, path or ``latest``
+    :param no_compare: don't compare with baseline
+    :param threshold: relative slowdown, which is a regression
+    :param save: store run in ``RESULTS_DIR``
+    :param check: exit with ``1`` if there are regressions
+    """
+
+    previous = load_baseline(None if no_compare else baseline)
+    results = {
+        name: measure(func, repeat=repeat)
+        for name, func in collect().items()
+        if name_filter in name
+    }
+    if not results:
+        raise click.UsageError(f"No benchmarks match {name_filter!r}")
+
+    regressions = compare(results, previous, threshold)
+    if save:
+        print(f"Saved to {store(results)}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {threshold:.0%}")
+        if check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Module with shared helpers for load test scripts.
+
+Scripts are run from the ``server`` folder, e.g. ``python loadtest/driver.py``. DB settings are taken from ``.env``,
+like the bot does.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Paths
+SERVER_DIR: Path = Path(__file__).resolve().parent.parent
+
+# Make ``src`` modules importable
+sys.path.insert(0, str(SERVER_DIR / "src"))
+
+# ``config`` module requires this variable, load test never starts web server of the bot
+os.environ.setdefault("WEB_SERVER_PORT", "8080")
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """
+    Function, that returns percentile of samples (nearest rank).
+
+    :param samples: sorted list of samples
+    :param q: percentile in ``[0, 1]``
+    :return: value of percentile, ``0`` if there are no samples
+    """
+
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, max(0, round(q * len(samples)) - 1))]
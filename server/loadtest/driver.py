@@ -0,0 +1,601 @@
+"""
+Load test driver.
+
+Starts fake Bot API server (see ``fake_api.py``), seeds virtual users into DB and runs them through the bot:
+
+- ``quiz`` flow: ``/start`` → sections → section → theme → ``quiz_init`` → poll answers → ``quiz_end``;
+- ``exam`` flow: ``/exam`` → ``exam_init`` → poll answers → ``exam_end``.
+
+With ``--max-questions N`` user leaves the flow with ``/restart`` after N answers. Every step is an update, sent by the
+user, and its latency is time until the bot sends the message, which the user waits for (next keyboard or poll).
+
+The bot is started separately with the same ``.env`` and ``TG_API_SERVER`` pointing to the driver, e.g.::
+
+    python loadtest/driver.py --users 2000 --flow mixed
+    TG_API_SERVER=http://127.0.0.1:8081 SEND_GLOBAL_RATE=100000 python src/main.py --polling
+
+Updates are delivered with ``getUpdates`` (``--mode polling``) or posted to the webhook, which the bot sets on startup
+(``--mode webhook``). Rate limits of the bot (``SEND_GLOBAL_RATE``, ``SEND_CHAT_RATE``) apply as usual, raise them to
+measure the bot itself rather than Telegram limits.
+
+Report contains throughput, latency percentiles by step and average number of API calls per flow by method.
+"""
+
+import asyncio
+import random
+from collections import Counter, defaultdict
+from time import monotonic, time
+from typing import Any, Callable
+
+import click
+from aiohttp import ClientError, ClientSession, web
+
+import common  # noqa: F401 (sets up ``sys.path`` and env)
+from common import percentile
+from fake_api import FakeBotApi
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from database.connection import engine
+from database.models import User, UserSession
+
+# Rows per ``INSERT`` statement, when users are seeded
+SEED_BATCH: int = 1000
+# Seconds between webhook redeliveries, like Telegram does after non-2xx response
+REDELIVERY_DELAY: float = 1.0
+# Number of webhook delivery attempts
+REDELIVERY_ATTEMPTS: int = 10
+# Percentiles in report
+PERCENTILES: dict[str, float] = {"p50": 0.5, "p90": 0.9, "p99": 0.99, "max": 1.0}
+
+
+class Report:
+    """Results of load test."""
+
+    def __init__(self) -> None:
+        """Creates empty report."""
+
+        self.started = monotonic()
+        self.updates = 0
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.flows: dict[str, Counter[str]] = defaultdict(Counter)
+        self.flow_calls: dict[str, Counter[str]] = defaultdict(Counter)
+
+    def print(self, api: FakeBotApi) -> None:
+        """
+        Method, that prints report.
+
+        :param api: fake Bot API server with counters of calls
+        """
+
+        elapsed = monotonic() - self.started
+        print(f"\nElapsed {elapsed:.1f} s, {self.updates} updates")
+        print(f"Throughput {self.updates / elapsed:,.1f} updates/s")
+
+        print(f"\n{'flow':<8}{'completed':>12}{'failed':>10}")
+        for flow, counts in sorted(self.flows.items()):
+            print(f"{flow:<8}{counts['completed']:>12}{counts['failed']:>10}")
+
+        print(f"\n{'step':<12}{'count':>8}" + "".join(f"{h:>10}" for h in PERCENTILES))
+        for step, samples in sorted(self.samples.items()):
+            samples.sort()
+            print(
+                f"{step:<12}{len(samples):>8}"
+                + "".join(
+                    f"{percentile(samples, q) * 1000:>8.1f}ms"
+                    for q in PERCENTILES.values()
+                )
+            )
+
+        print("\nAPI calls per completed flow")
+        for flow, calls in sorted(self.flow_calls.items()):
+            completed = self.flows[flow]["completed"] or 1
+            print(
+                f"{flow:<8}"
+                + ", ".join(
+                    f"{method} {count / completed:.1f}"
+                    for method, count in calls.most_common()
+                )
+            )
+        print(
+            f"\nAPI calls total {sum(api.calls.values())}, "
+            f"injected errors {dict(api.errors) or 0}"
+        )
+
+
+def buttons(message: dict[str, Any]) -> list[str]:
+    """
+    Function, that returns callback data of inline buttons of message.
+
+    :param message: message, sent by the bot
+    :return: list of callback data
+    """
+
+    markup = message.get("reply_markup") or {}
+    return [
+        button["callback_data"]
+        for row in markup.get("inline_keyboard", [])
+        for button in row
+        if "callback_data" in button
+    ]
+
+
+def button(*prefixes: str) -> Callable[[dict[str, Any]], bool]:
+    """
+    Function, that creates predicate for message with button, which callback data starts with one of prefixes.
+
+    :param prefixes: prefixes of callback data
+    :return: predicate
+    """
+
+    return lambda message: any(data.startswith(prefixes) for data in buttons(message))
+
+
+def exact_button(*variants: str) -> Callable[[dict[str, Any]], bool]:
+    """
+    Function, that creates predicate for message with button, which callback data is one of variants.
+
+    :param variants: variants of callback data
+    :return: predicate
+    """
+
+    return lambda message: any(data in variants for data in buttons(message))
+
+
+def is_poll(message: dict[str, Any]) -> bool:
+    """
+    Function, that checks if message is poll.
+
+    :param message: message, sent by the bot
+    :return: ``True`` if message is poll
+    """
+
+    return "poll" in message
+
+
+class VirtualUser:
+    """User, which goes through flows of the bot."""
+
+    def __init__(
+        self,
+        index: int,
+        telegram_id: int,
+        api: FakeBotApi,
+        deliver: Callable[[dict[str, Any]], Any],
+        report: Report,
+        timeout: float,
+        think: float,
+        max_questions: int,
+    ) -> None:
+        """
+        Creates user.
+
+        :param index: index of user
+        :param telegram_id: Telegram id of user, also id of its chat
+        :param api: fake Bot API server
+        :param deliver: coroutine function, which delivers update to the bot
+        :param report: report for results
+        :param timeout: seconds to wait for the reply of the bot
+        :param think: maximum pause between steps in seconds
+        :param max_questions: user leaves flow after this number of answers, ``0`` - never
+        """
+
+        self.telegram_id = telegram_id
+        self.api = api
+        self.deliver = deliver
+        self.report = report
+        self.timeout = timeout
+        self.think = think
+        self.max_questions = max_questions
+        self.inbox = api.inbox(telegram_id)
+        self.user = {
+            "id": telegram_id,
+            "is_bot": False,
+            "first_name": f"Load {index}",
+            "username": f"lt{index}",
+        }
+
+    async def run(self, flow: str) -> None:
+        """
+        Method, that runs flow and records its result.
+
+        :param flow: ``quiz`` or ``exam``
+        """
+
+        before = Counter(self.api.chat_calls.get(self.telegram_id, {}))
+        try:
+            await (self.quiz() if flow == "quiz" else self.exam())
+        except TimeoutError:
+            self.report.flows[flow]["failed"] += 1
+            return
+        self.report.flows[flow]["completed"] += 1
+        self.report.flow_calls[flow] += (
+            Counter(self.api.chat_calls.get(self.telegram_id, {})) - before
+        )
+
+    async def quiz(self) -> None:
+        """Method, that goes through quiz flow."""
+
+        message = await self.step("start", self.command("/start"), button("pet"))
+        message = await self.step(
+            "pet", self.callback(message, "pet"), button("section_")
+        )
+        message = await self.step(
+            "section", self.click(message, "section_"), button("theme_")
+        )
+        message = await self.step(
+            "theme", self.click(message, "theme_"), button("quiz_init_")
+        )
+        poll = await self.step("quiz_init", self.click(message, "quiz_init_"), is_poll)
+        await self.answer_polls("quiz", poll)
+
+    async def exam(self) -> None:
+        """Method, that goes through exam flow."""
+
+        message = await self.step(
+            "exam_cmd", self.command("/exam"), button("exam_init")
+        )
+        poll = await self.step("exam_init", self.click(message, "exam_init"), is_poll)
+        await self.answer_polls("exam", poll)
+
+    async def answer_polls(self, mode: str, poll: dict[str, Any]) -> None:
+        """
+        Method, that answers polls until the end of session or until ``max_questions`` answers.
+
+        :param mode: ``quiz`` or ``exam``
+        :param poll: first poll of session
+        """
+
+        end = f"{mode}_end"
+        answered = 0
+        while True:
+            message = await self.step(
+                "answer", self.poll_answer(poll), exact_button(mode, end)
+            )
+            answered += 1
+            if end in buttons(message):
+                await self.step(end, self.callback(message, end), button("delete"))
+                return
+            if self.max_questions and answered >= self.max_questions:
+                await self.step("restart", self.command("/restart"), button("section_"))
+                return
+            poll = await self.step("next", self.callback(message, mode), is_poll)
+
+    async def step(
+        self,
+        name: str,
+        update: dict[str, Any],
+        expected: Callable[[dict[str, Any]], bool],
+    ) -> dict[str, Any]:
+        """
+        Method, that sends update and waits for expected reply of the bot. Other messages are skipped.
+
+        :param name: name of step in report
+        :param update: update without ``update_id``
+        :param expected: predicate for reply
+        :return: reply
+        """
+
+        if self.think:
+            await asyncio.sleep(random.uniform(0, self.think))
+
+        start = monotonic()
+        deadline = start + self.timeout
+        self.report.updates += 1
+        await self.deliver(update)
+        while True:
+            message = await asyncio.wait_for(
+                self.inbox.get(), max(0.0, deadline - monotonic())
+            )
+            if expected(message):
+                self.report.samples[name].append(monotonic() - start)
+                return message
+
+    def command(self, text: str) -> dict[str, Any]:
+        """
+        Method, that creates update with command.
+
+        :param text: command, e.g. ``/start``
+        :return: update without ``update_id``
+        """
+
+        return {
+            "message": {
+                "message_id": self.api.next_message_id(),
+                "date": int(time()),
+                "chat": {"id": self.telegram_id, "type": "private"},
+                "from": self.user,
+                "text": text,
+                "entities": [{"type": "bot_command", "offset": 0, "length": len(text)}],
+            }
+        }
+
+    def callback(self, message: dict[str, Any], data: str) -> dict[str, Any]:
+        """
+        Method, that creates update with pressed inline button.
+
+        :param message: message with button
+        :param data: callback data of button
+        :return: update without ``update_id``
+        """
+
+        return {
+            "callback_query": {
+                "id": str(self.api.next_message_id()),
+                "from": self.user,
+                "chat_instance": str(self.telegram_id),
+                "message": message,
+                "data": data,
+            }
+        }
+
+    def click(self, message: dict[str, Any], prefix: str) -> dict[str, Any]:
+        """
+        Method, that creates update with random pressed button, which callback data starts with prefix.
+
+        :param message: message with buttons
+        :param prefix: prefix of callback data
+        :return: update without ``update_id``
+        """
+
+        data = random.choice(
+            [data for data in buttons(message) if data.startswith(prefix)]
+        )
+        return self.callback(message, data)
+
+    def poll_answer(self, poll: dict[str, Any]) -> dict[str, Any]:
+        """
+        Method, that creates update with random answer to poll.
+
+        :param poll: message with poll
+        :return: update without ``update_id``
+        """
+
+        options = range(len(poll["poll"]["options"]))
+        return {
+            "poll_answer": {
+                "poll_id": poll["poll"]["id"],
+                "user": self.user,
+                "option_ids": sorted(random.sample(options, random.randint(1, 2))),
+            }
+        }
+
+
+async def seed_users(telegram_ids: list[int]) -> None:
+    """
+    Function, that creates virtual users in DB or resets them: changelog is seen, sessions are removed.
+
+    :param telegram_ids: Telegram ids of users
+    """
+
+    async with engine.begin() as conn:
+        for i in range(0, len(telegram_ids), SEED_BATCH):
+            rows = [
+                {
+                    "telegram_id": str(telegram_id),
+                    "username": f"@lt{index}",
+                    "exam_best": 0,
+                    "hints_allowed": True,
+                    "checked_update": True,
+                    "help_alert_counter": 1,
+                }
+                for index, telegram_id in enumerate(
+                    telegram_ids[i : i + SEED_BATCH], start=i
+                )
+            ]
+            statement = insert(User).values(rows)
+            await conn.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[User.telegram_id],
+                    set_={
+                        "checked_update": True,
+                        "help_alert_counter": 1,
+                        "username": statement.excluded.username,
+                    },
+                )
+            )
+        ids = [str(telegram_id) for telegram_id in telegram_ids]
+        await conn.execute(
+            delete(UserSession).where(
+                UserSession.user_id.in_(
+                    select(User.id).where(User.telegram_id.in_(ids))
+                )
+            )
+        )
+    await engine.dispose()
+
+
+def webhook_delivery(
+    http: ClientSession, api: FakeBotApi, url: str | None, secret: str | None
+) -> Callable[[dict[str, Any]], Any]:
+    """
+    Function, that creates delivery of updates to webhook of the bot.
+
+    Update is redelivered after non-2xx response or connection error, like Telegram does.
+
+    :param http: HTTP client session
+    :param api: fake Bot API server
+    :param url: URL of webhook, URL set by the bot is used if not specified
+    :param secret: secret token of webhook
+    :return: coroutine function, which delivers update
+    """
+
+    async def deliver(update: dict[str, Any]) -> None:
+        target, token = (url, secret) if url else api.webhook
+        headers = {"X-Telegram-Bot-Api-Secret-Token": token} if token else {}
+        update = api.new_update(update)
+        for _ in range(REDELIVERY_ATTEMPTS):
+            try:
+                async with http.post(target, json=update, headers=headers) as response:
+                    if response.status < 300:
+                        return
+            except ClientError:
+                pass
+            await asyncio.sleep(REDELIVERY_DELAY)
+
+    return deliver
+
+
+async def run(
+    users: int,
+    flow: str,
+    mode: str,
+    host: str,
+    port: int,
+    webhook_url: str | None,
+    webhook_secret: str | None,
+    api: FakeBotApi,
+    first_id: int,
+    ramp_up: float,
+    think: float,
+    timeout: float,
+    max_questions: int,
+    seed: bool,
+) -> None:
+    """
+    Function, that runs load test and prints report.
+
+    :param users: number of virtual users
+    :param flow: ``quiz``, ``exam`` or ``mixed``
+    :param mode: ``polling`` or ``webhook``
+    :param host: host of fake Bot API server
+    :param port: port of fake Bot API server
+    :param webhook_url: URL of webhook, URL set by the bot is used if not specified
+    :param webhook_secret: secret token of webhook
+    :param api: fake Bot API server
+    :param first_id: Telegram id of the first virtual user
+    :param ramp_up: seconds, during which users start
+    :param think: maximum pause between steps of user in seconds
+    :param timeout: seconds to wait for the reply of the bot
+    :param max_questions: user leaves flow after this number of answers, ``0`` - never
+    :param seed: create virtual users in DB
+    """
+
+    telegram_ids = list(range(first_id, first_id + users))
+    if seed:
+        await seed_users(telegram_ids)
+
+    runner = web.AppRunner(api.app())
+    await runner.setup()
+    await web.TCPSite(runner, host=host, port=port).start()
+    print(f"Fake Bot API on http://{host}:{port}, waiting for the bot...")
+
+    async with ClientSession() as http:
+        if mode == "webhook":
+            deliver = webhook_delivery(http, api, webhook_url, webhook_secret)
+            if webhook_url is None:
+                await api.connected.wait()
+        else:
+
+            async def deliver(update: dict[str, Any]) -> None:
+                api.push_update(update)
+
+            await api.connected.wait()
+
+        print(f"Bot connected, running {users} users")
+        report = Report()
+
+        async def start(index: int, telegram_id: int) -> None:
+            await asyncio.sleep(ramp_up * index / users)
+            user = VirtualUser(
+                index, telegram_id, api, deliver, report, timeout, think, max_questions
+            )
+            await user.run(flow if flow != "mixed" else random.choice(("quiz", "exam")))
+
+        await asyncio.gather(
+            *(
+                start(index, telegram_id)
+                for index, telegram_id in enumerate(telegram_ids)
+            )
+        )
+        report.print(api)
+
+    await runner.cleanup()
+
+
+@click.command
+@click.option("--users", default=1000, show_default=True)
+@click.option(
+    "--flow",
+    type=click.Choice(["quiz", "exam", "mixed"]),
+    default="mixed",
+    show_default=True,
+)
+@click.option(
+    "--mode",
+    type=click.Choice(["polling", "webhook"]),
+    default="polling",
+    show_default=True,
+)
+@click.option(
+    "--host", default="127.0.0.1", show_default=True, help="Fake Bot API host"
+)
+@click.option("--port", default=8081, show_default=True, help="Fake Bot API port")
+@click.option("--webhook-url", default=None, help="Default: URL set by the bot")
+@click.option("--webhook-secret", default=None)
+@click.option("--latency", default=0.05, show_default=True, help="Bot API latency, s")
+@click.option("--jitter", default=0.02, show_default=True, help="Bot API jitter, s")
+@click.option(
+    "--error-rate", default=0.0, show_default=True, help="Share of 500 errors"
+)
+@click.option(
+    "--flood-rate", default=0.0, show_default=True, help="Share of 429 errors"
+)
+@click.option("--first-id", default=7_000_000_000, show_default=True)
+@click.option("--ramp-up", default=10.0, show_default=True, help="Seconds")
+@click.option(
+    "--think", default=0.5, show_default=True, help="Max pause between steps, s"
+)
+@click.option("--timeout", default=30.0, show_default=True, help="Reply timeout, s")
+@click.option("--max-questions", default=0, show_default=True, help="0 - whole session")
+@click.option(
+    "--seed/--no-seed", default=True, show_default=True, help="Seed users to DB"
+)
+def main(
+    users: int,
+    flow: str,
+    mode: str,
+    host: str,
+    port: int,
+    webhook_url: str | None,
+    webhook_secret: str | None,
+    latency: float,
+    jitter: float,
+    error_rate: float,
+    flood_rate: float,
+    first_id: int,
+    ramp_up: float,
+    think: float,
+    timeout: float,
+    max_questions: int,
+    seed: bool,
+) -> None:
+    """
+    Click-decorated function for load test CLI.
+
+    Parameters are described in ``--help`` and in ``run`` function.
+    """
+
+    asyncio.run(
+        run(
+            users,
+            flow,
+            mode,
+            host,
+            port,
+            webhook_url,
+            webhook_secret,
+            FakeBotApi(latency, jitter, error_rate, flood_rate),
+            first_id,
+            ramp_up,
+            think,
+            timeout,
+            max_questions,
+            seed,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
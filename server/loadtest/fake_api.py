@@ -0,0 +1,320 @@
+"""
+Fake Telegram Bot API server for load tests.
+
+Implements methods, which the bot calls: ``sendMessage``, ``sendPoll``, ``deleteMessage(s)``,
+``editMessageReplyMarkup``, ``answerCallbackQuery``, and also ``getMe``, ``getUpdates``, ``setWebhook`` and
+``deleteWebhook``. Other methods return ``true``. Every chat method waits for configurable latency and fails with
+configurable probability: with ``429`` (``retry_after``) or with ``500``.
+
+Messages, sent by the bot, are put into inbox of their chat, where virtual users of ``driver.py`` read them. Updates of
+virtual users are returned by ``getUpdates`` (polling mode) or posted to the webhook of the bot by the driver.
+
+The bot is pointed to the server with ``TG_API_SERVER`` variable, e.g. ``TG_API_SERVER=http://127.0.0.1:8081``.
+Standalone run: ``python loadtest/fake_api.py --port 8081``.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+from collections import Counter, deque
+from time import time
+from typing import Any
+
+import click
+from aiohttp import web
+
+# Methods, which target a chat. Only they are delayed and fail
+CHAT_METHODS: frozenset[str] = frozenset(
+    {
+        "sendMessage",
+        "sendPoll",
+        "deleteMessage",
+        "deleteMessages",
+        "editMessageReplyMarkup",
+        "answerCallbackQuery",
+    }
+)
+# Parameters, which are sent as JSON-strings in form data
+JSON_PARAMS: frozenset[str] = frozenset(
+    {
+        "reply_markup",
+        "options",
+        "message_ids",
+        "allowed_updates",
+        "link_preview_options",
+    }
+)
+# User of the bot, returned by ``getMe``
+BOT_USER: dict[str, Any] = {
+    "id": 1,
+    "is_bot": True,
+    "first_name": "Fake bot",
+    "username": "fake_bot",
+}
+
+
+class FakeBotApi:
+    """Fake Bot API: state of chats and updates queue."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        flood_rate: float = 0.0,
+        retry_after: int = 1,
+    ) -> None:
+        """
+        Creates server state.
+
+        :param latency: mean latency of chat methods in seconds
+        :param jitter: latency is uniformly distributed in ``latency ± jitter``
+        :param error_rate: probability of ``500`` response to chat method
+        :param flood_rate: probability of ``429`` response to chat method
+        :param retry_after: ``retry_after`` of ``429`` responses in seconds
+        """
+
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.flood_rate = flood_rate
+        self.retry_after = retry_after
+
+        # Pending updates for ``getUpdates``
+        self._updates: deque[dict[str, Any]] = deque()
+        self._update_id = itertools.count(1)
+        self._new_updates = asyncio.Event()
+        self._message_id = itertools.count(1)
+        self._poll_id = itertools.count(1)
+
+        # Chat id -> messages and polls, sent by the bot
+        self.inboxes: dict[int, asyncio.Queue[dict[str, Any]]] = {}
+        # Set, when the bot starts polling or sets webhook
+        self.connected = asyncio.Event()
+        # URL and secret token of webhook, set by the bot
+        self.webhook: tuple[str, str | None] | None = None
+
+        # Metrics
+        self.calls: Counter[str] = Counter()
+        self.chat_calls: dict[int, Counter[str]] = {}
+        self.errors: Counter[int] = Counter()
+
+    def app(self) -> web.Application:
+        """
+        Method, that creates ``aiohttp`` application with Bot API route.
+
+        :return: ``aiohttp.web.Application`` instance
+        """
+
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self._handle)
+        return app
+
+    def next_message_id(self) -> int:
+        """
+        Method, that returns id for new message. Ids are unique across chats.
+
+        :return: message id
+        """
+
+        return next(self._message_id)
+
+    def inbox(self, chat_id: int) -> asyncio.Queue[dict[str, Any]]:
+        """
+        Method, that returns inbox of chat.
+
+        :param chat_id: chat id
+        :return: queue of messages, sent by the bot to the chat
+        """
+
+        if (inbox := self.inboxes.get(chat_id)) is None:
+            inbox = self.inboxes[chat_id] = asyncio.Queue()
+        return inbox
+
+    def push_update(self, update: dict[str, Any]) -> dict[str, Any]:
+        """
+        Method, that assigns ``update_id`` to update and queues it for ``getUpdates``.
+
+        :param update: update without ``update_id``
+        :return: update with ``update_id``
+        """
+
+        update = {"update_id": next(self._update_id), **update}
+        self._updates.append(update)
+        self._new_updates.set()
+        return update
+
+    def new_update(self, update: dict[str, Any]) -> dict[str, Any]:
+        """
+        Method, that assigns ``update_id`` to update without queueing it, for delivery with webhook.
+
+        :param update: update without ``update_id``
+        :return: update with ``update_id``
+        """
+
+        return {"update_id": next(self._update_id), **update}
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """
+        Handler for ``/bot{token}/{method}`` route.
+
+        :param request: incoming HTTP request of the bot
+        :return: Bot API JSON response
+        """
+
+        method = request.match_info["method"]
+        params = {
+            key: json.loads(value) if key in JSON_PARAMS else value
+            for key, value in (await request.post()).items()
+        }
+        self.calls[method] += 1
+
+        if method in CHAT_METHODS:
+            if "chat_id" in params:
+                params["chat_id"] = int(params["chat_id"])
+                self.chat_calls.setdefault(params["chat_id"], Counter())[method] += 1
+            if self.latency or self.jitter:
+                await asyncio.sleep(
+                    max(0.0, random.uniform(-1, 1) * self.jitter + self.latency)
+                )
+            if (roll := random.random()) < self.flood_rate:
+                return self._error(
+                    429,
+                    f"Too Many Requests: retry after {self.retry_after}",
+                    {"retry_after": self.retry_after},
+                )
+            if roll < self.flood_rate + self.error_rate:
+                return self._error(500, "Internal Server Error")
+
+        match method:
+            case "getMe":
+                result = BOT_USER
+            case "getUpdates":
+                result = await self._get_updates(params)
+            case "setWebhook":
+                self.webhook = (params["url"], params.get("secret_token"))
+                self.connected.set()
+                result = True
+            case "sendMessage":
+                result = self._deliver(
+                    params,
+                    text=params.get("text", ""),
+                    reply_markup=params.get("reply_markup"),
+                )
+            case "sendPoll":
+                result = self._deliver(
+                    params,
+                    poll={
+                        "id": str(next(self._poll_id)),
+                        "question": params["question"],
+                        "options": [
+                            {"text": option, "voter_count": 0}
+                            for option in params["options"]
+                        ],
+                        "total_voter_count": 0,
+                        "is_closed": False,
+                        "is_anonymous": False,
+                        "type": "regular",
+                        "allows_multiple_answers": True,
+                    },
+                )
+            case _:
+                result = True
+        return web.json_response({"ok": True, "result": result})
+
+    def _deliver(self, params: dict[str, Any], **content: Any) -> dict[str, Any]:
+        """
+        Method, that creates message, sent by the bot, and puts it into inbox of chat.
+
+        :param params: parameters of request
+        :param content: fields of message, e.g. ``text`` or ``poll``
+        :return: message
+        """
+
+        message = {
+            "message_id": self.next_message_id(),
+            "date": int(time()),
+            "chat": {"id": params["chat_id"], "type": "private"},
+            "from": BOT_USER,
+            **{key: value for key, value in content.items() if value is not None},
+        }
+        self.inbox(params["chat_id"]).put_nowait(message)
+        return message
+
+    async def _get_updates(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Method, that returns pending updates, waiting for them up to ``timeout``.
+
+        :param params: parameters of ``getUpdates`` request
+        :return: list of updates
+        """
+
+        self.connected.set()
+        offset = int(params.get("offset", 0))
+        while self._updates and self._updates[0]["update_id"] < offset:
+            self._updates.popleft()
+
+        if not self._updates:
+            self._new_updates.clear()
+            try:
+                await asyncio.wait_for(
+                    self._new_updates.wait(), int(params.get("timeout", 0))
+                )
+            except TimeoutError:
+                return []
+        return list(itertools.islice(self._updates, int(params.get("limit", 100))))
+
+    def _error(
+        self, code: int, description: str, parameters: dict[str, Any] | None = None
+    ) -> web.Response:
+        """
+        Method, that creates Bot API error response.
+
+        :param code: error code, also used as HTTP status
+        :param description: error description
+        :param parameters: ``ResponseParameters`` of error
+        :return: JSON response
+        """
+
+        self.errors[code] += 1
+        body = {"ok": False, "error_code": code, "description": description}
+        if parameters:
+            body["parameters"] = parameters
+        return web.json_response(body, status=code)
+
+
+@click.command
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8081, show_default=True)
+@click.option("--latency", default=0.0, show_default=True, help="Seconds")
+@click.option("--jitter", default=0.0, show_default=True, help="Seconds")
+@click.option("--error-rate", default=0.0, show_default=True)
+@click.option("--flood-rate", default=0.0, show_default=True)
+def main(
+    host: str,
+    port: int,
+    latency: float,
+    jitter: float,
+    error_rate: float,
+    flood_rate: float,
+) -> None:
+    """
+    Click-decorated function, which runs fake Bot API server alone.
+
+    :param host: host to bind
+    :param port: port to bind
+    :param latency: mean latency of chat methods in seconds
+    :param jitter: latency is uniformly distributed in ``latency ± jitter``
+    :param error_rate: probability of ``500`` response to chat method
+    :param flood_rate: probability of ``429`` response to chat method
+    """
+
+    async def make_app() -> web.Application:
+        return FakeBotApi(latency, jitter, error_rate, flood_rate).app()
+
+    web.run_app(make_app(), host=host, port=port)
+
+
+if __name__ == "__main__":
+    main()
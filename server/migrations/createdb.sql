@@ -25,15 +25,22 @@ CREATE TABLE questions (
 
 CREATE TABLE users (
     id SERIAL PRIMARY KEY,
-    telegram_id TEXT,
+    telegram_id BIGINT,
     username TEXT,
     exam_best INTEGER default 0,
+    exam_profile TEXT default null,
     checked_update BOOLEAN DEFAULT false,
     hints_allowed BOOLEAN DEFAULT true,
-    help_alert_counter INTEGER default 0,
-    themes_tried integer[] default array []::integer[],
-    themes_done_full integer[] default array []::integer[],
-    themes_done_particular integer[] default array []::integer[]
+    help_alert_counter INTEGER default 0
+);
+
+CREATE TABLE user_theme_progress (
+    user_id INTEGER NOT NULL,
+    theme_id INTEGER NOT NULL,
+    state SMALLINT NOT NULL,
+    PRIMARY KEY (user_id, theme_id),
+    FOREIGN KEY (user_id) REFERENCES users(id),
+    FOREIGN KEY (theme_id) REFERENCES themes(id)
 );
 
 CREATE TABLE sessions (
@@ -51,8 +58,15 @@ CREATE TABLE sessions (
     cur_p_msg INTEGER default null,
     cur_a_msg INTEGER default null,
     cur_s_msg INTEGER default null,
+    exam_deadline TIMESTAMPTZ default null,
     FOREIGN KEY (user_id) REFERENCES users(id),
     FOREIGN KEY (theme_id) REFERENCES themes(id)
 );
 
-INSERT INTO users (telegram_id) VALUES ('');
+CREATE UNIQUE INDEX users_telegram_id_key ON users (telegram_id);
+CREATE UNIQUE INDEX sessions_user_id_key ON sessions (user_id);
+CREATE INDEX sessions_exam_deadline_idx ON sessions (exam_deadline) WHERE exam_deadline IS NOT NULL;
+CREATE INDEX questions_theme_id_idx ON questions (theme_id);
+CREATE INDEX themes_section_id_idx ON themes (section_id);
+
+INSERT INTO users (telegram_id) VALUES (0);
@@ -0,0 +1,6 @@
+-- Deadline of exam session, used to rebuild exam timers after restart
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS exam_deadline TIMESTAMPTZ DEFAULT NULL;
+
+CREATE INDEX IF NOT EXISTS sessions_exam_deadline_idx
+    ON sessions (exam_deadline)
+    WHERE exam_deadline IS NOT NULL;
@@ -0,0 +1,34 @@
+-- Indexes and constraints for hot queries of entities_service
+
+-- Telegram ids are numbers, BIGINT is compared and indexed faster than TEXT
+DO $$
+BEGIN
+    IF (SELECT data_type
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'users'
+          AND column_name = 'telegram_id') = 'text' THEN
+        ALTER TABLE users
+            ALTER COLUMN telegram_id TYPE BIGINT USING NULLIF(telegram_id, '')::BIGINT;
+    END IF;
+END $$;
+
+-- Every update looks up the user by telegram_id
+CREATE UNIQUE INDEX IF NOT EXISTS users_telegram_id_key
+    ON users (telegram_id);
+
+-- Only one active session per user. Duplicates left by concurrent session creation are dropped, the newest is kept
+DELETE FROM sessions older
+    USING sessions newer
+    WHERE older.user_id = newer.user_id
+      AND older.id < newer.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS sessions_user_id_key
+    ON sessions (user_id);
+
+-- Foreign keys, used by joins and by catalog loading
+CREATE INDEX IF NOT EXISTS questions_theme_id_idx
+    ON questions (theme_id);
+
+CREATE INDEX IF NOT EXISTS themes_section_id_idx
+    ON themes (section_id);
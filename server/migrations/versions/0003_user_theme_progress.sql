@@ -0,0 +1,28 @@
+-- Theme progress of users, one row per started theme. State: 1 - tried, 2 - particular, 3 - full
+CREATE TABLE IF NOT EXISTS user_theme_progress (
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    theme_id INTEGER NOT NULL REFERENCES themes(id),
+    state SMALLINT NOT NULL,
+    PRIMARY KEY (user_id, theme_id)
+);
+
+-- Backfill from legacy arrays of users table, the highest state wins. Arrays are kept for rollback
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1
+               FROM information_schema.columns
+               WHERE table_schema = current_schema()
+                 AND table_name = 'users'
+                 AND column_name = 'themes_tried') THEN
+        INSERT INTO user_theme_progress (user_id, theme_id, state)
+        SELECT progress.user_id, progress.theme_id, MAX(progress.state)
+        FROM (SELECT id, unnest(themes_tried), 1 FROM users
+              UNION ALL
+              SELECT id, unnest(themes_done_particular), 2 FROM users
+              UNION ALL
+              SELECT id, unnest(themes_done_full), 3 FROM users) AS progress (user_id, theme_id, state)
+        WHERE progress.theme_id IN (SELECT id FROM themes)
+        GROUP BY progress.user_id, progress.theme_id
+        ON CONFLICT DO NOTHING;
+    END IF;
+END $$;
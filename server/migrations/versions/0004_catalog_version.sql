@@ -0,0 +1,28 @@
+-- Version of question bank, bumped by any change of sections, themes or questions. Catalog snapshot stores the
+-- version it was built from, so stale snapshot is detected with one cheap query
+CREATE TABLE IF NOT EXISTS catalog_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL DEFAULT 1
+);
+INSERT INTO catalog_version (id) VALUES (TRUE) ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE catalog_version SET version = version + 1;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+-- Row-level triggers fire only for changed rows, truncate has only statement-level ones
+DO $$
+DECLARE
+    bank_table TEXT;
+BEGIN
+    FOREACH bank_table IN ARRAY ARRAY['sections', 'themes', 'questions'] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %1$s_catalog_version ON %1$s', bank_table);
+        EXECUTE format('CREATE TRIGGER %1$s_catalog_version AFTER INSERT OR UPDATE OR DELETE ON %1$s '
+                       'FOR EACH ROW EXECUTE FUNCTION bump_catalog_version()', bank_table);
+        EXECUTE format('DROP TRIGGER IF EXISTS %1$s_catalog_truncate ON %1$s', bank_table);
+        EXECUTE format('CREATE TRIGGER %1$s_catalog_truncate AFTER TRUNCATE ON %1$s '
+                       'FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version()', bank_table);
+    END LOOP;
+END $$;
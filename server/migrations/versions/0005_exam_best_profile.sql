@@ -0,0 +1,6 @@
+-- Name of exam profile, which ``exam_best`` was reached in. Results of other profiles have other maximum, so
+-- ``exam_best`` is reset when profile changes
+ALTER TABLE users ADD COLUMN IF NOT EXISTS exam_profile TEXT DEFAULT NULL;
+
+-- All results before this migration were reached in the default profile
+UPDATE users SET exam_profile = 'default' WHERE exam_profile IS NULL AND exam_best > 0;
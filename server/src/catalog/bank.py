@@ -0,0 +1,88 @@
+"""
+Module for reading the question bank from ``static/parsed.json``.
+
+The file is the source of questions for the Postgres loader (``database.bank_loader``) and for the storages, which
+are filled on start (SQLite and in-memory ones, see ``repositories``).
+"""
+
+import json
+from pathlib import Path
+from typing import Iterator
+
+from catalog.entries import SectionEntry, ThemeEntry, QuestionEntry
+from catalog.rendering import render_question
+
+# Default question bank file
+PARSED_JSON: Path = Path(__file__).resolve().parents[2] / "static" / "parsed.json"
+
+
+def read_bank(path: Path) -> Iterator[tuple[int, str, str, str, list[str], str]]:
+    """
+    Function, that reads question bank and yields staging records one by one.
+
+    Variants are split on commas, like PostgreSQL does with unquoted ``TEXT[]`` literals in ``questions.sql``.
+
+    :param path: path to JSON file with ``{section: {theme: {question: {variants, correct}}}}`` structure
+    :return: iterator of tuples (position, section title, theme title, question title, answers, correct answer)
+    """
+
+    with open(path, encoding="utf-8") as f:
+        parsed = json.load(f)
+
+    position = 0
+    for section_title, themes in parsed.items():
+        for theme_title, questions in themes.items():
+            for title, question in questions.items():
+                position += 1
+                answers = [
+                    part.strip()
+                    for variant in question["variants"]
+                    for part in variant.split(",")
+                    if part.strip()
+                ]
+                yield (
+                    position,
+                    section_title,
+                    theme_title,
+                    title,
+                    answers,
+                    question["correct"],
+                )
+
+
+def bank_entries(
+    path: Path = PARSED_JSON,
+) -> tuple[list[SectionEntry], list[ThemeEntry], list[QuestionEntry]]:
+    """
+    Function, that builds catalog entries from question bank. Ids are assigned in order of the file, starting from 1.
+
+    :param path: path to JSON file, defaults to ``static/parsed.json``
+    :return: tuple of lists with ``SectionEntry``, ``ThemeEntry`` and ``QuestionEntry`` objects
+    """
+
+    sections: dict[str, SectionEntry] = {}
+    themes: dict[tuple[str, str], ThemeEntry] = {}
+    questions: list[QuestionEntry] = []
+    for position, section_title, theme_title, title, answers, correct in read_bank(
+        path
+    ):
+        if (section := sections.get(section_title)) is None:
+            section = sections[section_title] = SectionEntry(
+                id=len(sections) + 1, title=section_title
+            )
+        if (theme := themes.get((section_title, theme_title))) is None:
+            theme = themes[(section_title, theme_title)] = ThemeEntry(
+                id=len(themes) + 1, title=theme_title, section_id=section.id
+            )
+        questions.append(
+            QuestionEntry(
+                id=position,
+                title=title,
+                answers=tuple(answers),
+                correct_answer=correct,
+                theme_id=theme.id,
+                theme=theme,
+                rendered=render_question(answers, correct),
+            )
+        )
+    return list(sections.values()), list(themes.values()), questions
@@ -0,0 +1,40 @@
+"""Module with lightweight read-only entries, which are stored in the in-memory catalog."""
+
+from dataclasses import dataclass
+
+from catalog.rendering import RenderedQuestion
+
+
+@dataclass(frozen=True, slots=True)
+class SectionEntry:
+    """Immutable copy of a row from ``sections`` table."""
+
+    id: int
+    title: str
+
+
+@dataclass(frozen=True, slots=True)
+class ThemeEntry:
+    """Immutable copy of a row from ``themes`` table."""
+
+    id: int
+    title: str
+    section_id: int
+
+
+@dataclass(frozen=True, slots=True)
+class QuestionEntry:
+    """
+    Immutable copy of a row from ``questions`` table.
+
+    ``theme`` is a reference to the already stored ``ThemeEntry`` object, so it can be used the same way as
+    selectinloaded ``Question.theme`` relationship. ``rendered`` holds precompiled parse results of ``answers``.
+    """
+
+    id: int
+    title: str
+    answers: tuple[str, ...]
+    correct_answer: str
+    theme_id: int
+    theme: ThemeEntry
+    rendered: RenderedQuestion
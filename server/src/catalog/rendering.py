@@ -0,0 +1,75 @@
+"""
+Module for precompiled question rendering.
+
+Everything, that handlers used to rebuild on each question send or poll answer (parsed answers, poll options, HTML
+block with answers, correct answer), is computed once per catalog load and stored in ``RenderedQuestion``.
+"""
+
+from dataclasses import dataclass
+
+from services.utility_service import parse_answers_from_question
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedQuestion:
+    """Immutable per-question artifact, which is reused by every handler."""
+
+    # Parsed and lowercased answers, sorted by letter
+    options: tuple[str, ...]
+    # Letter of each option, e.g. ("а", "б", "в")
+    letters: tuple[str, ...]
+    # Strings for ``aiogram.Bot.send_poll`` options, e.g. ("а)", "б)", "в)")
+    poll_options: tuple[str, ...]
+    # Bit ``i`` is set if option ``i`` is a part of the correct answer
+    correct_mask: int
+    # Sorted letters of the correct answer, as shown to user
+    correct_answer: str
+    # ``aiogram.html.italic`` block with all answers
+    answers_html: str
+
+    def is_correct(self, option_ids: list[int]) -> bool:
+        """
+        Method, which checks if chosen poll ``option_ids`` are equal to correct variants.
+
+        :param option_ids: a list of poll ``option_ids`` chosen by user
+        :return: ``True`` if answer is correct, ``False`` otherwise
+        """
+
+        selected_mask = 0
+        for option_id in option_ids:
+            selected_mask |= 1 << option_id
+        return selected_mask == self.correct_mask
+
+
+def render_question(
+    raw_answers: list[str] | tuple[str, ...], correct_answer: str
+) -> RenderedQuestion:
+    """
+    Function, which builds ``RenderedQuestion`` from raw ``answers`` and ``correct_answer`` of ``Question``.
+
+    If correct answer contains a letter, which has no matching option, an extra bit is set in ``correct_mask``, so such
+    question can never be answered correctly (same as before precompilation).
+
+    :param raw_answers: a list of raw ``answers`` from ``Question`` object
+    :param correct_answer: ``correct_answer`` field of ``Question`` object
+    :return: precompiled ``RenderedQuestion``
+    """
+
+    answers, answers_html = parse_answers_from_question(list(raw_answers))
+    letters = tuple(ans[0] for ans in answers)
+
+    correct_mask = 0
+    for letter in correct_answer:
+        if letter in letters:
+            correct_mask |= 1 << letters.index(letter)
+        else:
+            correct_mask |= 1 << len(letters)
+
+    return RenderedQuestion(
+        options=tuple(answers),
+        letters=letters,
+        poll_options=tuple(ans.lower()[:2] for ans in answers),
+        correct_mask=correct_mask,
+        correct_answer="".join(sorted(correct_answer)),
+        answers_html=answers_html,
+    )
@@ -0,0 +1,148 @@
+"""
+Module for exam profiles and the exam-sampling index.
+
+Index is built once per catalog load, so exam creation takes ``O(themes + questions_total)`` and never scans the whole
+question bank.
+"""
+
+import random
+from dataclasses import dataclass
+
+from catalog.entries import QuestionEntry
+from config import EXAM_PROFILE
+
+
+@dataclass(frozen=True, slots=True)
+class ExamProfile:
+    """Settings, which describe how exam session is built."""
+
+    name: str
+    # Number of questions in exam session
+    questions_total: int
+    # Number of questions taken from each theme before the remainder is filled from the whole bank
+    per_theme: int
+    # Questions with more options than this are never selected
+    max_options: int
+    # Exam duration in minutes
+    duration: float
+
+
+# Available exam profiles, active one is chosen by ``EXAM_PROFILE`` environment variable
+EXAM_PROFILES: dict[str, ExamProfile] = {
+    "default": ExamProfile(
+        name="default", questions_total=35, per_theme=1, max_options=4, duration=20.0
+    ),
+    "short": ExamProfile(
+        name="short", questions_total=15, per_theme=0, max_options=4, duration=10.0
+    ),
+    "long": ExamProfile(
+        name="long", questions_total=70, per_theme=2, max_options=4, duration=40.0
+    ),
+}
+
+
+# Random generator used when none is passed to ``SamplingIndex.sample``
+_RNG: random.Random = random.Random()
+
+
+def get_exam_profile() -> ExamProfile:
+    """
+    Function, that returns active exam profile.
+
+    :return: ``ExamProfile`` chosen in ``.env`` file or ``default`` one
+    """
+
+    return EXAM_PROFILES.get(EXAM_PROFILE, EXAM_PROFILES["default"])
+
+
+class SamplingIndex:
+    """Arrays of question ids, which are eligible for exam sessions, grouped by theme and all together."""
+
+    __slots__ = ("_options_by_theme", "_pools")
+
+    def __init__(
+        self, questions_by_theme: dict[int, tuple[QuestionEntry, ...]]
+    ) -> None:
+        """
+        Creates index from catalog's ``questions_by_theme`` dictionary.
+
+        :param questions_by_theme: dictionary of theme ids and questions of that theme
+        """
+
+        # Pairs of question id and its options count for each theme
+        self._options_by_theme: dict[int, tuple[tuple[int, int], ...]] = {
+            theme_id: tuple((q.id, len(q.rendered.options)) for q in questions)
+            for theme_id, questions in questions_by_theme.items()
+        }
+        # Eligible arrays, cached by ``max_options`` value
+        self._pools: dict[int, tuple[tuple[tuple[int, ...], ...], tuple[int, ...]]] = {}
+
+    def pool(
+        self, max_options: int
+    ) -> tuple[tuple[tuple[int, ...], ...], tuple[int, ...]]:
+        """
+        Method, that returns eligible question ids for specified options limit.
+
+        :param max_options: maximum number of options in question
+        :return: tuple of per-theme eligible arrays (empty themes are skipped) and global eligible array
+        """
+
+        if (cached := self._pools.get(max_options)) is not None:
+            return cached
+
+        per_theme = tuple(
+            ids
+            for ids in (
+                tuple(q_id for q_id, options in pairs if options <= max_options)
+                for pairs in self._options_by_theme.values()
+            )
+            if ids
+        )
+        eligible = tuple(q_id for ids in per_theme for q_id in ids)
+        self._pools[max_options] = (per_theme, eligible)
+        return per_theme, eligible
+
+    def sample(
+        self, profile: ExamProfile, rng: random.Random | None = None
+    ) -> list[int]:
+        """
+        Method, that builds shuffled questions queue for exam session.
+
+        - ``profile.per_theme`` questions are taken from each theme;
+        - remainder is filled with random questions from the whole eligible array;
+        - all questions are unique.
+
+        :param profile: exam profile to follow
+        :param rng: random generator, module-level one is used by default
+        :return: list of question ids
+        """
+
+        rng = rng or _RNG
+        per_theme, eligible = self.pool(profile.max_options)
+
+        selected: list[int] = []
+        if profile.per_theme == 1:
+            # Common case, ``choice`` is several times cheaper than ``sample``
+            selected.extend(rng.choice(ids) for ids in per_theme)
+        else:
+            for ids in per_theme:
+                selected.extend(rng.sample(ids, min(profile.per_theme, len(ids))))
+        if len(selected) > profile.questions_total:
+            selected = rng.sample(selected, profile.questions_total)
+
+        chosen = set(selected)
+        remaining = min(profile.questions_total, len(eligible)) - len(selected)
+        if remaining > (len(eligible) - len(chosen)) // 2:
+            # Pool is almost exhausted, rejection sampling would spin for too long
+            rest = [q_id for q_id in eligible if q_id not in chosen]
+            selected.extend(rng.sample(rest, remaining))
+        else:
+            while remaining > 0:
+                q_id = eligible[rng.randrange(len(eligible))]
+                if q_id not in chosen:
+                    chosen.add(q_id)
+                    selected.append(q_id)
+                    remaining -= 1
+
+        rng.shuffle(selected)
+        return selected
@@ -0,0 +1,252 @@
+"""
+Module for binary snapshot of the catalog.
+
+Snapshot is built from DB, which stays the source of truth, and contains sections, themes and questions with their
+precompiled ``RenderedQuestion`` parts, so starting worker reads one file instead of the whole bank and never parses
+answers. Snapshot stores ``catalog_version`` of DB it was built from and is rebuilt, when the version changes.
+
+File layout (all integers are little-endian):
+    - header: magic, format version, catalog version, payload size, SHA-256 of payload
+    - payload: array of ``uint32`` (counts, string offsets, records of sections, themes and questions, string lists)
+      followed by UTF-8 text of all distinct strings
+
+File is read through ``mmap`` only to verify and decode it: every process builds its own catalog objects from it, so
+memory of the catalog is not shared between workers.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+
+from catalog.entries import SectionEntry, ThemeEntry, QuestionEntry
+from catalog.rendering import RenderedQuestion
+
+# Magic bytes and version of file format. Version is bumped on any change of layout or ``RenderedQuestion``
+MAGIC: bytes = b"BKCATLG\x00"
+FORMAT_VERSION: int = 1
+
+# Magic, format version, catalog version, payload size, SHA-256 of payload
+_HEADER: struct.Struct = struct.Struct("<8sIQQ32s")
+# Counts of sections, themes, questions, list items and strings
+_COUNTS: int = 5
+# Fields of records: section - id, title; theme - id, section id, title
+_SECTION_FIELDS: int = 2
+_THEME_FIELDS: int = 3
+# Question - id, theme id, title, correct answer, answers start and count, options start and count (options, letters
+# and poll options), rendered correct answer, answers HTML, correct mask
+_QUESTION_FIELDS: int = 11
+
+
+def _uint32_array(data: bytes | memoryview = b"") -> array:
+    """
+    Function, that creates array of ``uint32`` from little-endian bytes.
+
+    :param data: little-endian bytes
+    :return: ``array.array`` of unsigned integers
+    """
+
+    ints = array("I")
+    assert ints.itemsize == 4, "Snapshot requires 4-byte unsigned int"
+    ints.frombytes(data)
+    if sys.byteorder == "big":
+        ints.byteswap()
+    return ints
+
+
+def write_snapshot(
+    path: Path,
+    catalog_version: int,
+    sections: list[SectionEntry],
+    themes: list[ThemeEntry],
+    questions: list[QuestionEntry],
+) -> int:
+    """
+    Function, that writes snapshot of catalog entries. File is replaced atomically, so concurrently starting workers
+    never read a partially written snapshot.
+
+    :param path: path to snapshot file
+    :param catalog_version: ``catalog_version`` of DB, entries were read from
+    :param sections: list of ``SectionEntry`` objects, ordered by ``id``
+    :param themes: list of ``ThemeEntry`` objects, ordered by ``id``
+    :param questions: list of ``QuestionEntry`` objects, ordered by ``id``
+    :return: size of written file in bytes
+    """
+
+    # Equal strings (e.g. answers of similar questions) are stored once
+    strings: dict[str, int] = {}
+
+    def sid(string: str) -> int:
+        if (index := strings.get(string)) is None:
+            index = strings[string] = len(strings)
+        return index
+
+    records = array("I")
+    lists = array("I")
+    for section in sections:
+        records.extend((section.id, sid(section.title)))
+    for theme in themes:
+        records.extend((theme.id, theme.section_id, sid(theme.title)))
+    for question in questions:
+        answers_start = len(lists)
+        lists.extend(sid(answer) for answer in question.answers)
+        options_start = len(lists)
+        # Options are followed by their letters and poll options
+        for part in ("options", "letters", "poll_options"):
+            lists.extend(sid(item) for item in getattr(question.rendered, part))
+        records.extend(
+            (
+                question.id,
+                question.theme_id,
+                sid(question.title),
+                sid(question.correct_answer),
+                answers_start,
+                len(question.answers),
+                options_start,
+                len(question.rendered.options),
+                sid(question.rendered.correct_answer),
+                sid(question.rendered.answers_html),
+                question.rendered.correct_mask,
+            )
+        )
+
+    # Offsets are in characters, all strings are sliced from one decoded text
+    offsets = array("I", [0])
+    for string in strings:
+        offsets.append(offsets[-1] + len(string))
+
+    ints = array("I", (len(sections), len(themes), len(questions), len(lists)))
+    ints.append(len(strings))
+    ints.extend(offsets)
+    ints.extend(records)
+    ints.extend(lists)
+    if sys.byteorder == "big":
+        ints.byteswap()
+    payload = ints.tobytes() + "".join(strings).encode("utf-8")
+
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        catalog_version,
+        len(payload),
+        hashlib.sha256(payload).digest(),
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        os.fchmod(fd, 0o644)
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return _HEADER.size + len(payload)
+
+
+def read_snapshot(
+    path: Path, catalog_version: int | None = None
+) -> tuple[list[SectionEntry], list[ThemeEntry], list[QuestionEntry]]:
+    """
+    Function, that reads catalog entries from snapshot.
+
+    :param path: path to snapshot file
+    :param catalog_version: expected ``catalog_version``, any version is accepted if ``None``
+    :return: tuple of lists with ``SectionEntry``, ``ThemeEntry`` and ``QuestionEntry`` objects
+    :raises OSError: if file can't be opened
+    :raises ValueError: if file is not a snapshot, is corrupted, has other format version or is stale
+    """
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if len(mm) < _HEADER.size:
+            raise ValueError("file is too small")
+        magic, format_version, version, size, digest = _HEADER.unpack_from(mm)
+        if magic != MAGIC:
+            raise ValueError("not a catalog snapshot")
+        if format_version != FORMAT_VERSION:
+            raise ValueError(f"format version {format_version} != {FORMAT_VERSION}")
+        if catalog_version is not None and version != catalog_version:
+            raise ValueError(f"catalog version {version} != {catalog_version}")
+        if len(mm) != _HEADER.size + size:
+            raise ValueError("payload is truncated")
+
+        with memoryview(mm)[_HEADER.size :] as payload:
+            if hashlib.sha256(payload).digest() != digest:
+                raise ValueError("checksum mismatch")
+
+            n_sections, n_themes, n_questions, n_lists, n_strings = _uint32_array(
+                payload[: _COUNTS * 4]
+            )
+            n_ints = (
+                _COUNTS
+                + n_strings
+                + 1
+                + n_sections * _SECTION_FIELDS
+                + n_themes * _THEME_FIELDS
+                + n_questions * _QUESTION_FIELDS
+                + n_lists
+            )
+            ints = _uint32_array(payload[: n_ints * 4])
+            text = str(payload[n_ints * 4 :], "utf-8")
+
+    pos = _COUNTS
+    offsets = ints[pos : pos + n_strings + 1]
+    strings = [text[offsets[i] : offsets[i + 1]] for i in range(n_strings)]
+    pos += n_strings + 1
+
+    sections = []
+    for i in range(pos, pos + n_sections * _SECTION_FIELDS, _SECTION_FIELDS):
+        sections.append(SectionEntry(id=ints[i], title=strings[ints[i + 1]]))
+    pos += n_sections * _SECTION_FIELDS
+
+    themes = []
+    for i in range(pos, pos + n_themes * _THEME_FIELDS, _THEME_FIELDS):
+        themes.append(
+            ThemeEntry(id=ints[i], section_id=ints[i + 1], title=strings[ints[i + 2]])
+        )
+    pos += n_themes * _THEME_FIELDS
+
+    lists_pos = pos + n_questions * _QUESTION_FIELDS
+    items = [strings[sid] for sid in ints[lists_pos:]]
+    themes_by_id = {t.id: t for t in themes}
+    questions = []
+    for i in range(pos, lists_pos, _QUESTION_FIELDS):
+        (
+            question_id,
+            theme_id,
+            title,
+            correct_answer,
+            answers_start,
+            answers_count,
+            options_start,
+            options_count,
+            rendered_correct,
+            answers_html,
+            correct_mask,
+        ) = ints[i : i + _QUESTION_FIELDS]
+        letters_start = options_start + options_count
+        poll_start = letters_start + options_count
+        questions.append(
+            QuestionEntry(
+                id=question_id,
+                title=strings[title],
+                answers=tuple(items[answers_start : answers_start + answers_count]),
+                correct_answer=strings[correct_answer],
+                theme_id=theme_id,
+                theme=themes_by_id[theme_id],
+                rendered=RenderedQuestion(
+                    options=tuple(items[options_start:letters_start]),
+                    letters=tuple(items[letters_start:poll_start]),
+                    poll_options=tuple(items[poll_start : poll_start + options_count]),
+                    correct_mask=correct_mask,
+                    correct_answer=strings[rendered_correct],
+                    answers_html=strings[answers_html],
+                ),
+            )
+        )
+    return sections, themes, questions
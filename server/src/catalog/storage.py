@@ -0,0 +1,164 @@
+"""
+Module for the in-memory question-bank catalog.
+
+Tables ``sections``, ``themes`` and ``questions`` never change while the bot is running, so they are loaded once on
+dispatcher startup and served from RAM afterwards. Loading goes through binary snapshot, see ``catalog.snapshot``.
+"""
+
+from pathlib import Path
+from time import perf_counter
+
+from catalog.entries import SectionEntry, ThemeEntry, QuestionEntry
+from catalog.sampling import SamplingIndex
+from catalog.snapshot import read_snapshot, write_snapshot
+from config import CATALOG_SNAPSHOT
+from enums.logs import Logs
+from loggers.setup import LOGGER
+from repositories.current import REPOSITORY
+
+
+class Catalog:
+    """
+    Read-only storage of sections, themes and questions, indexed by id, by section and by theme.
+
+    Also holds ``SamplingIndex`` for exam sessions.
+    """
+
+    __slots__ = (
+        "sections",
+        "sections_by_id",
+        "themes_by_id",
+        "themes_by_section",
+        "questions_by_id",
+        "questions_by_theme",
+        "sampling",
+    )
+
+    def __init__(self) -> None:
+        """Creates an empty catalog. Use ``Catalog.fill`` to populate it."""
+
+        self.sections: tuple[SectionEntry, ...] = ()
+        self.sections_by_id: dict[int, SectionEntry] = {}
+        self.themes_by_id: dict[int, ThemeEntry] = {}
+        self.themes_by_section: dict[int, tuple[ThemeEntry, ...]] = {}
+        self.questions_by_id: dict[int, QuestionEntry] = {}
+        self.questions_by_theme: dict[int, tuple[QuestionEntry, ...]] = {}
+        self.sampling: SamplingIndex = SamplingIndex({})
+
+    def fill(
+        self,
+        sections: list[SectionEntry],
+        themes: list[ThemeEntry],
+        questions: list[QuestionEntry],
+    ) -> None:
+        """
+        Method, that (re)builds all indexes of the catalog.
+
+        Entries must be ordered by ``id``, this order is preserved in every index.
+
+        :param sections: list of ``SectionEntry`` objects
+        :param themes: list of ``ThemeEntry`` objects
+        :param questions: list of ``QuestionEntry`` objects
+        """
+
+        themes_by_section: dict[int, list[ThemeEntry]] = {s.id: [] for s in sections}
+        for theme in themes:
+            themes_by_section.setdefault(theme.section_id, []).append(theme)
+
+        questions_by_theme: dict[int, list[QuestionEntry]] = {t.id: [] for t in themes}
+        for question in questions:
+            questions_by_theme.setdefault(question.theme_id, []).append(question)
+
+        # Indexes are swapped one by one, readers never see a partially built dictionary
+        self.sections = tuple(sections)
+        self.sections_by_id = {s.id: s for s in sections}
+        self.themes_by_id = {t.id: t for t in themes}
+        self.themes_by_section = {k: tuple(v) for k, v in themes_by_section.items()}
+        self.questions_by_id = {q.id: q for q in questions}
+        self.questions_by_theme = {k: tuple(v) for k, v in questions_by_theme.items()}
+        self.sampling = SamplingIndex(self.questions_by_theme)
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Property, which tells whether the catalog was filled.
+
+        :return: ``True`` if there is at least one question in the catalog
+        """
+
+        return bool(self.questions_by_id)
+
+
+# Catalog instance shared by the whole application
+CATALOG: Catalog = Catalog()
+
+
+def _save_snapshot(
+    path: Path,
+    version: int,
+    entries: tuple[list[SectionEntry], list[ThemeEntry], list[QuestionEntry]],
+) -> None:
+    """
+    Function, that writes catalog snapshot. Failure is logged, catalog works without snapshot.
+
+    :param path: path to snapshot file
+    :param version: version of question bank
+    :param entries: tuple of lists with ``SectionEntry``, ``ThemeEntry`` and ``QuestionEntry`` objects
+    """
+
+    try:
+        size = write_snapshot(path, version, *entries)
+    except OSError as e:
+        LOGGER.warning(Logs.CATALOG_SNAPSHOT_FAILED, path, e)
+    else:
+        LOGGER.info(Logs.CATALOG_SNAPSHOT_SAVED, path, version, size)
+
+
+async def load_catalog() -> None:
+    """
+    Function, that fills the ``CATALOG`` from snapshot or, if snapshot is missing or stale, from storage.
+
+    After reading from storage a fresh snapshot is saved, so next workers start from it. Only one cheap query is sent to
+    DB, when snapshot is up-to-date. Snapshot is used only with storages, which track version of question bank.
+
+    Registered as ``aiogram.Dispatcher`` startup hook.
+    """
+
+    start = perf_counter()
+    path = Path(CATALOG_SNAPSHOT) if CATALOG_SNAPSHOT else None
+    entries = None
+    version = await REPOSITORY.catalog_version()
+    if path is not None and version is not None:
+        try:
+            entries = read_snapshot(path, version)
+            source = str(path)
+        except (OSError, ValueError) as e:
+            LOGGER.info(Logs.CATALOG_SNAPSHOT_SKIPPED, path, e)
+    if entries is None:
+        entries = await REPOSITORY.read_catalog()
+        source = "storage"
+        if path is not None and version is not None:
+            _save_snapshot(path, version, entries)
+
+    CATALOG.fill(*entries)
+    sections, themes, questions = entries
+    LOGGER.info(
+        Logs.CATALOG_LOADED,
+        source,
+        perf_counter() - start,
+        len(sections),
+        len(themes),
+        len(questions),
+    )
+
+
+async def build_snapshot() -> None:
+    """Function, that builds catalog snapshot from storage, whether it is stale or not."""
+
+    if not CATALOG_SNAPSHOT:
+        raise ValueError("CATALOG_SNAPSHOT is disabled")
+    if (version := await REPOSITORY.catalog_version()) is None:
+        raise ValueError(
+            "storage doesn't track catalog version, run with --migrate on PostgreSQL"
+        )
+    _save_snapshot(Path(CATALOG_SNAPSHOT), version, await REPOSITORY.read_catalog())
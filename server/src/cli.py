@@ -1,84 +1,193 @@
 """
 Module, which contains the command line interface (CLI) for the bot.
 
-There are only two options:
+There are only two modes:
     - ``--webhook`` for running in webhook mode
     - ``--polling`` for running in polling mode
+
+In webhook mode updates are acknowledged at once and handled by bounded pool of tasks, see ``webhook`` module.
+
+``--workers N`` runs the bot in N processes, see ``workers`` module.
+
+``--migrate`` applies pending schema migrations before start (or alone, without mode).
+
+``--load-bank [PATH]`` loads new and changed questions from ``static/parsed.json`` (or ``PATH``) after migrations, see
+``database.bank_loader`` module. With ``--dry-run`` the difference is only reported.
+
+``--build-snapshot`` rebuilds binary snapshot of the catalog, see ``catalog.snapshot`` module. Workers also rebuild it
+on start, when question bank has changed.
+
+``--migrate``, ``--load-bank`` and ``--build-snapshot`` work only with PostgreSQL storage, see ``repositories``.
+
+Metrics are served on ``/metrics`` of webhook server, in polling mode - on side server, if ``METRICS_PORT`` is set.
 """
 
 import asyncio
-from concurrent import futures
+from pathlib import Path
 
 import click
-from aiogram import Bot
-from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiogram.webhook.aiohttp_server import setup_application
 from aiohttp import web
 
 from config import (
-    BASE_WEBHOOK_URL,
+    STORAGE_BACKEND,
     WEBHOOK_PATH,
     WEBHOOK_SECRET,
     WEB_SERVER_HOST,
     WEB_SERVER_PORT,
+    METRICS_PORT,
 )
 from enums.logs import Logs
+from catalog.bank import PARSED_JSON
+from catalog.storage import build_snapshot
 from loggers.setup import LOGGER
+from repositories.current import REPOSITORY
+from routes import add_stats_routes, start_stats_server
 from setup import setup
+from webhook import BoundedRequestHandler
+from workers import run_workers, set_webhook
 
 
 @click.command
 @click.option("--webhook", is_flag=True, help="Run the bot in webhook mode")
 @click.option("--polling", is_flag=True, help="Run the bot in polling mode")
-def main(webhook: bool, polling: bool) -> None:
+@click.option("--migrate", is_flag=True, help="Apply pending schema migrations")
+@click.option(
+    "--load-bank",
+    "bank",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    is_flag=False,
+    flag_value=PARSED_JSON,
+    default=None,
+    help="Load question bank from JSON file, static/parsed.json by default",
+)
+@click.option(
+    "--dry-run", is_flag=True, help="Only report what --load-bank would change"
+)
+@click.option(
+    "--build-snapshot", "snapshot", is_flag=True, help="Build catalog snapshot"
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes",
+)
+def main(
+    webhook: bool,
+    polling: bool,
+    migrate: bool,
+    bank: Path | None,
+    dry_run: bool,
+    snapshot: bool,
+    workers: int,
+) -> None:
     """
     Click-decorated function for CLI.
 
     :param webhook: boolean flag for webhook mode, defaults to ``False`` if not specified
     :param polling: boolean flag for polling mode, defaults to ``False`` if not specified
+    :param migrate: boolean flag for applying migrations, defaults to ``False`` if not specified
+    :param bank: path to question bank for loading, defaults to ``None`` if not specified
+    :param dry_run: boolean flag for only reporting changes of question bank, defaults to ``False`` if not specified
+    :param snapshot: boolean flag for building catalog snapshot, defaults to ``False`` if not specified
+    :param workers: number of worker processes, defaults to ``1``
     """
 
+    if migrate:
+        asyncio.run(_migrate())
+    if bank is not None:
+        asyncio.run(_load_bank(bank, dry_run))
+    if snapshot:
+        asyncio.run(_build_snapshot())
+    if (migrate or bank is not None or snapshot) and not webhook and not polling:
+        return
+
     if webhook:
         LOGGER.info(Logs.WEBHOOK_MODE)
-        _webhook_mode()
+        if workers == 1:
+            _webhook_mode()
+        else:
+            run_workers(workers, webhook=True)
     elif polling:
         LOGGER.info(Logs.POLLING_MODE)
-        asyncio.run(_polling_mode())
+        if workers == 1:
+            asyncio.run(_polling_mode())
+        else:
+            run_workers(workers, webhook=False)
     else:
         click.echo("Please specify a mode: --webhook or --polling")
 
 
-async def __set_wh(bot: Bot) -> None:
+def _require_postgres(option: str) -> None:
     """
-    Function, which sets webhook for the bot.
+    Function, that stops CLI, if option is used with storage other than PostgreSQL.
 
-    Runs on dispatcher startup.
-
-    :param bot: instance of ``aiogram.Bot``
+    :param option: name of option
     """
 
-    await bot.set_webhook(
-        url=f"{BASE_WEBHOOK_URL}{WEBHOOK_PATH}", secret_token=WEBHOOK_SECRET
-    )
+    if STORAGE_BACKEND != "postgres":
+        raise click.UsageError(
+            f"{option} requires STORAGE_BACKEND=postgres, not {STORAGE_BACKEND!r}"
+        )
 
 
-def _webhook_mode() -> None:
+async def _migrate() -> None:
+    """Function, that applies pending migrations and closes DB connections."""
+
+    _require_postgres("--migrate")
+    # PostgreSQL-only modules, DB engine is created on import
+    from database.migrations import apply_migrations
+
+    try:
+        await apply_migrations()
+    finally:
+        await REPOSITORY.close()
+
+
+async def _load_bank(path: Path, dry_run: bool) -> None:
     """
-    Function, that runs the bot in webhook mode.
+    Function, that loads question bank and closes DB connections.
 
-    ``http.web.run_app`` runs in separated process.
+    :param path: path to JSON file with questions
+    :param dry_run: only report changes
     """
 
+    _require_postgres("--load-bank")
+    from database.bank_loader import load_bank
+
+    try:
+        await load_bank(path, dry_run)
+    finally:
+        await REPOSITORY.close()
+
+
+async def _build_snapshot() -> None:
+    """Function, that builds catalog snapshot and closes DB connections."""
+
+    try:
+        await build_snapshot()
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    finally:
+        await REPOSITORY.close()
+
+
+def _webhook_mode() -> None:
+    """Function, that runs the bot in webhook mode in current process."""
+
     # Get dispatcher and bot
     dp, bot = setup()
 
     # Set webhook for the bot
-    dp.startup.register(__set_wh)
+    dp.startup.register(set_webhook)
 
     # Create aiohttp application
     app = web.Application()
 
-    # Create webhook requests handler
-    webhook_requests_handler = SimpleRequestHandler(
+    # Create webhook requests handler, updates are acknowledged at once and handled by bounded pool of tasks
+    webhook_requests_handler = BoundedRequestHandler(
         dispatcher=dp,
         bot=bot,
         secret_token=WEBHOOK_SECRET,
@@ -86,25 +195,28 @@ def _webhook_mode() -> None:
 
     # Register webhook handler on application
     webhook_requests_handler.register(app, path=WEBHOOK_PATH)
+    add_stats_routes(app)
 
     # Mount dispatcher startup and shutdown hooks to aiohttp application
     setup_application(app, dp, bot=bot)
 
-    # Run in a custom process pool to prevent IO blocking
-    with futures.ProcessPoolExecutor():
-        web.run_app(app, host=WEB_SERVER_HOST, port=WEB_SERVER_PORT)
+    web.run_app(app, host=WEB_SERVER_HOST, port=WEB_SERVER_PORT)
 
 
 async def _polling_mode() -> None:
-    """
-    Function, that runs the bot in long polling mode.
-
-    ``aiogram.Dispatcher.start_polling`` runs in separated process.
-    """
+    """Function, that runs the bot in long polling mode in current process."""
 
     # Get dispatcher and bot
     dp, bot = setup()
 
-    # Run in a custom process pool to prevent IO blocking
-    with futures.ProcessPoolExecutor():
+    # Side server with metrics
+    runner = None
+    if METRICS_PORT is not None:
+        runner = await start_stats_server(WEB_SERVER_HOST, METRICS_PORT)
+        LOGGER.info(Logs.METRICS_SERVER, METRICS_PORT)
+
+    try:
         await dp.start_polling(bot)  # For long-polling mode
+    finally:
+        if runner is not None:
+            await runner.cleanup()
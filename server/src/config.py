@@ -6,11 +6,26 @@ Example ``.env`` file is in the ``server`` folder
 
 import os
 
+from pathlib import Path
 from typing import Final
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Constants for storage
+# ``postgres`` - PostgreSQL server, ``sqlite`` - embedded SQLite file, ``memory`` - process memory, nothing is persisted
+STORAGE_BACKEND: Final[str] = os.environ.get("STORAGE_BACKEND", "postgres")
+# File of ``sqlite`` storage
+SQLITE_PATH: Final[str] = os.environ.get(
+    "SQLITE_PATH", str(Path(__file__).resolve().parents[1] / "static" / "bot.sqlite3")
+)
+# Comma-separated Telegram ids of users, which are created on start of ``sqlite`` and ``memory`` storages
+STORAGE_USERS: Final[list[str]] = [
+    telegram_id.strip()
+    for telegram_id in os.environ.get("STORAGE_USERS", "").split(",")
+    if telegram_id.strip()
+]
+
 # Constants for Database
 DB_HOST: Final[str] = os.environ.get("DB_HOST")
 DB_PORT: Final[str] = os.environ.get("DB_PORT")
@@ -18,14 +33,76 @@ DB_NAME: Final[str] = os.environ.get("DB_NAME")
 DB_USER: Final[str] = os.environ.get("DB_USER")
 DB_PASS: Final[str] = os.environ.get("DB_PASS")
 
+# Constants for Database connection pool
+DB_POOL_SIZE: Final[int] = int(os.environ.get("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW: Final[int] = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT: Final[float] = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE: Final[int] = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING: Final[bool] = os.environ.get("DB_POOL_PRE_PING", "0") == "1"
+DB_POOL_WARMUP: Final[bool] = os.environ.get("DB_POOL_WARMUP", "1") == "1"
+DB_POOL_SLOW_ACQUIRE: Final[float] = float(os.environ.get("DB_POOL_SLOW_ACQUIRE", 0.1))
+DB_CONNECT_TIMEOUT: Final[float] = float(os.environ.get("DB_CONNECT_TIMEOUT", 10))
+DB_COMMAND_TIMEOUT: Final[float] = float(os.environ.get("DB_COMMAND_TIMEOUT", 30))
+# asyncpg prepared statements cache, must be 0 behind pgbouncer in transaction mode
+DB_STATEMENT_CACHE_SIZE: Final[int] = int(
+    os.environ.get("DB_STATEMENT_CACHE_SIZE", 100)
+)
+
+# Constants for read replica, all reads go to primary if host is not set
+DB_REPLICA_HOST: Final[str | None] = os.environ.get("DB_REPLICA_HOST") or None
+DB_REPLICA_PORT: Final[str] = os.environ.get("DB_REPLICA_PORT", DB_PORT)
+# Seconds. Replica, which lags more, is skipped. After a write reads of the user go to primary for this time
+DB_REPLICA_MAX_LAG: Final[float] = float(os.environ.get("DB_REPLICA_MAX_LAG", 2))
+# Seconds between checks of replica lag
+DB_REPLICA_LAG_CHECK: Final[float] = float(os.environ.get("DB_REPLICA_LAG_CHECK", 1))
+# Seconds to skip replica after its failure
+DB_REPLICA_RETRY: Final[float] = float(os.environ.get("DB_REPLICA_RETRY", 10))
+
 # Constants for WebApp server
 WEB_SERVER_HOST: Final[str] = os.environ.get("WEB_SERVER_HOST")
 WEB_SERVER_PORT: Final[int] = int(os.environ.get("WEB_SERVER_PORT"))
+# Port of side server with ``/metrics`` in polling mode, side server is not started if not set
+METRICS_PORT: Final[int | None] = (
+    int(os.environ["METRICS_PORT"]) if os.environ.get("METRICS_PORT") else None
+)
 
 # Constants for Webhook
 WEBHOOK_PATH: Final[str] = os.environ.get("WEBHOOK_PATH")
 WEBHOOK_SECRET: Final[str] = os.environ.get("WEBHOOK_SECRET")
 BASE_WEBHOOK_URL: Final[str] = os.environ.get("BASE_WEBHOOK_URL")
+# Updates are acknowledged at once and handled by a pool of background tasks
+WEBHOOK_CONCURRENCY: Final[int] = int(os.environ.get("WEBHOOK_CONCURRENCY", 64))
+WEBHOOK_QUEUE_SIZE: Final[int] = int(os.environ.get("WEBHOOK_QUEUE_SIZE", 1000))
+# Seconds to wait for free place in full queue, then update is rejected and Telegram redelivers it later
+WEBHOOK_QUEUE_TIMEOUT: Final[float] = float(os.environ.get("WEBHOOK_QUEUE_TIMEOUT", 1))
+# Seconds to finish queued and running updates on shutdown
+WEBHOOK_DRAIN_TIMEOUT: Final[float] = float(os.environ.get("WEBHOOK_DRAIN_TIMEOUT", 30))
 
 # Constants for Telegram
 TG_TOKEN: Final[str] = os.environ.get("TG_TOKEN")
+# Base URL of Bot API server, e.g. local Bot API server or ``loadtest/fake_api.py``. Telegram is used if not set
+TG_API_SERVER: Final[str | None] = os.environ.get("TG_API_SERVER") or None
+
+# Constants for question bank catalog
+# Binary snapshot of catalog, rebuilt from DB when question bank changes. Empty string disables snapshot
+CATALOG_SNAPSHOT: Final[str] = os.environ.get(
+    "CATALOG_SNAPSHOT",
+    str(Path(__file__).resolve().parents[1] / "static" / "catalog.snapshot"),
+)
+
+# Constants for exam sessions
+EXAM_PROFILE: Final[str] = os.environ.get("EXAM_PROFILE", "default")
+
+# Constants for outbound requests scheduler
+SEND_GLOBAL_RATE: Final[float] = float(os.environ.get("SEND_GLOBAL_RATE", 30))
+SEND_CHAT_RATE: Final[float] = float(os.environ.get("SEND_CHAT_RATE", 1))
+SEND_CHAT_BURST: Final[float] = float(os.environ.get("SEND_CHAT_BURST", 5))
+SEND_MAX_RETRIES: Final[int] = int(os.environ.get("SEND_MAX_RETRIES", 3))
+
+# Constants for logging
+# ``color`` - colored lines for terminal, ``plain`` - same lines without colors, ``json`` - JSON lines
+LOG_FORMAT: Final[str] = os.environ.get("LOG_FORMAT", "color")
+# Format and write records in a separate thread
+LOG_QUEUE: Final[bool] = os.environ.get("LOG_QUEUE", "1") == "1"
+# Records per second for each high-volume category, e.g. correct/incorrect answers
+LOG_RATE_LIMIT: Final[float] = float(os.environ.get("LOG_RATE_LIMIT", 20))
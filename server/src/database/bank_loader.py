@@ -0,0 +1,162 @@
+"""
+Module for loading the question bank from ``static/parsed.json``.
+
+Questions are copied with ``COPY`` into temporary staging table, then the diff is applied in one transaction:
+sections and themes are matched by titles, questions - by theme and title. Content of a question (answers and
+correct answer) is compared by hash, so only new questions are inserted and only changed ones are updated.
+
+Ids of existing questions are never changed and questions, which are absent in the file, are kept, so ids in
+``sessions.questions_queue`` and ``sessions.incorrect_questions`` stay valid. Running bots load catalog on startup,
+so they have to be restarted to see the changes. With ``dry_run`` the diff is only counted and rolled back.
+"""
+
+from pathlib import Path
+from time import perf_counter
+
+from catalog.bank import PARSED_JSON, read_bank
+from database.connection import engine
+from enums.logs import Logs
+from loggers.setup import LOGGER
+
+# Hash of question content, the same expression is used for staging and stored rows
+_CONTENT_HASH: str = (
+    "md5(array_to_string({0}.answers, chr(31)) || chr(30) || {0}.correct_answer)"
+)
+
+# Statements of diff, run in order after ``COPY``
+_APPLY: tuple[tuple[str, str], ...] = (
+    (
+        "sections",
+        """
+        INSERT INTO sections (title)
+        SELECT DISTINCT s.section_title FROM bank_staging s
+        WHERE NOT EXISTS (SELECT 1 FROM sections WHERE title = s.section_title)
+        """,
+    ),
+    (
+        "themes",
+        """
+        INSERT INTO themes (section_id, title)
+        SELECT DISTINCT sec.id, s.theme_title
+        FROM bank_staging s JOIN sections sec ON sec.title = s.section_title
+        WHERE NOT EXISTS (
+            SELECT 1 FROM themes WHERE section_id = sec.id AND title = s.theme_title
+        )
+        """,
+    ),
+    (
+        "resolved",
+        """
+        UPDATE bank_staging s SET theme_id = t.id
+        FROM themes t JOIN sections sec ON sec.id = t.section_id
+        WHERE sec.title = s.section_title AND t.title = s.theme_title
+        """,
+    ),
+    (
+        "changed",
+        f"""
+        UPDATE questions q SET answers = s.answers, correct_answer = s.correct_answer
+        FROM bank_staging s
+        WHERE q.theme_id = s.theme_id AND q.title = s.title
+            AND {_CONTENT_HASH.format("q")} IS DISTINCT FROM {_CONTENT_HASH.format("s")}
+        """,
+    ),
+    (
+        "new",
+        """
+        INSERT INTO questions (theme_id, title, answers, correct_answer)
+        SELECT s.theme_id, s.title, s.answers, s.correct_answer FROM bank_staging s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM questions WHERE theme_id = s.theme_id AND title = s.title
+        )
+        ORDER BY s.position
+        """,
+    ),
+)
+
+
+async def load_bank(
+    path: Path = PARSED_JSON, dry_run: bool = False
+) -> dict[str, int | float]:
+    """
+    Function, that loads question bank into DB, applying only the difference.
+
+    :param path: path to JSON file, defaults to ``static/parsed.json``
+    :param dry_run: roll the diff back instead of committing it
+    :return: dictionary with counts of inserted, changed, unchanged and kept rows and timings in seconds
+    """
+
+    start = perf_counter()
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        transaction = driver.transaction()
+        await transaction.start()
+        try:
+            # Concurrent loaders would insert the same rows, readers are not blocked
+            await driver.execute(
+                "LOCK TABLE sections, themes, questions IN SHARE ROW EXCLUSIVE MODE"
+            )
+            # Rows of ``*.sql`` dumps are inserted with explicit ids, sequences may lag behind
+            for table in ("sections", "themes", "questions"):
+                await driver.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"COALESCE(MAX(id), 0) + 1, false) FROM {table}"
+                )
+
+            await driver.execute(
+                "CREATE TEMP TABLE bank_staging ("
+                "position INTEGER, section_title TEXT, theme_title TEXT, title TEXT, "
+                "answers TEXT[], correct_answer TEXT, theme_id INTEGER"
+                ") ON COMMIT DROP"
+            )
+            copied = await driver.copy_records_to_table(
+                "bank_staging",
+                records=read_bank(path),
+                columns=(
+                    "position",
+                    "section_title",
+                    "theme_title",
+                    "title",
+                    "answers",
+                    "correct_answer",
+                ),
+            )
+            copy_time = perf_counter() - start
+
+            result: dict[str, int | float] = {"total": int(copied.split()[-1])}
+            for name, statement in _APPLY:
+                status = await driver.execute(statement)
+                result[name] = int(status.split()[-1])
+
+            result["unchanged"] = result["total"] - result["changed"] - result["new"]
+            result["kept"] = await driver.fetchval(
+                "SELECT COUNT(*) FROM questions q WHERE NOT EXISTS ("
+                "SELECT 1 FROM bank_staging s "
+                "WHERE s.theme_id = q.theme_id AND s.title = q.title)"
+            )
+        except BaseException:
+            await transaction.rollback()
+            raise
+        if dry_run:
+            await transaction.rollback()
+        else:
+            await transaction.commit()
+
+    result["copy_time"] = copy_time
+    result["apply_time"] = perf_counter() - start - copy_time
+    LOGGER.info(
+        Logs.BANK_DRY_RUN if dry_run else Logs.BANK_LOADED,
+        path.name,
+        result["copy_time"] + result["apply_time"],
+        result["copy_time"],
+        result["apply_time"],
+        result["total"],
+        result["new"],
+        result["changed"],
+        result["unchanged"],
+        result["kept"],
+        result["sections"],
+        result["themes"],
+    )
+    return result
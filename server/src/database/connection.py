@@ -4,16 +4,75 @@
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 
-from config import DB_HOST, DB_NAME, DB_PASS, DB_PORT, DB_USER
+from config import (
+    DB_HOST,
+    DB_NAME,
+    DB_PASS,
+    DB_PORT,
+    DB_USER,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_CONNECT_TIMEOUT,
+    DB_COMMAND_TIMEOUT,
+    DB_STATEMENT_CACHE_SIZE,
+    DB_REPLICA_HOST,
+    DB_REPLICA_PORT,
+)
+from database.pool import InstrumentedPool
 
 # PostgreSQL URL
 DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# PostgreSQL URL of read replica
+REPLICA_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_REPLICA_HOST}:{DB_REPLICA_PORT}/{DB_NAME}"
+
 # SQLAlchemy setup
 Base = declarative_base()
 
 # Async engine instance
-engine = create_async_engine(DATABASE_URL)
+engine = create_async_engine(
+    DATABASE_URL,
+    poolclass=InstrumentedPool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args={
+        "timeout": DB_CONNECT_TIMEOUT,
+        "command_timeout": DB_COMMAND_TIMEOUT,
+        # Cache of prepared statements, per connection
+        "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+    },
+)
 
 # Async session maker which is used as context manager for async queries
 SessionLocal = async_sessionmaker(engine)
+
+# Read replica engine, ``None`` if replica is not configured. Its pool is not instrumented: ``/stats/pool`` is about
+# primary. Reads are routed to replica by ``database.routing.READ_ROUTER``
+replica_engine = (
+    create_async_engine(
+        REPLICA_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args={
+            "timeout": DB_CONNECT_TIMEOUT,
+            "command_timeout": DB_COMMAND_TIMEOUT,
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+    if DB_REPLICA_HOST
+    else None
+)
+
+# Async session maker for read-only queries on replica
+ReplicaSessionLocal = (
+    async_sessionmaker(replica_engine) if replica_engine is not None else None
+)
@@ -0,0 +1,124 @@
+"""
+Module for versioned schema migrations.
+
+Migrations are plain SQL files in ``migrations/versions``, applied in order of their names. Applied versions are
+recorded in ``schema_migrations`` table, every migration runs in its own transaction. Bot refuses to start, while
+there are pending migrations, because handlers rely on the columns and tables they add.
+"""
+
+from pathlib import Path
+
+from sqlalchemy import text
+
+from database.connection import engine
+from database.models import Base
+from enums.logs import Logs
+from loggers.setup import LOGGER
+
+# Folder with migration files
+MIGRATIONS_DIR: Path = Path(__file__).resolve().parents[2] / "migrations" / "versions"
+
+
+async def apply_migrations() -> list[str]:
+    """
+    Function, that applies pending migrations from ``MIGRATIONS_DIR``.
+
+    :return: list of applied versions
+    """
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                "version TEXT PRIMARY KEY, applied_at TIMESTAMPTZ DEFAULT NOW())"
+            )
+        )
+        applied = set(
+            (await conn.execute(text("SELECT version FROM schema_migrations")))
+            .scalars()
+            .all()
+        )
+
+    versions = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        if (version := path.stem) in applied:
+            continue
+
+        async with engine.connect() as conn:
+            # Migration files contain several statements, so they are run by asyncpg directly
+            raw = await conn.get_raw_connection()
+            driver = raw.driver_connection
+            async with driver.transaction():
+                await driver.execute(path.read_text(encoding="utf-8"))
+                await driver.execute(
+                    "INSERT INTO schema_migrations (version) VALUES ($1)", version
+                )
+
+        LOGGER.info(Logs.MIGRATION_APPLIED, version)
+        versions.append(version)
+    return versions
+
+
+async def pending_migrations() -> list[str]:
+    """
+    Function, that finds migrations from ``MIGRATIONS_DIR``, which are not applied yet.
+
+    :return: list of pending versions
+    """
+
+    async with engine.connect() as conn:
+        applied = set()
+        if await conn.scalar(text("SELECT to_regclass('schema_migrations')")):
+            applied = set(
+                (await conn.execute(text("SELECT version FROM schema_migrations")))
+                .scalars()
+                .all()
+            )
+
+    return [
+        path.stem
+        for path in sorted(MIGRATIONS_DIR.glob("*.sql"))
+        if path.stem not in applied
+    ]
+
+
+async def check_migrations() -> None:
+    """
+    Function, that stops startup, if DB schema is behind migrations.
+
+    Runs on dispatcher startup.
+
+    :raises RuntimeError: if there are pending migrations
+    """
+
+    if pending := await pending_migrations():
+        raise RuntimeError(
+            f"pending migrations {', '.join(pending)}, run with --migrate"
+        )
+
+
+async def check_indexes() -> None:
+    """
+    Function, that warns if indexes, declared in ORM models, are missing in DB.
+
+    Runs on dispatcher startup.
+    """
+
+    expected = {
+        index.name for table in Base.metadata.tables.values() for index in table.indexes
+    }
+    async with engine.connect() as conn:
+        existing = set(
+            (
+                await conn.execute(
+                    text(
+                        "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()"
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+    if missing := sorted(expected - existing):
+        LOGGER.warning(Logs.DB_INDEXES_MISSING, ", ".join(missing))
@@ -1,19 +1,99 @@
 """Module for ORM models."""
 
 
-from sqlalchemy import ForeignKey, ARRAY, Integer, String
+from datetime import datetime, UTC
+from enum import IntEnum
+
+from sqlalchemy import (
+    ForeignKey,
+    ARRAY,
+    JSON,
+    Integer,
+    String,
+    DateTime,
+    BigInteger,
+    SmallInteger,
+    Index,
+    TypeDecorator,
+)
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, relationship
 from sqlalchemy.orm import mapped_column, Mapped
 
 
+class TelegramId(TypeDecorator):
+    """
+    Column type for Telegram ids. Stored as ``BIGINT``, but represented as ``str`` in Python code, so ids can be
+    compared with ``str(event.from_user.id)`` and concatenated with usernames as before.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: str | int | None, dialect) -> int | None:
+        """
+        Converts Python value to DB value.
+
+        :param value: Telegram id
+        :param dialect: current SQLAlchemy dialect
+        :return: numeric Telegram id
+        """
+
+        return int(value) if value is not None else None
+
+    def process_result_value(self, value: int | None, dialect) -> str | None:
+        """
+        Converts DB value to Python value.
+
+        :param value: numeric Telegram id
+        :param dialect: current SQLAlchemy dialect
+        :return: Telegram id as string
+        """
+
+        return str(value) if value is not None else None
+
+
+class AwareDateTime(TypeDecorator):
+    """
+    Column type for timestamps with time zone. SQLite has no time zones, so values are stored there in UTC and are
+    marked as UTC on read.
+    """
+
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_bind_param(self, value: datetime | None, dialect) -> datetime | None:
+        """
+        Converts Python value to DB value.
+
+        :param value: aware datetime
+        :param dialect: current SQLAlchemy dialect
+        :return: datetime in UTC
+        """
+
+        return value.astimezone(UTC) if value is not None else None
+
+    def process_result_value(self, value: datetime | None, dialect) -> datetime | None:
+        """
+        Converts DB value to Python value.
+
+        :param value: datetime from DB, naive for SQLite
+        :param dialect: current SQLAlchemy dialect
+        :return: aware datetime
+        """
+
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value
+
+
 class Base(AsyncAttrs, DeclarativeBase):
     """SQLAlchemy base class."""
 
-    # Annotations
+    # Annotations. SQLite has no arrays, they are stored as JSON there
     type_annotation_map = {
-        list[str]: ARRAY(String),
-        list[int]: ARRAY(Integer)
+        list[str]: ARRAY(String).with_variant(JSON, "sqlite"),
+        list[int]: ARRAY(Integer).with_variant(JSON, "sqlite"),
     }
 
 
@@ -32,6 +112,7 @@ class Theme(Base):
     """ORM model for ``themes`` table."""
 
     __tablename__ = "themes"
+    __table_args__ = (Index("themes_section_id_idx", "section_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(nullable=False)
@@ -49,6 +130,7 @@ class Question(Base):
     """ORM model for ``questions`` table."""
 
     __tablename__ = "questions"
+    __table_args__ = (Index("questions_theme_id_idx", "theme_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(nullable=False)
@@ -64,19 +146,16 @@ class User(Base):
     """ORM model for ``users`` table."""
 
     __tablename__ = "users"
+    __table_args__ = (Index("users_telegram_id_key", "telegram_id", unique=True),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    telegram_id: Mapped[str] = mapped_column(nullable=False)
-    username: Mapped[str] = mapped_column()
+    telegram_id: Mapped[str] = mapped_column(TelegramId, nullable=False)
+    username: Mapped[str] = mapped_column(nullable=True)
     exam_best: Mapped[int] = mapped_column(nullable=False, default=0)
+    exam_profile: Mapped[str] = mapped_column(nullable=True)
     hints_allowed: Mapped[bool] = mapped_column(nullable=False, default=True)
     checked_update: Mapped[bool] = mapped_column(nullable=False, default=False)
     help_alert_counter: Mapped[int] = mapped_column(nullable=False, default=0)
-    themes_tried: Mapped[list[int]] = mapped_column(nullable=False, default=[])
-    themes_done_full: Mapped[list[int]] = mapped_column(nullable=False, default=[])
-    themes_done_particular: Mapped[list[int]] = mapped_column(
-        nullable=False, default=[]
-    )
 
     session: Mapped["UserSession"] = relationship(
         "UserSession", back_populates="user", uselist=True
@@ -86,10 +165,20 @@ class User(Base):
 class UserSession(Base):
     """ORM model for ``sessions`` table."""
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Only one active session per user
+        Index("sessions_user_id_key", "user_id", unique=True),
+        Index(
+            "sessions_exam_deadline_idx",
+            "exam_deadline",
+            postgresql_where="exam_deadline IS NOT NULL",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    theme_id: Mapped[int] = mapped_column(ForeignKey("themes.id"))
+    # ``NULL`` for exam sessions
+    theme_id: Mapped[int] = mapped_column(ForeignKey("themes.id"), nullable=True)
     incorrect_questions: Mapped[list[int]] = mapped_column(nullable=False)
     progress: Mapped[int] = mapped_column(nullable=False)
     questions_queue: Mapped[list[int]] = mapped_column(nullable=False)
@@ -99,7 +188,33 @@ class UserSession(Base):
     cur_q_msg: Mapped[int] = mapped_column(nullable=True, default=None)
     cur_p_msg: Mapped[int] = mapped_column(nullable=True, default=None)
     cur_a_msg: Mapped[int] = mapped_column(nullable=True, default=None)
-    cur_s_msg: Mapped[int] = mapped_column(nullable=False, default=None)
+    cur_s_msg: Mapped[int] = mapped_column(nullable=True, default=None)
+    exam_deadline: Mapped[datetime] = mapped_column(
+        AwareDateTime, nullable=True, default=None
+    )
 
     user: Mapped["User"] = relationship("User", back_populates="session")
     theme: Mapped["Theme"] = relationship("Theme", back_populates="session")
+
+
+class ThemeProgress(IntEnum):
+    """Enum class with states of theme progress. States only go up: tried → particular → full."""
+
+    # Theme was never started
+    NONE = 0
+    # Theme was started ("orange")
+    TRIED = 1
+    # Theme was solved without mistakes after solving incorrects again ("yellow")
+    PARTICULAR = 2
+    # Theme was solved without mistakes at first try or marked as done ("green")
+    FULL = 3
+
+
+class UserThemeProgress(Base):
+    """ORM model for ``user_theme_progress`` table."""
+
+    __tablename__ = "user_theme_progress"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    theme_id: Mapped[int] = mapped_column(ForeignKey("themes.id"), primary_key=True)
+    state: Mapped[int] = mapped_column(SmallInteger, nullable=False)
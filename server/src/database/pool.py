@@ -0,0 +1,122 @@
+"""
+Module for instrumented database connection pool.
+
+``InstrumentedPool`` is ``AsyncAdaptedQueuePool``, which measures time spent on connection acquire and counts overflow
+connections and timeouts. Metrics are kept in ``POOL_STATS`` and are served on ``/stats/pool``.
+"""
+
+import asyncio
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from config import DB_POOL_SLOW_ACQUIRE
+from enums.logs import Logs
+from loggers.setup import LOGGER
+
+
+class PoolStats:
+    """Class with counters of connection pool."""
+
+    __slots__ = (
+        "acquires",
+        "wait_total",
+        "wait_max",
+        "slow_acquires",
+        "overflows",
+        "timeouts",
+    )
+
+    def __init__(self) -> None:
+        """Creates zeroed counters."""
+
+        self.acquires: int = 0
+        self.wait_total: float = 0.0
+        self.wait_max: float = 0.0
+        self.slow_acquires: int = 0
+        self.overflows: int = 0
+        self.timeouts: int = 0
+
+
+# Counters are module-level, so they survive pool recreation on ``engine.dispose()``
+POOL_STATS: PoolStats = PoolStats()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Pool-class extended from ``sqlalchemy.pool.AsyncAdaptedQueuePool``, which collects metrics."""
+
+    def connect(self) -> PoolProxiedConnection:
+        """
+        Overrided function ``connect`` from parent class.
+
+        Measures acquire time and detects overflow connections and pool timeouts.
+
+        :return: proxied DBAPI connection
+        """
+
+        overflow = self._overflow
+        start = perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            POOL_STATS.timeouts += 1
+            LOGGER.error(Logs.DB_POOL_TIMEOUT, self.status())
+            raise
+        waited = perf_counter() - start
+
+        POOL_STATS.acquires += 1
+        POOL_STATS.wait_total += waited
+        POOL_STATS.wait_max = max(POOL_STATS.wait_max, waited)
+        if waited > DB_POOL_SLOW_ACQUIRE:
+            POOL_STATS.slow_acquires += 1
+            LOGGER.warning(Logs.DB_POOL_SLOW_ACQUIRE, waited, self.status())
+        if self._overflow > max(overflow, 0):
+            # Pool is exhausted, connection above ``pool_size`` was opened
+            POOL_STATS.overflows += 1
+            LOGGER.warning(Logs.DB_POOL_OVERFLOW, self.status())
+        return connection
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    """
+    Function, that returns current state and counters of engine's connection pool.
+
+    :param engine: ``sqlalchemy.ext.asyncio.AsyncEngine`` instance
+    :return: dictionary with pool metrics, wait time is in seconds
+    """
+
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "acquires": POOL_STATS.acquires,
+        "wait_avg": (
+            POOL_STATS.wait_total / POOL_STATS.acquires if POOL_STATS.acquires else 0.0
+        ),
+        "wait_max": POOL_STATS.wait_max,
+        "slow_acquires": POOL_STATS.slow_acquires,
+        "overflows": POOL_STATS.overflows,
+        "timeouts": POOL_STATS.timeouts,
+    }
+
+
+async def warm_up_pool(engine: AsyncEngine) -> None:
+    """
+    Function, that opens ``pool_size`` connections at once and returns them to the pool, so first updates after start
+    don't wait for connect.
+
+    :param engine: ``sqlalchemy.ext.asyncio.AsyncEngine`` instance
+    """
+
+    start = perf_counter()
+    connections = await asyncio.gather(
+        *(engine.connect() for _ in range(engine.pool.size()))
+    )
+    for connection in connections:
+        await connection.close()
+    LOGGER.info(Logs.DB_POOL_WARMED, len(connections), perf_counter() - start)
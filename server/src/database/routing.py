@@ -0,0 +1,232 @@
+"""
+Module for routing of reads between primary and read replica.
+
+Read-only queries of service layer are sent with ``READ_ROUTER.read`` and go to replica, unless:
+    - replica is not configured (``DB_REPLICA_HOST``) or failed less than ``DB_REPLICA_RETRY`` seconds ago;
+    - replica lags more than ``DB_REPLICA_MAX_LAG``, lag is checked at most once per ``DB_REPLICA_LAG_CHECK``;
+    - user wrote something less than ``DB_REPLICA_MAX_LAG + DB_REPLICA_LAG_CHECK`` seconds ago, so user always reads
+      own writes (e.g. progress of session after answer).
+
+Writes are detected by commit of any session, while user of current update is bound with ``READ_ROUTER.bind``. Updates
+of a user are always handled by the same worker, so the state is per process. Writes and reads, which precede writes,
+always use ``SessionLocal`` of primary.
+"""
+
+from contextvars import ContextVar
+from time import monotonic
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from config import DB_REPLICA_MAX_LAG, DB_REPLICA_LAG_CHECK, DB_REPLICA_RETRY
+from database.connection import SessionLocal, ReplicaSessionLocal
+from enums.logs import Logs
+from loggers.setup import LOGGER
+
+T = TypeVar("T")
+
+# Replication lag in seconds, zero if everything received is replayed (idle primary doesn't look like lag)
+_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+class ReadRouter:
+    """Router of read-only queries with read-your-writes stickiness."""
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replica: async_sessionmaker[AsyncSession] | None,
+        max_lag: float = DB_REPLICA_MAX_LAG,
+        lag_check: float = DB_REPLICA_LAG_CHECK,
+        retry: float = DB_REPLICA_RETRY,
+    ) -> None:
+        """
+        Creates router.
+
+        :param primary: session maker of primary
+        :param replica: session maker of replica, all reads go to primary if ``None``
+        :param max_lag: replica, which lags more, is skipped
+        :param lag_check: seconds between checks of replica lag
+        :param retry: seconds to skip replica after its failure
+        """
+
+        self._primary = primary
+        self._replica = replica
+        self._max_lag = max_lag
+        self._lag_check = lag_check
+        self._retry = retry
+        # Reads of user go to primary for this time after user's write
+        self._sticky = max_lag + lag_check
+
+        # User of current update
+        self._key: ContextVar[str | None] = ContextVar("read_router_key", default=None)
+        # User -> time of last write, ordered by time
+        self._writes: dict[str, float] = {}
+        self._lag: float = 0.0
+        self._lag_checked: float = float("-inf")
+        self._lagging: bool = False
+        self._failed_until: float = float("-inf")
+
+        # Metrics
+        self.replica_reads: int = 0
+        self.primary_reads: int = 0
+        self.sticky_reads: int = 0
+        self.lagging_reads: int = 0
+        self.failovers: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Property, which tells whether replica is configured.
+
+        :return: ``True`` if reads can go to replica
+        """
+
+        return self._replica is not None
+
+    def bind(self, key: str) -> None:
+        """
+        Method, that binds user to current update, so commits in it are counted as writes of the user.
+
+        :param key: user's unique Telegram id
+        """
+
+        self._key.set(key)
+
+    def on_commit(self) -> None:
+        """Method, that marks write of user, bound to current update. Called after commit of any session."""
+
+        if self._replica is None or (key := self._key.get()) is None:
+            return
+        self.pin(key)
+
+    def pin(self, key: str) -> None:
+        """
+        Method, that sends reads of user to primary for the sticky time.
+
+        :param key: user's unique Telegram id
+        """
+
+        now = monotonic()
+        # Re-inserted key goes to the end, so the oldest writes are always first
+        self._writes.pop(key, None)
+        self._writes[key] = now
+        while (oldest := next(iter(self._writes))) != key:
+            if now - self._writes[oldest] < self._sticky:
+                break
+            del self._writes[oldest]
+
+    async def read(
+        self, key: str | None, query: Callable[[AsyncSession], Awaitable[T]]
+    ) -> T:
+        """
+        Method, that runs read-only query on replica or on primary.
+
+        If query fails on replica, replica is skipped for ``retry`` seconds and query is repeated on primary.
+
+        :param key: user's unique Telegram id or ``None`` if read is not bound to user
+        :param query: coroutine function, which receives session and returns result
+        :return: result of ``query``
+        """
+
+        if self._replica is None:
+            async with self._primary() as session:
+                return await query(session)
+
+        if await self._use_replica(key):
+            try:
+                async with self._replica() as session:
+                    result = await query(session)
+                self.replica_reads += 1
+                return result
+            except (DBAPIError, OSError, TimeoutError) as e:
+                self._fail(e)
+
+        self.primary_reads += 1
+        async with self._primary() as session:
+            return await query(session)
+
+    async def _use_replica(self, key: str | None) -> bool:
+        """
+        Method, that decides, whether read goes to replica.
+
+        :param key: user's unique Telegram id or ``None``
+        :return: ``True`` for replica, ``False`` for primary
+        """
+
+        now = monotonic()
+        if now < self._failed_until:
+            return False
+        if (
+            key is not None
+            and now - self._writes.get(key, float("-inf")) < self._sticky
+        ):
+            self.sticky_reads += 1
+            return False
+
+        if now - self._lag_checked >= self._lag_check:
+            # Set before the check, so concurrent reads don't check lag too
+            self._lag_checked = now
+            try:
+                async with self._replica() as session:
+                    self._lag = float(await session.scalar(_LAG_QUERY))
+            except (DBAPIError, OSError, TimeoutError) as e:
+                self._fail(e)
+                return False
+            if (lagging := self._lag > self._max_lag) != self._lagging:
+                self._lagging = lagging
+                if lagging:
+                    LOGGER.warning(Logs.REPLICA_LAGGING, self._lag)
+                else:
+                    LOGGER.info(Logs.REPLICA_RESTORED, self._lag)
+
+        if self._lagging:
+            self.lagging_reads += 1
+            return False
+        return True
+
+    def _fail(self, error: BaseException) -> None:
+        """
+        Method, that skips replica for ``retry`` seconds.
+
+        :param error: exception, raised by replica
+        """
+
+        self.failovers += 1
+        self._failed_until = monotonic() + self._retry
+        # Lag is checked again on return of replica
+        self._lag_checked = float("-inf")
+        LOGGER.warning(Logs.REPLICA_FAILED, self._retry, repr(error))
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Method, that returns routing metrics.
+
+        :return: dictionary with reads by target, reasons of primary reads, lag and failovers
+        """
+
+        return {
+            "replica": self.enabled,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "sticky_reads": self.sticky_reads,
+            "lagging_reads": self.lagging_reads,
+            "failovers": self.failovers,
+            "lag": self._lag,
+            "lagging": self._lagging,
+            "pinned_users": len(self._writes),
+        }
+
+
+# Router instance, which is used by service layer
+READ_ROUTER: ReadRouter = ReadRouter(SessionLocal, ReplicaSessionLocal)
+
+# Any commit in update of bound user is a write of this user
+event.listen(Session, "after_commit", lambda _session: READ_ROUTER.on_commit())
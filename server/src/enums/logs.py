@@ -17,16 +17,30 @@ class Logs(StrEnum):
     COMMAND: Final[str] = "🤖"
 
     # Log messages
-    COULDN_DELETE_MSG: Final[str] = "[❌🧹] Couldn't delete msg=%s in chat with user=%s"
+    EVENT: Final[str] = '[%s%s] %s "%s" from %s@%s in %s'
+
+    UNKNOWN_EVENT: Final[str] = "[%s] Unknown event from @anonymous in %s"
 
-    AVG_TIMING: Final[str] = "[⏳] Average timing for 25 last requsts: %.5f"
+    COULDN_DELETE_MSG: Final[str] = "[❌🧹] Couldn't delete msg=%s in chat with user=%s"
 
     CHANGE_LOG_SEEN: Final[str] = "[🗄] Changelog seen by %s"
 
+    DEFERRED_HANDLER_FAILED: Final[str] = (
+        "[❌📜] Handler deferred after changelog failed for %s: %s"
+    )
+
     EXAM_RECORD: Final[str] = "[✴️] New exam record updated by %s"
 
     EXAM_TIMEOUT: Final[str] = "[⏰] Exam timed out for %s"
 
+    EXAM_TIMERS_RESTORED: Final[str] = "[⏰] Restored %d exam timers"
+
+    EXAM_TIMERS_FAILED: Final[str] = (
+        "[❌⏰] Couldn't finalize batch of %d expired exams: %s"
+    )
+
+    EXAM_EXPIRE_FAILED: Final[str] = "[❌⏰] Couldn't finalize expired exam of %s: %s"
+
     COULDNT_SEND_MSG_WITH_EFFECT: Final[str] = "[❌💬] Couldn't send msg with effect=%s"
 
     TOO_MANY_SESSIONS: Final[str] = "[♻️] Too many sessions for %s"
@@ -35,8 +49,68 @@ class Logs(StrEnum):
 
     INCORRECT_ANS: Final[str] = "[❌] Incorrect answer from %s"
 
+    ANSWER_NOT_RECORDED: Final[str] = (
+        "[🔁] Answer from %s is already recorded or session is gone"
+    )
+
     SESSION_BROKEN: Final[str] = "[🫠] Session=%s was broken by %s"
 
+    SEND_RETRY_AFTER: Final[str] = "[🐢] Flood control in chat=%s, retry after %s s"
+
+    DUPLICATE_CALLBACK: Final[str] = (
+        '[🔁] Dropped duplicate callback "%s" on msg=%s from %s'
+    )
+
+    DB_POOL_WARMED: Final[str] = "[🔥] Warmed up %d DB connections in %.3f s"
+
+    DB_POOL_SLOW_ACQUIRE: Final[str] = "[🐢🗄] DB connection acquired in %.3f s. %s"
+
+    DB_POOL_OVERFLOW: Final[str] = "[⚠️🗄] DB pool overflow. %s"
+
+    DB_POOL_TIMEOUT: Final[str] = "[❌🗄] DB pool timed out. %s"
+
+    MIGRATION_APPLIED: Final[str] = "[🧱] Migration %s applied"
+    BANK_LOADED: Final[str] = (
+        "[📚] Question bank %s loaded in %.3f s (copy %.3f s, apply %.3f s): "
+        "%d questions, %d new, %d changed, %d unchanged, %d kept in DB only; "
+        "new sections: %d, new themes: %d"
+    )
+    BANK_DRY_RUN: Final[str] = (
+        "[📚] Question bank %s checked in %.3f s (copy %.3f s, diff %.3f s), nothing saved: "
+        "%d questions, %d new, %d changed, %d unchanged, %d kept in DB only; "
+        "new sections: %d, new themes: %d"
+    )
+
+    STORAGE_BANK_LOADED: Final[str] = (
+        "[🗄] Empty %s storage filled: %d sections, %d themes, %d questions"
+    )
+
+    REPLICA_LAGGING: Final[str] = "[⚠️🗄] Read replica lags %.3f s, reads go to primary"
+    REPLICA_RESTORED: Final[str] = "[🗄] Read replica caught up, lag %.3f s"
+    REPLICA_FAILED: Final[str] = (
+        "[❌🗄] Read replica failed, reads go to primary for %.0f s: %s"
+    )
+
+    DB_INDEXES_MISSING: Final[str] = "[⚠️🗄] Missing DB indexes: %s. Run with --migrate"
+
+    CATALOG_LOADED: Final[str] = (
+        "[📚] Catalog loaded from %s in %.3f s: %d sections, %d themes, %d questions"
+    )
+    CATALOG_SNAPSHOT_SKIPPED: Final[str] = "[📚] Catalog snapshot %s is not used: %s"
+    CATALOG_SNAPSHOT_SAVED: Final[str] = (
+        "[📚] Catalog snapshot %s saved, version %d, %d bytes"
+    )
+    CATALOG_SNAPSHOT_FAILED: Final[str] = "[⚠️📚] Couldn't save catalog snapshot %s: %s"
+
     # Running modes
     WEBHOOK_MODE: Final[str] = "[🌐] Running in --webhook mode"
     POLLING_MODE: Final[str] = "[🔨] Running in --polling mode"
+    METRICS_SERVER: Final[str] = "[📈] Metrics server started on port %d"
+    WORKER_STARTED: Final[str] = "[⚙️] Worker %d/%d started, pid %d"
+    WORKER_STOPPED: Final[str] = "[⚙️] Worker %d/%d stopped"
+    POLLING_FAILED: Final[str] = "[❌🔨] Failed to fetch updates: %s"
+    WEBHOOK_REJECTED: Final[str] = "[🚧] Webhook queue is full, update %s rejected"
+    WEBHOOK_DRAINED: Final[str] = "[🌐] Drained webhook queue in %.3f s"
+    WEBHOOK_DRAIN_TIMEOUT: Final[str] = (
+        "[❌🌐] %d webhook updates were not handled before shutdown"
+    )
@@ -5,12 +5,20 @@ and some constructor functions, which return more complicated markups.
 
 
 from enum import Enum
+from functools import lru_cache
 from typing import Final
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
-from database.models import UserSession, Section, Theme, User
-from enums.strings import MiscButtons, NavButtons
+from catalog.entries import SectionEntry, ThemeEntry
+from catalog.storage import CATALOG
+from database.models import ThemeProgress
+from enums.strings import MiscButtons, NavButtons, Markers
+from repositories.entries import UserSessionEntry
+from services.progress_service import theme_state
+
+# Number of themes on one page of section
+THEMES_PER_PAGE: Final[int] = 5
 
 
 class Buttons(Enum):
@@ -63,7 +71,7 @@ class Markups(Enum):
     )
 
     @staticmethod
-    def only_hints_markup(user_session: UserSession) -> InlineKeyboardMarkup:
+    def only_hints_markup(user_session: UserSessionEntry) -> InlineKeyboardMarkup:
         """
         Method, that returns markup for quiz question-message.
 
@@ -86,7 +94,7 @@ class Markups(Enum):
         )
 
     @staticmethod
-    def sections_markup(sections: list[Section]) -> InlineKeyboardMarkup:
+    def sections_markup(sections: list[SectionEntry]) -> InlineKeyboardMarkup:
         """
         Method, that returns markup for section-selection message.
 
@@ -116,12 +124,93 @@ class Markups(Enum):
         )
 
     @staticmethod
-    def theme_chosen_markup(theme: Theme, user: User) -> InlineKeyboardMarkup:
+    @lru_cache(maxsize=4096)
+    def themes_page_markup(
+        section_id: int, page: int, page_bits: int
+    ) -> InlineKeyboardMarkup:
+        """
+        Method, that returns markup for page with themes in specific section.
+
+        Markups are cached, catalog doesn't change while the bot is running, so the markup depends only on arguments.
+        Returned object is shared and must not be modified.
+
+        :param section_id: chosen section
+        :param page: number of page, starting from 1
+        :param page_bits: states of themes on the page, see ``services.progress_service.page_bits``
+        :return: gathered markup
+        """
+
+        themes = CATALOG.themes_by_section.get(section_id, ())
+        start_index = (page - 1) * THEMES_PER_PAGE
+        end_index = page * THEMES_PER_PAGE
+        keyboard = InlineKeyboardMarkup(inline_keyboard=[])
+        last_page = False
+
+        # Adding themes to keyboard
+        for i, theme in enumerate(themes[start_index:end_index]):
+            match theme_state(page_bits, i):
+                case ThemeProgress.FULL:
+                    marker = Markers.GREEN
+                case ThemeProgress.PARTICULAR:
+                    marker = Markers.YELLOW
+                case ThemeProgress.TRIED:
+                    marker = Markers.ORANGE
+                case _:
+                    marker = Markers.RED
+            keyboard.inline_keyboard.append(
+                [
+                    InlineKeyboardButton(
+                        text=marker + " " + theme.title,
+                        callback_data=f"theme_{theme.id}_{str(section_id)}",
+                    )
+                ]
+            )
+
+        # Next page button
+        if len(themes) > end_index:
+            keyboard.inline_keyboard.append(
+                [
+                    InlineKeyboardButton(
+                        text=NavButtons.FORWARD_ARROW,
+                        callback_data=f"page_{page + 1}_{str(section_id)}",
+                    )
+                ]
+            )
+        else:
+            last_page = True
+
+        # Previous page button
+        if page > 1:
+            back_button = InlineKeyboardButton(
+                text=NavButtons.BACK_ARROW,
+                callback_data=f"page_{page - 1},{str(section_id)}",
+            )
+            if last_page:
+                keyboard.inline_keyboard.append([back_button])
+            else:
+                keyboard.inline_keyboard[-1].insert(0, back_button)
+
+        # Back to sections button
+        keyboard.inline_keyboard.append(
+            [
+                InlineKeyboardButton(
+                    text=NavButtons.BACK_TO_SECTIONS, callback_data="pet"
+                )
+            ]
+        )
+        # Delete message button
+        keyboard.inline_keyboard.append([Buttons.DELETE_BUTTON.value])
+        return keyboard
+
+    @staticmethod
+    def theme_chosen_markup(
+        theme: ThemeEntry, progress: ThemeProgress
+    ) -> InlineKeyboardMarkup:
         """
         Method, that returns markup for pre-quiz message.
 
         :param theme: chosen theme
-        :param user: current user
+        :param progress: current user's progress in chosen theme
         :return: gathered markup
         """
 
@@ -153,7 +242,7 @@ class Markups(Enum):
                             + str(theme.section_id),
                         ),
                     ]
-                    if theme.id not in user.themes_done_full
+                    if progress != ThemeProgress.FULL
                     else [
                         InlineKeyboardButton(
                             text=NavButtons.BACK_TO_THEMES + " ◀️",
@@ -120,10 +120,10 @@ class Messages(StrEnum):
     # Message after the /exam entered
     EXAM_MESSAGE = f"""Ты все-таки {html.bold('решился')}, бухгалтер?.. 🥷🏼
                    \nВ режиме экзамена ты сможешь доказать мне, что достоин. {html.spoiler('Достоин чего? Не знаю. Я просто нагоняю пафоса 🌡')}
-                   \nЯ подберу для тебя {html.code('35')} случайных вопросов из всей моей коллекции 🗄 и дам на их решение {html.code('20')} минут ⏰
+                   \nЯ подберу для тебя {html.code('%s')} случайных вопросов из всей моей коллекции 🗄 и дам на их решение {html.code('%s')} минут ⏰
                    \n⚠️ {html.bold('Подсказки во время экзамена будут недоступны!')}
                    \n\nТвоя главная задача - {html.italic('не опозориться')}, ой, то есть {html.italic('решить как можно больше вопросов и допустить как можно меньше ошибок')}.
-                   \n\nТвой наилучший результат: %s{html.code('/35')} 🏆 
+                   \n\nТвой наилучший результат: %s{html.code('/%s')} 🏆 
                    \n\nНу, что? Готов? {html.spoiler('Хватай клинок 🗡 Будем драться 🤼')} 
                    """
     THIS_IS_EXAM: Final[str] = html.code("Это экзамен, братуха 🥶")  # Header for each exam question
@@ -140,7 +140,7 @@ class Messages(StrEnum):
         \n3. В разделе выбора темы я буду делать для тебя пометки разными цветами, чтобы тебе было удобнее:
         \n{html.code('🔴 - Ни разу не запущенная тема')}\n{html.code('🟠 - Хотя бы раз запущенная тема')}\n{html.code('🟡 - Тема, пройденная с ошибками')}\n{html.code('🟢 - Тема, пройденная без ошибок')}
         \nЕсли не хочется решать всё идеально, можешь выбрать нужную тему и схитрить - пометить ее зеленым цветом 🟢
-        \n4. Еще я могу принять у тебя экзамен! 🎓 Он доступен по команде /exam. В этом режиме я выберу для тебя 35 случайных вопросов, в каждом из которых будет НЕ более 4 вариантов ответа, и дам на их решение 20 минут. Учти, я не шучу, таймер действительно работает! ⌛️ Перерешать экзамен будет нельзя, но я буду хранить информацию о твоих лучших результатах. Подсказки во время экзамена недоступны.
+        \n4. Еще я могу принять у тебя экзамен! 🎓 Он доступен по команде /exam. В этом режиме я выберу для тебя %s случайных вопросов, в каждом из которых будет НЕ более %s вариантов ответа, и дам на их решение %s минут. Учти, я не шучу, таймер действительно работает! ⌛️ Перерешать экзамен будет нельзя, но я буду хранить информацию о твоих лучших результатах. Подсказки во время экзамена недоступны.
         \n5. Очень редко, но я могу ломаться, все мы не идеальны... На такой случай есть команда {html.spoiler('последней надежды')} - /heal. Введи ее, и я попробую выдать тебе вопрос, на котором ты остановился.
         \n6. Еще реже я буду отправлять тебе сообщения о том, что не смог удалить ❌🧹 или применить эффект к сообщению ⚠️🔇
         \n\n🧑‍💻 Если что-то сломается, пиши @shasoka.
@@ -150,7 +150,7 @@ class Messages(StrEnum):
     # Message after the exam session end
     ON_EXAM_END: Final[str] = f"""
         Ладно, ладно. Успокойся. Финиш 🏁
-        \n%s Правильных ответов: %s{html.code('/35')}
+        \n%s Правильных ответов: %s{html.code('/%s')}
         \n\nКаков бы ни был результат, помни, что ты - легенда 👑
         \n\nВторой попытки не будет. Сам понимаешь, это все-таки {html.bold('ЭКЗАМЕН')}, тут головой думать надо! 🧠
         """
@@ -2,24 +2,21 @@
 
 
 from aiogram import html
-from aiogram.types import (
-    CallbackQuery,
-    Message,
-    InlineKeyboardMarkup,
-    InlineKeyboardButton,
-)
+from aiogram.types import CallbackQuery, Message, InlineKeyboardButton
 
-from enums.markups import Markups, Buttons
-from enums.strings import Messages, NavButtons, CallbackQueryAnswers, Markers
+from enums.markups import Markups, THEMES_PER_PAGE
+from enums.strings import Messages, NavButtons, CallbackQueryAnswers
 from handlers.utility_handlers import delete_msg_handler
+from repositories.entries import UserEntry
 from services.entities_service import (
     get_sections,
     get_themes_by_section,
-    get_user,
     get_theme_by_id,
     get_questions_with_len_by_theme,
     update_themes_progress,
+    get_themes_progress,
 )
+from services.progress_service import page_bits, theme_state
 
 
 async def pet_me_button_pressed(callback_query: CallbackQuery | Message) -> None:
@@ -48,86 +45,32 @@ async def pet_me_button_pressed(callback_query: CallbackQuery | Message) -> None
         )
 
 
-async def section_button_pressed(callback_query: CallbackQuery) -> None:
+async def section_button_pressed(
+    callback_query: CallbackQuery, user: UserEntry
+) -> None:
     """
     Function, that is called on ``aiogram.types.CallbackQuery`` with ``data`` property starting with ``section``.
 
     Creates markup for navigation between pages with themes in specific section.
 
     :param callback_query: incoming ``aiogram.types.CallbackQuery`` object
+    :param user: current user, loaded by ``ContextMiddleware``
     """
 
     chosen_section = int(callback_query.data[-1])
     themes = await get_themes_by_section(chosen_section)
-    user = await get_user(str(callback_query.from_user.id))
     start_page = (
         1 if callback_query.data.startswith("section") else int(callback_query.data[-3])
     )
-    per_page = 5
-    start_index = (start_page - 1) * per_page
-    end_index = start_page * per_page
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[])
-    last_page = False
-
-    # Adding themes to keyboard
-    # 5 themes per page
-    for i, theme in enumerate(themes[start_index:end_index]):
-        if theme.id in user.themes_done_full:
-            marker = Markers.GREEN
-        elif theme.id in user.themes_done_particular:
-            marker = Markers.YELLOW
-        elif theme.id in user.themes_tried:
-            marker = Markers.ORANGE
-        else:
-            marker = Markers.RED
-        keyboard.inline_keyboard.append(
-            [
-                InlineKeyboardButton(
-                    text=marker + " " + theme.title,
-                    callback_data=f"theme_{theme.id}_{str(chosen_section)}",
-                )
-            ]
-        )
+    progress = await get_themes_progress(user.id)
+    page_themes = themes[
+        (start_page - 1) * THEMES_PER_PAGE : start_page * THEMES_PER_PAGE
+    ]
 
-    # Next page button
-    if len(themes) > end_index:
-        keyboard.inline_keyboard.append(
-            [
-                InlineKeyboardButton(
-                    text=NavButtons.FORWARD_ARROW,
-                    callback_data=f"page_{start_page + 1}_{str(chosen_section)}",
-                )
-            ]
-        )
-    else:
-        last_page = True
-
-    # Previous page button
-    if start_page > 1:
-        if last_page:
-            keyboard.inline_keyboard.append(
-                [
-                    InlineKeyboardButton(
-                        text=NavButtons.BACK_ARROW,
-                        callback_data=f"page_{start_page - 1},{str(chosen_section)}",
-                    )
-                ]
-            )
-        else:
-            keyboard.inline_keyboard[-1].insert(
-                0,
-                InlineKeyboardButton(
-                    text=NavButtons.BACK_ARROW,
-                    callback_data=f"page_{start_page - 1},{str(chosen_section)}",
-                ),
-            )
-
-    # Back to sections button
-    keyboard.inline_keyboard.append(
-        [InlineKeyboardButton(text=NavButtons.BACK_TO_SECTIONS, callback_data="pet")]
+    # Markup is cached by states of themes on the page, so it is shared by users with the same progress
+    keyboard = Markups.themes_page_markup(
+        chosen_section, start_page, page_bits(progress, (t.id for t in page_themes))
     )
-    # Delete message button
-    keyboard.inline_keyboard.append([Buttons.DELETE_BUTTON.value])
 
     await delete_msg_handler(callback_query)
     await callback_query.message.bot.send_message(
@@ -138,27 +81,30 @@ async def section_button_pressed(callback_query: CallbackQuery) -> None:
     )
 
 
-async def theme_button_pressed(callback_query: CallbackQuery) -> None:
+async def theme_button_pressed(callback_query: CallbackQuery, user: UserEntry) -> None:
     """
     Function, that is called on ``aiogram.types.CallbackQuery`` with ``data`` property starting with ``theme``.
 
     :param callback_query: incoming ``aiogram.types.CallbackQuery`` object
+    :param user: current user, loaded by ``ContextMiddleware``
     """
 
     chosen_theme_from_callback, chosen_section = callback_query.data.split("_")[1:]
     chosen_theme = await get_theme_by_id(int(chosen_theme_from_callback))
-    user = await get_user(str(callback_query.from_user.id))
 
     _, questions_total = await get_questions_with_len_by_theme(
         int(chosen_theme_from_callback)
     )
+    progress = await get_themes_progress(user.id)
 
     await delete_msg_handler(callback_query)
     await callback_query.message.bot.send_message(
         chat_id=callback_query.message.chat.id,
         text=Messages.ON_THEME_CHOSEN
         % (html.italic(chosen_theme.title), html.code(str(questions_total))),
-        reply_markup=Markups.theme_chosen_markup(chosen_theme, user),
+        reply_markup=Markups.theme_chosen_markup(
+            chosen_theme, theme_state(progress, chosen_theme.id)
+        ),
         disable_notification=True,
     )
 
@@ -5,77 +5,99 @@ from aiogram import html
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import Message, CallbackQuery
 
+from catalog.sampling import get_exam_profile
 from enums.markups import Markups
 from enums.strings import Messages
 from handlers.buttons_handler import pet_me_button_pressed
-from handlers.exam_handler import exam, TASKS
+from handlers.exam_handler import exam
 from handlers.quiz_handler import quiz
+from repositories.entries import UserEntry, UserSessionEntry
 from services.entities_service import (
     clear_session,
-    get_user,
-    get_user_with_session,
     change_hints_policy,
+    get_user_exam_best,
 )
+from services.timer_service import EXAM_TIMERS
 
 
-async def command_start_handler(message: Message) -> None:
+async def command_start_handler(
+    message: Message, user_session: UserSessionEntry | None
+) -> None:
     """
     Handler for incoming ``/start`` command.
 
     It awaits user's session clearing (if any exists) and sends back new on-start-message with inline keyboard.
 
     :param message: incoming Telegram message from user
+    :param user_session: current user's session, loaded by ``ContextMiddleware``
     """
 
-    await clear_session(message, message.bot)
+    await clear_session(message, message.bot, user_session)
 
+    profile = get_exam_profile()
     await message.answer(
-        Messages.ON_START_MESSAGE % html.bold(message.from_user.full_name),
+        Messages.ON_START_MESSAGE
+        % (
+            html.bold(message.from_user.full_name),
+            profile.questions_total,
+            profile.max_options,
+            f"{profile.duration:g}",
+        ),
         reply_markup=Markups.PET_ME_MARKUP.value,
         disable_notification=True,
     )
 
 
-async def command_exam_handler(message: Message) -> None:
+async def command_exam_handler(
+    message: Message, user: UserEntry, user_session: UserSessionEntry | None
+) -> None:
     """
     Handler for incoming ``/exam`` command.
 
     It awaits user's session clearing (if any exists) and sends back new pre-exam-message with inline keyboard.
 
     :param message: incoming Telegram message from user
+    :param user: current user, loaded by ``ContextMiddleware``
+    :param user_session: current user's session, loaded by ``ContextMiddleware``
     """
 
-    await clear_session(message, message.bot)
-
-    user = await get_user(str(message.from_user.id))
+    await clear_session(message, message.bot, user_session)
 
+    profile = get_exam_profile()
     await message.answer(
-        text=Messages.EXAM_MESSAGE % html.code(str(user.exam_best)),
+        text=Messages.EXAM_MESSAGE
+        % (
+            profile.questions_total,
+            f"{profile.duration:g}",
+            html.code(str(get_user_exam_best(user))),
+            profile.questions_total,
+        ),
         reply_markup=Markups.FIGHT_ME_MARKUP.value,
         disable_notification=True,
     )
 
 
-async def command_restart_handler(message: Message) -> None:
+async def command_restart_handler(
+    message: Message, user_session: UserSessionEntry | None
+) -> None:
     """
     Handler for incoming ``/restart`` command.
 
     It awaits user's session clearing (if any exists) and calls back to state, where user can choose section.
 
     :param message: incoming Telegram message from user
+    :param user_session: current user's session, loaded by ``ContextMiddleware``
     """
 
-    # Stop async timer task if any exists
-    if (telegram_id := str(message.from_user.id)) in TASKS:
-        cur_task = TASKS.pop(telegram_id)
-        cur_task[0].cancel()
+    # Stop exam timer if any exists
+    EXAM_TIMERS.cancel(str(message.from_user.id))
 
-    await clear_session(message, message.bot)
+    await clear_session(message, message.bot, user_session)
     # Imitating the same behaviour as when user pressed the "pet_me" button
     await pet_me_button_pressed(callback_query=message)
 
 
-async def command_heal_handler(message: Message) -> None:
+async def command_heal_handler(message: Message, user: UserEntry) -> None:
     """
     Handler for incoming ``/heal`` command.
 
@@ -84,10 +106,10 @@ async def command_heal_handler(message: Message) -> None:
     If session restoration fails function sends back error message.
 
     :param message: incoming Telegram message from user
+    :param user: current user with session, loaded by ``ContextMiddleware``
     """
 
     try:
-        user = await get_user_with_session(str(message.from_user.id))
         user_session = user.session
         if user_session.theme_id is not None:
             return await quiz(
@@ -97,7 +119,8 @@ async def command_heal_handler(message: Message) -> None:
                     chat_instance=str(message.chat.id),
                     message=message,
                     data="quiz_heal",
-                )
+                ),
+                user=user,
             )
         else:
             return await exam(
@@ -107,7 +130,8 @@ async def command_heal_handler(message: Message) -> None:
                     chat_instance=str(message.chat.id),
                     message=message,
                     data="exam_heal",
-                )
+                ),
+                user=user,
             )
     except (AttributeError, IndexError, KeyError):
         await message.answer(
@@ -118,6 +142,8 @@ async def command_heal_handler(message: Message) -> None:
 
 async def command_change_hints_policy_handler(
     message: Message,
+    user: UserEntry,
+    user_session: UserSessionEntry | None,
 ) -> None:
     """
     Handler for incoming ``/change_hints_policy`` command.
@@ -125,20 +151,20 @@ async def command_change_hints_policy_handler(
     It changes hints policy for current user (switches between On/Off). Status message is sent back.
 
     :param message: incoming Telegram message from user
+    :param user: current user, loaded by ``ContextMiddleware``
+    :param user_session: current user's session, loaded by ``ContextMiddleware``
     """
 
-    user = await get_user_with_session(str(message.from_user.id))
-    user_session = user.session
-
+    # New value is returned by the update itself, so repeated commands can't show a stale policy
+    hints_allowed = await change_hints_policy(str(message.from_user.id))
     await message.answer(
-        text=Messages.HINTS_OFF if user.hints_allowed else Messages.HINTS_ON,
+        text=Messages.HINTS_ON if hints_allowed else Messages.HINTS_OFF,
         reply_markup=Markups.ONLY_DELETE_MARKUP.value,
     )
-    await change_hints_policy(str(message.from_user.id))
 
     try:
         if user_session:
-            if not user.hints_allowed:  # Hints allowed
+            if hints_allowed:
                 if user_session.cur_q_msg and (
                     not user_session.cur_a_msg
                     or user_session.cur_q_msg > user_session.cur_a_msg
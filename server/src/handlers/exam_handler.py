@@ -3,41 +3,65 @@
 
 import asyncio
 import random
-from asyncio import Task
 from datetime import datetime, UTC, timedelta
+from functools import partial
 
-from aiogram import html
+from aiogram import html, Bot
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import CallbackQuery
 
+from catalog.entries import QuestionEntry
+from catalog.sampling import get_exam_profile
 from enums.logs import Logs
 from enums.markups import Markups
 from enums.strings import CallbackQueryAnswers, Arrays, Messages
-from handlers.buttons_handler import delete_msg_handler
 from handlers.utility_handlers import try_send_msg_with_effect, sleep_for_alert
 from loggers.setup import LOGGER
+from repositories.entries import UserEntry
 from services.entities_service import (
     increase_help_alert_counter,
-    get_user,
     init_exam_session,
     clear_session,
     get_user_with_session,
-    save_msg_id,
+    get_users_with_session,
     update_user_exam_best,
+    get_user_exam_best,
     get_cur_question_with_count,
+    get_exam_deadlines,
+    mark_written,
 )
-from services.utility_service import parse_answers_from_question
+from services.messages_service import (
+    delete_messages,
+    save_session_msgs,
+    session_msg_ids,
+)
+from services.lanes import USER_LANES
+from services.send_scheduler import send_priority, Priority
+from services.sharding import CURRENT_SHARD
+from services.timer_service import EXAM_TIMERS
+
+
+def exam_question_text(
+    progress: int, questions_total: int, question: QuestionEntry
+) -> str:
+    """
+    Function, that assembles text of exam question message.
 
-# Constant for exam duration in minutes
-EXAM_DURATION: float = 20.0
+    :param progress: number of answered questions in session
+    :param questions_total: number of questions in session
+    :param question: current question
+    :return: HTML text of message
+    """
 
-# Dictionary with alive exam sessions and bounded with them tasks
-# Stores in RAM (unfortunately)
-TASKS: dict[str, (Task, datetime)] = {}
+    return (
+        f"{html.code(f'{progress + 1} / {questions_total}')}"
+        f"\n{html.code(f'Раздел {"I" * question.theme.section_id} | {question.theme.title.split(".")[0]}')}"
+        f"\n\n{Messages.THIS_IS_EXAM}\n\n{html.bold(question.title)}\n\n{question.rendered.answers_html}"
+    )
 
 
 # noinspection PyAsyncCall,PyTypeChecker
-async def exam(callback_query: CallbackQuery) -> None:
+async def exam(callback_query: CallbackQuery, user: UserEntry | None = None) -> None:
     """
     Function, which handles incoming ``aiogram.types.CallbackQuery``, which ``data`` property starts with ``exam``.
 
@@ -49,20 +73,27 @@ async def exam(callback_query: CallbackQuery) -> None:
     - ``exam_end``: shows exam summary.
 
     :param callback_query: incoming ``aiogram.types.CallbackQuery`` object
+    :param user: current user with session, loaded by ``ContextMiddleware``
     """
     telegram_id = str(callback_query.from_user.id)
     # Retrieve the bot instance. Query can be too old if it was sent from /heal command
     _bot = callback_query.bot if callback_query.bot else callback_query.message.bot
+    # Direct calls of this handler may not provide loaded context
+    if user is None:
+        user = await get_user_with_session(telegram_id)
 
     if callback_query.data.startswith("exam_init"):
         # Logic for exam_init
-        await increase_help_alert_counter(telegram_id)
-        await delete_msg_handler(callback_query)
+        help_alert_counter = await increase_help_alert_counter(telegram_id)
+        await delete_messages(
+            _bot, callback_query.message.chat.id, [callback_query.message.message_id]
+        )
 
-        user = await get_user(telegram_id)
+        # Get the end_time based on exam duration
+        end_time = datetime.now(UTC) + timedelta(minutes=get_exam_profile().duration)
 
         alive_sessions = True
-        while not await init_exam_session(telegram_id):
+        while not await init_exam_session(telegram_id, end_time):
             if alive_sessions:
                 await callback_query.answer(
                     text=CallbackQueryAnswers.SESSION_CREATION_DELAY
@@ -72,106 +103,56 @@ async def exam(callback_query: CallbackQuery) -> None:
                 )
                 alive_sessions = False
                 LOGGER.warning(
-                    Logs.TOO_MANY_SESSIONS % (user.telegram_id + "@" + user.username)
+                    Logs.TOO_MANY_SESSIONS, user.telegram_id + "@" + user.username
                 )
             await clear_session(callback_query, callback_query.bot)
 
         asyncio.create_task(
-            sleep_for_alert(
-                user.help_alert_counter, _bot, callback_query.message.chat.id
-            )
+            sleep_for_alert(help_alert_counter, _bot, callback_query.message.chat.id)
         )
 
-        # Get the end_time based on exam duration
-        end_time = datetime.now(UTC) + timedelta(minutes=EXAM_DURATION)
-        # Add cur exam session to tasks dictionary and start the async task for timer
-        TASKS[telegram_id] = (
-            asyncio.create_task(
-                handle_exam_timeout(callback_query, telegram_id, end_time)
-            ),
-            end_time,
+        # Start the timer, deadline is already persisted with the session
+        EXAM_TIMERS.schedule(telegram_id, end_time)
+        await callback_query.answer(
+            text=CallbackQueryAnswers.EXAM_SESSION_CREATED,
+            show_alert=False,
+            disable_notification=True,
         )
 
     if callback_query.data.startswith("exam_end"):
         # Logic for exam_end
-        user = await get_user_with_session(telegram_id)
-        to_delete = [
-            user.session.cur_a_msg,
-            user.session.cur_p_msg,
-            user.session.cur_q_msg,
-        ]
-        for i, msg in enumerate(to_delete):
-            if msg is not None:
-                await delete_msg_handler(
-                    callback_query,
-                    chat_id=callback_query.message.chat.id,
-                    message_id=msg,
-                )
-                await save_msg_id(user.telegram_id, None, "apq"[i])
-
-        score = user.session.progress - len(user.session.incorrect_questions)
-
-        if "timeout" not in callback_query.data:
-            msg_text = Messages.ON_EXAM_END % (
-                (
-                    Messages.EXAM_RECORD
-                    if score > user.exam_best
-                    else Messages.EXAM_NOT_RECORD
-                ),
-                html.code(str(score)),
-            )
-        else:
-            msg_text = (
-                Messages.TIMES_UP
-                + "\n\n"
-                + Messages.ON_EXAM_END
-                % (
-                    (
-                        Messages.EXAM_RECORD
-                        if score > user.exam_best
-                        else Messages.EXAM_NOT_RECORD
-                    ),
-                    html.code(str(score)),
-                )
-            )
-            LOGGER.info(Logs.EXAM_TIMEOUT % (user.telegram_id + "@" + user.username))
-        cur_task = TASKS.pop(telegram_id)
-        cur_task[0].cancel()
-        s_msg = await try_send_msg_with_effect(
-            bot=callback_query.bot,
-            chat_id=callback_query.message.chat.id,
-            text=msg_text,
-            reply_markup=Markups.ONLY_DELETE_MARKUP.value,
-            message_effect_id=random.choice(Arrays.SUCCESS_EFFECT_IDS.value),
+        return await finish_exam(
+            _bot,
+            callback_query.message.chat.id,
+            user,
+            timeout="timeout" in callback_query.data,
         )
 
-        await update_user_exam_best(telegram_id, score)
-        await save_msg_id(user.telegram_id, s_msg.message_id, "s")
-        return
-
     # Logic for quiz, also runs on exam_init
-    user = await get_user_with_session(telegram_id)
+    if callback_query.data.startswith("exam_init"):
+        # Session was just created, so loaded context is outdated
+        user = await get_user_with_session(telegram_id)
 
-    if telegram_id not in TASKS:
+    if (remaining := EXAM_TIMERS.remaining(telegram_id)) is None:
         await _bot.send_message(
             chat_id=callback_query.message.chat.id,
             text=Messages.SOMETHING_WENT_WRONG,
             reply_markup=Markups.ONLY_DELETE_MARKUP.value,
         )
         LOGGER.warning(
-            Logs.SESSION_BROKEN
-            % (str(user.session.id), user.telegram_id + "@" + user.username)
+            Logs.SESSION_BROKEN,
+            str(user.session.id),
+            user.telegram_id + "@" + user.username,
         )
         return
 
-    if (TASKS[telegram_id][1] - datetime.now(UTC)).total_seconds() > 2:
+    if remaining > 2:
         # Don't proceed user answer if it is less than 2 seconds before exam end to prevent sending next question after
         # exam end
-        cur_question, questions_total = await get_cur_question_with_count(telegram_id)
+        cur_question, questions_total = await get_cur_question_with_count(user.session)
 
         if (user.session.progress + 1) % 5 == 0:
-            delta = int((TASKS[telegram_id][1] - datetime.now(UTC)).total_seconds())
-            minutes, seconds = divmod(delta, 60)
+            minutes, seconds = divmod(int(remaining), 60)
             try:
                 await callback_query.answer(
                     text=f"{CallbackQueryAnswers.TIMER} {minutes:02d}:{seconds:02d}",
@@ -182,81 +163,181 @@ async def exam(callback_query: CallbackQuery) -> None:
                 pass
 
         if not callback_query.data.startswith("exam_init"):
-            to_delete = [
-                user.session.cur_a_msg,
-                user.session.cur_p_msg,
-                user.session.cur_q_msg,
-            ]
-            for i, msg in enumerate(to_delete):
-                if msg is not None:
-                    await delete_msg_handler(
-                        callback_query,
-                        chat_id=callback_query.message.chat.id,
-                        message_id=msg,
-                    )
-                    await save_msg_id(user.telegram_id, None, "apq"[i])
-
-        answers, answers_str = parse_answers_from_question(cur_question.answers)
-
-        q_msg = await _bot.send_message(
-            chat_id=callback_query.message.chat.id,
-            text=f"{html.code(f'{user.session.progress + 1} / {questions_total}')}"
-            f"\n{html.code(f'Раздел {"I" * cur_question.theme.section_id} | {cur_question.theme.title.split(".")[0]}')}"
-            f"\n\n{Messages.THIS_IS_EXAM}\n\n{html.bold(cur_question.title)}\n\n{answers_str}",
-            disable_notification=True,
-        )
+            await delete_messages(
+                _bot,
+                callback_query.message.chat.id,
+                session_msg_ids(user.session, "apq"),
+            )
 
-        p_msg = await _bot.send_poll(
-            chat_id=callback_query.message.chat.id,
-            question=(
-                Messages.SELECT_ONE
-                if len(cur_question.correct_answer) == 1
-                else Messages.SELECT_MANY
-            ),
-            options=[ans.lower()[:2] for ans in answers],
-            type="regular",
-            allows_multiple_answers=True,
-            is_anonymous=False,
-            disable_notification=True,
-        )
+        rendered = cur_question.rendered
+
+        # Question and poll go ahead of changelogs and alerts
+        with send_priority(Priority.HIGH):
+            q_msg = await _bot.send_message(
+                chat_id=callback_query.message.chat.id,
+                text=exam_question_text(
+                    user.session.progress, questions_total, cur_question
+                ),
+                disable_notification=True,
+            )
 
-        await save_msg_id(user.telegram_id, q_msg.message_id, "q")
-        await save_msg_id(user.telegram_id, p_msg.message_id, "p")
+            p_msg = await _bot.send_poll(
+                chat_id=callback_query.message.chat.id,
+                question=(
+                    Messages.SELECT_ONE
+                    if len(cur_question.correct_answer) == 1
+                    else Messages.SELECT_MANY
+                ),
+                options=list(rendered.poll_options),
+                type="regular",
+                allows_multiple_answers=True,
+                is_anonymous=False,
+                disable_notification=True,
+            )
 
+        # Slot of deleted answer message is cleared with the same write
+        await save_session_msgs(
+            user.session.id, q=q_msg.message_id, p=p_msg.message_id, a=None
+        )
 
-async def handle_exam_timeout(
-    callback_query: CallbackQuery, telegram_id, end_time
+
+async def finish_exam(
+    bot: Bot, chat_id: int | str, user: UserEntry, timeout: bool = False
 ) -> None:
     """
-    Function, which is used as ``asyncio.Task``. Implements timer for exam.
+    Function, which terminates exam session: deletes question messages, sends exam summary and updates user's record.
 
-    If time is up, then this function will terminate exam session by sending ``aiogram.types.CallbackQuery`` with
-    ``data`` property equals to ``exam_end_timeout``.
+    Called on ``exam_end`` callback and by ``EXAM_TIMERS`` when time is up.
 
-    :param callback_query: incoming ``aiogram.types.CallbackQuery`` object
-    :param telegram_id: user, who started exam session
-    :param end_time: time, when exam must be stopped
-    :return:
+    :param bot: instance of ``aiogram.Bot``
+    :param chat_id: chat id, where exam is running
+    :param user: user with loaded session
+    :param timeout: flag, whether exam was stopped because time is up
     """
 
-    time_remaining = (end_time - datetime.now(UTC)).total_seconds()
-    await callback_query.answer(
-        text=CallbackQueryAnswers.EXAM_SESSION_CREATED,
-        show_alert=False,
-        disable_notification=True,
+    # Summary was already sent, e.g. by timer, while ``exam_end`` waited in the lane of user
+    if user.session is None or user.session.cur_s_msg is not None:
+        return
+
+    EXAM_TIMERS.cancel(user.telegram_id)
+
+    await delete_messages(bot, chat_id, session_msg_ids(user.session, "apq"))
+
+    score = user.session.progress - len(user.session.incorrect_questions)
+
+    msg_text = Messages.ON_EXAM_END % (
+        (
+            Messages.EXAM_RECORD
+            if score > get_user_exam_best(user)
+            else Messages.EXAM_NOT_RECORD
+        ),
+        html.code(str(score)),
+        get_exam_profile().questions_total,
+    )
+    if timeout:
+        msg_text = Messages.TIMES_UP + "\n\n" + msg_text
+        LOGGER.info(Logs.EXAM_TIMEOUT, user.telegram_id + "@" + user.username)
+
+    s_msg = await try_send_msg_with_effect(
+        bot=bot,
+        chat_id=chat_id,
+        text=msg_text,
+        reply_markup=Markups.ONLY_DELETE_MARKUP.value,
+        message_effect_id=random.choice(Arrays.SUCCESS_EFFECT_IDS.value),
+    )
+
+    await update_user_exam_best(user.telegram_id, score)
+    await save_session_msgs(user.session.id, a=None, p=None, q=None, s=s_msg.message_id)
+
+
+async def expire_exam(bot: Bot, telegram_id: str) -> bool:
+    """
+    Function, which finalizes exam of user, whose exam time is up. Must be run in the lane of user, so it never
+    overlaps with ``exam`` and ``exam_end`` callbacks of the user. Session is read inside the lane, so the state, left
+    by callbacks handled before, is seen.
+
+    Exam is skipped if session was removed, all questions are answered or summary was already sent.
+
+    :param bot: instance of ``aiogram.Bot``
+    :param telegram_id: string with user's unique Telegram id
+    :return: ``True`` if exam was finalized, ``False`` if it was skipped
+    """
+
+    # Read from primary: timers are not bound to updates of the user
+    users = await get_users_with_session([telegram_id])
+    if not users or not (
+        (user_session := users[0].session) is not None
+        and user_session.theme_id is None
+        and user_session.cur_s_msg is None
+        and user_session.progress < user_session.questions_total
+    ):
+        return False
+
+    await finish_exam(bot, int(telegram_id), users[0], timeout=True)
+    return True
+
+
+async def expire_exams(bot: Bot, telegram_ids: list[str]) -> None:
+    """
+    Function, which finalizes a batch of exams with expired timers. Exams of different users are finalized
+    concurrently, each one in the lane of its user (see ``expire_exam``).
+
+    Failure of one exam is logged and does not stop the others. Failed exam keeps its deadline in DB, so it is
+    finalized again after restart.
+
+    :param bot: instance of ``aiogram.Bot``
+    :param telegram_ids: list of users, whose exam time is up
+    """
+
+    results = await asyncio.gather(
+        *(
+            USER_LANES.run(
+                int(telegram_id), None, partial(expire_exam, bot, telegram_id)
+            )
+            for telegram_id in telegram_ids
+        ),
+        return_exceptions=True,
     )
-    await asyncio.sleep(time_remaining)
-
-    user = await get_user_with_session(telegram_id)
-    user_session = user.session
-
-    if user_session and user_session.progress < 35 and datetime.now(UTC) >= end_time:
-        return await exam(
-            CallbackQuery(
-                id=callback_query.id,
-                from_user=callback_query.from_user,
-                chat_instance=callback_query.chat_instance,
-                message=callback_query.message,
-                data="exam_end_timeout",
+
+    finished = []
+    for telegram_id, result in zip(telegram_ids, results):
+        if isinstance(result, BaseException):
+            LOGGER.exception(
+                Logs.EXAM_EXPIRE_FAILED, telegram_id, result, exc_info=result
             )
-        )
+        elif result:
+            finished.append(telegram_id)
+    # Timers are not bound to updates, so writes of finalized exams are marked explicitly
+    mark_written(finished)
+
+
+async def start_exam_timers(bot: Bot) -> None:
+    """
+    Function, which restores exam timers from DB and starts ``EXAM_TIMERS`` scheduler loop.
+
+    Registered as ``aiogram.Dispatcher`` startup hook.
+
+    :param bot: instance of ``aiogram.Bot``
+    """
+
+    # In multi-process mode timers of user are restored by the worker, which handles the user
+    deadlines = [
+        (telegram_id, deadline)
+        for telegram_id, deadline in await get_exam_deadlines()
+        if CURRENT_SHARD.owns(telegram_id)
+    ]
+    for telegram_id, deadline in deadlines:
+        EXAM_TIMERS.schedule(telegram_id, deadline)
+    LOGGER.info(Logs.EXAM_TIMERS_RESTORED, len(deadlines))
+
+    EXAM_TIMERS.start(on_expire=partial(expire_exams, bot))
+
+
+async def stop_exam_timers() -> None:
+    """
+    Function, which stops ``EXAM_TIMERS`` scheduler loop.
+
+    Registered as ``aiogram.Dispatcher`` shutdown hook.
+    """
+
+    await EXAM_TIMERS.stop()
@@ -7,25 +7,21 @@ from aiogram import html
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import PollAnswer
 
+from catalog.entries import QuestionEntry
 from enums.logs import Logs
 from enums.markups import Markups
 from enums.strings import Arrays, Messages
 from handlers.utility_handlers import try_send_msg_with_effect
 from loggers.setup import LOGGER
-from services.entities_service import (
-    get_user_with_session,
-    get_cur_question_with_count,
-    append_incorrects,
-    save_msg_id,
-    increase_progress,
-)
-from services.utility_service import (
-    parse_answers_from_question,
-    parse_answers_from_poll,
-)
+from repositories.entries import UserEntry
+from services.entities_service import record_answer
+from services.messages_service import delete_messages
+from services.send_scheduler import send_priority, Priority
 
 
-async def on_poll_answer(poll_answer: PollAnswer) -> None:
+async def on_poll_answer(
+    poll_answer: PollAnswer, user: UserEntry, cur_question: QuestionEntry
+) -> None:
     """
     Function, which handles poll answers. Poll options are collected from bounded with this poll question and presented
     as:
@@ -39,18 +35,15 @@ async def on_poll_answer(poll_answer: PollAnswer) -> None:
     ``aiogram.tupes.Message`` with congratulations or disappointment.
 
     :param poll_answer: incoming ``aiogram.types.PollAnswer`` object
+    :param user: current user with session, loaded by ``ContextMiddleware``
+    :param cur_question: current question, loaded by ``ContextMiddleware``
     """
 
-    user = await get_user_with_session(str(poll_answer.user.id))
     user_session = user.session
+    questions_total = len(user_session.questions_queue)
 
-    cur_question, questions_total = await get_cur_question_with_count(
-        str(poll_answer.user.id)
-    )
-
-    answers, _ = parse_answers_from_question(cur_question.answers)
-    selected_answer = parse_answers_from_poll(answers, poll_answer.option_ids)
-    correct_answer = "".join(sorted(cur_question.correct_answer))
+    rendered = cur_question.rendered
+    correct_answer = rendered.correct_answer
 
     # Удаление кнопки с подсказкой после выбора ответа
     try:
@@ -73,37 +66,48 @@ async def on_poll_answer(poll_answer: PollAnswer) -> None:
         else:
             callback_data = "exam_end"
 
-    if selected_answer == correct_answer:
-        a_msg = await try_send_msg_with_effect(
-            bot=poll_answer.bot,
-            chat_id=user.telegram_id,
-            text=Messages.TICK
-            + " "
-            + html.bold(random.choice(Arrays.SUCCESS_STATUSES.value)),
-            reply_markup=Markups.next_question_markup(
-                next_q=user_session.progress < questions_total - 1,
-                callback_data=callback_data,
-            ),
-            message_effect_id=random.choice(Arrays.SUCCESS_EFFECT_IDS.value),
-        )
-        LOGGER.info(Logs.CORRECT_ANS % (user.telegram_id + "@" + user.username))
-    else:
-        a_msg = await try_send_msg_with_effect(
-            bot=poll_answer.bot,
-            chat_id=user.telegram_id,
-            text=Messages.CROSS
-            + " "
-            + html.bold(random.choice(Arrays.FAIL_STATUSES.value))
-            + Messages.CORRECT_ANSWER
-            + html.italic(correct_answer),
-            reply_markup=Markups.next_question_markup(
-                next_q=user_session.progress < questions_total - 1,
-                callback_data=callback_data,
-            ),
-            message_effect_id=random.choice(Arrays.FAIL_EFFECT_IDS.value),
-        )
-        await append_incorrects(str(poll_answer.user.id), cur_question.id)
-        LOGGER.info(Logs.INCORRECT_ANS % (user.telegram_id + "@" + user.username))
-
-    await save_msg_id(str(poll_answer.user.id), a_msg.message_id, "a")
-    await increase_progress(str(poll_answer.user.id))
+    # Answer result goes ahead of changelogs and alerts
+    with send_priority(Priority.HIGH):
+        if correct := rendered.is_correct(poll_answer.option_ids):
+            a_msg = await try_send_msg_with_effect(
+                bot=poll_answer.bot,
+                chat_id=user.telegram_id,
+                text=Messages.TICK
+                + " "
+                + html.bold(random.choice(Arrays.SUCCESS_STATUSES.value)),
+                reply_markup=Markups.next_question_markup(
+                    next_q=user_session.progress < questions_total - 1,
+                    callback_data=callback_data,
+                ),
+                message_effect_id=random.choice(Arrays.SUCCESS_EFFECT_IDS.value),
+            )
+            LOGGER.info(Logs.CORRECT_ANS, user.telegram_id + "@" + user.username)
+        else:
+            a_msg = await try_send_msg_with_effect(
+                bot=poll_answer.bot,
+                chat_id=user.telegram_id,
+                text=Messages.CROSS
+                + " "
+                + html.bold(random.choice(Arrays.FAIL_STATUSES.value))
+                + Messages.CORRECT_ANSWER
+                + html.italic(correct_answer),
+                reply_markup=Markups.next_question_markup(
+                    next_q=user_session.progress < questions_total - 1,
+                    callback_data=callback_data,
+                ),
+                message_effect_id=random.choice(Arrays.FAIL_EFFECT_IDS.value),
+            )
+            LOGGER.info(Logs.INCORRECT_ANS, user.telegram_id + "@" + user.username)
+
+    # Progress, incorrects and answer message id are saved in one statement, if this question is still current
+    state = await record_answer(
+        user_session.id,
+        user_session.progress,
+        cur_question.id,
+        correct,
+        a_msg.message_id,
+    )
+    if state is None:
+        # Answer is already recorded or session is gone, result message of this answer is extra
+        LOGGER.info(Logs.ANSWER_NOT_RECORDED, user.telegram_id + "@" + user.username)
+        await delete_messages(poll_answer.bot, user.telegram_id, [a_msg.message_id])
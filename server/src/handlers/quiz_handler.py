@@ -7,34 +7,54 @@ import random
 from aiogram import html
 from aiogram.types import CallbackQuery
 
+from catalog.entries import QuestionEntry
 from enums.logs import Logs
 from enums.markups import Markups
 from enums.strings import CallbackQueryAnswers, Alerts, Arrays, Messages
-from handlers.utility_handlers import (
-    delete_msg_handler,
-    try_send_msg_with_effect,
-    sleep_for_alert,
-)
+from handlers.utility_handlers import try_send_msg_with_effect, sleep_for_alert
 from loggers.setup import LOGGER
+from repositories.entries import UserEntry
 from services.entities_service import (
     increase_help_alert_counter,
-    get_user,
     init_session,
     clear_session,
     rerun_session,
     get_user_with_session,
-    save_msg_id,
     get_questions_with_len_by_theme,
     update_themes_progress,
     get_cur_question_with_count,
     get_theme_by_id,
     decrease_hints,
 )
-from services.utility_service import parse_answers_from_question
+from services.messages_service import (
+    delete_messages,
+    save_session_msgs,
+    session_msg_ids,
+)
+from services.send_scheduler import send_priority, Priority
+
+
+def quiz_question_text(
+    progress: int, questions_total: int, theme_title: str, question: QuestionEntry
+) -> str:
+    """
+    Function, that assembles text of quiz question message.
+
+    :param progress: number of answered questions in session
+    :param questions_total: number of questions in session
+    :param theme_title: title of theme of session
+    :param question: current question
+    :return: HTML text of message
+    """
+
+    return (
+        f"{html.code(f'{progress + 1} / {questions_total}')}\n"
+        f"\n{html.code(theme_title)}\n\n{html.bold(question.title)}\n\n{question.rendered.answers_html}"
+    )
 
 
 # noinspection PyTypeChecker,PyAsyncCall
-async def quiz(callback_query: CallbackQuery) -> None:
+async def quiz(callback_query: CallbackQuery, user: UserEntry | None = None) -> None:
     """
     Function, which handles incoming ``aiogram.types.CallbackQuery``, which ``data`` property starts with ``quiz``.
 
@@ -49,18 +69,22 @@ async def quiz(callback_query: CallbackQuery) -> None:
     - ``quiz_end``: shows quiz summary and suggests to re-solve incorrects.
 
     :param callback_query: incoming ``aiogram.types.CallbackQuery`` object
+    :param user: current user with session, loaded by ``ContextMiddleware``
     """
 
     telegram_id: str = str(callback_query.from_user.id)
     # Retrieve the bot instance. Query can be too old if it was sent from /heal command
     _bot = callback_query.bot if callback_query.bot else callback_query.message.bot
+    # Direct calls of this handler may not provide loaded context
+    if user is None:
+        user = await get_user_with_session(telegram_id)
 
     if callback_query.data.startswith("quiz_init"):
         # Logic for quiz_init_{chosen_theme_id} and quiz_init_shuffle_{chosen_theme_id}
-        await increase_help_alert_counter(telegram_id)
-        await delete_msg_handler(callback_query)
-
-        user = await get_user(telegram_id)
+        help_alert_counter = await increase_help_alert_counter(telegram_id)
+        await delete_messages(
+            _bot, callback_query.message.chat.id, [callback_query.message.message_id]
+        )
 
         alive_sessions = True
         while not await init_session(
@@ -78,7 +102,7 @@ async def quiz(callback_query: CallbackQuery) -> None:
                 )
                 alive_sessions = False
                 LOGGER.warning(
-                    Logs.TOO_MANY_SESSIONS % (user.telegram_id + "@" + user.username)
+                    Logs.TOO_MANY_SESSIONS, user.telegram_id + "@" + user.username
                 )
             await clear_session(callback_query, callback_query.bot)
 
@@ -89,32 +113,21 @@ async def quiz(callback_query: CallbackQuery) -> None:
         )
 
         asyncio.create_task(
-            sleep_for_alert(
-                user.help_alert_counter, _bot, callback_query.message.chat.id
-            )
+            sleep_for_alert(help_alert_counter, _bot, callback_query.message.chat.id)
         )
 
     if callback_query.data.startswith("quiz_incorrect"):
         # Logic for quiz_incorrect
-        await delete_msg_handler(callback_query)
+        await delete_messages(
+            _bot, callback_query.message.chat.id, [callback_query.message.message_id]
+        )
         await rerun_session(telegram_id)
 
     if callback_query.data.startswith("quiz_end"):
         # Logic for quiz_end
-        user = await get_user_with_session(telegram_id)
-        to_delete = [
-            user.session.cur_a_msg,
-            user.session.cur_p_msg,
-            user.session.cur_q_msg,
-        ]
-        for i, msg in enumerate(to_delete):
-            if msg is not None:
-                await delete_msg_handler(
-                    callback_query,
-                    chat_id=callback_query.message.chat.id,
-                    message_id=msg,
-                )
-                await save_msg_id(user.telegram_id, None, "apq"[i])
+        await delete_messages(
+            _bot, callback_query.message.chat.id, session_msg_ids(user.session, "apq")
+        )
 
         without_mistakes = True if len(user.session.incorrect_questions) == 0 else False
         s_msg = await try_send_msg_with_effect(
@@ -165,11 +178,15 @@ async def quiz(callback_query: CallbackQuery) -> None:
                     user.telegram_id, user.session.theme_id, not without_mistakes
                 )
 
-        await save_msg_id(user.telegram_id, s_msg.message_id, "s")
+        await save_session_msgs(
+            user.session.id, a=None, p=None, q=None, s=s_msg.message_id
+        )
         return
 
     # Logic for quiz, also runs on quiz_init_* and quiz_incorrect
-    user = await get_user_with_session(telegram_id)
+    if callback_query.data.startswith(("quiz_init", "quiz_incorrect")):
+        # Session was just created or rerun, so loaded context is outdated
+        user = await get_user_with_session(telegram_id)
 
     if user.session.questions_total == user.session.progress:
         await _bot.send_message(
@@ -178,82 +195,72 @@ async def quiz(callback_query: CallbackQuery) -> None:
             reply_markup=Markups.ONLY_DELETE_MARKUP.value,
         )
         LOGGER.warning(
-            Logs.SESSION_BROKEN
-            % (str(user.session.id), user.telegram_id + "@" + user.username)
+            Logs.SESSION_BROKEN,
+            str(user.session.id),
+            user.telegram_id + "@" + user.username,
         )
         return
 
-    await save_msg_id(telegram_id, None, "a")
-
-    cur_question, questions_total = await get_cur_question_with_count(telegram_id)
+    cur_question, questions_total = await get_cur_question_with_count(user.session)
     if not callback_query.data.startswith(
         "quiz_init"
     ) and not callback_query.data.startswith("quiz_incorrect"):
-        to_delete = [
-            user.session.cur_a_msg,
-            user.session.cur_p_msg,
-            user.session.cur_q_msg,
-        ]
-        for i, msg in enumerate(to_delete):
-            if msg is not None:
-                await delete_msg_handler(
-                    callback_query,
-                    chat_id=callback_query.message.chat.id,
-                    message_id=msg,
-                )
-                await save_msg_id(user.telegram_id, None, "apq"[i])
+        await delete_messages(
+            _bot, callback_query.message.chat.id, session_msg_ids(user.session, "apq")
+        )
 
-    answers, answers_str = parse_answers_from_question(cur_question.answers)
+    rendered = cur_question.rendered
     theme = await get_theme_by_id(user.session.theme_id)
 
-    # Mark as "orange"
-    if (
-        user.session.theme_id
-        not in user.themes_done_full + user.themes_tried + user.themes_done_particular
-    ):
+    # Mark as "orange", upsert doesn't lower "yellow" and "green" themes
+    if callback_query.data.startswith("quiz_init"):
         await update_themes_progress(user.telegram_id, user.session.theme_id, None)
 
-    q_msg = await _bot.send_message(
-        chat_id=callback_query.message.chat.id,
-        text=f"{html.code(f'{user.session.progress + 1} / {questions_total}')}\n"
-        f"\n{html.code(theme.title)}\n\n{html.bold(cur_question.title)}\n\n{answers_str}",
-        disable_notification=True,
-        reply_markup=(
-            Markups.only_hints_markup(user.session)
-            if user.session.hints > 0 and user.hints_allowed
-            else None
-        ),
-    )
+    # Question and poll go ahead of changelogs and alerts
+    with send_priority(Priority.HIGH):
+        q_msg = await _bot.send_message(
+            chat_id=callback_query.message.chat.id,
+            text=quiz_question_text(
+                user.session.progress, questions_total, theme.title, cur_question
+            ),
+            disable_notification=True,
+            reply_markup=(
+                Markups.only_hints_markup(user.session)
+                if user.session.hints > 0 and user.hints_allowed
+                else None
+            ),
+        )
 
-    p_msg = await _bot.send_poll(
-        chat_id=callback_query.message.chat.id,
-        question=(
-            f"Выбери {html.bold('верный')} ответ"
-            if len(cur_question.correct_answer) == 1
-            else f"Выбери {html.bold('верные')} ответы"
-        ),
-        options=[ans.lower()[:2] for ans in answers],
-        type="regular",
-        allows_multiple_answers=True,
-        is_anonymous=False,
-        disable_notification=True,
-    )
+        p_msg = await _bot.send_poll(
+            chat_id=callback_query.message.chat.id,
+            question=(
+                f"Выбери {html.bold('верный')} ответ"
+                if len(cur_question.correct_answer) == 1
+                else f"Выбери {html.bold('верные')} ответы"
+            ),
+            options=list(rendered.poll_options),
+            type="regular",
+            allows_multiple_answers=True,
+            is_anonymous=False,
+            disable_notification=True,
+        )
 
-    await save_msg_id(user.telegram_id, q_msg.message_id, "q")
-    await save_msg_id(user.telegram_id, p_msg.message_id, "p")
+    # Slot of deleted answer message is cleared with the same write
+    await save_session_msgs(
+        user.session.id, q=q_msg.message_id, p=p_msg.message_id, a=None
+    )
 
 
-async def hint_requested(callback_query: CallbackQuery) -> None:
+async def hint_requested(
+    callback_query: CallbackQuery, cur_question: QuestionEntry
+) -> None:
     """
     Function, which sends alert with hint to user, who asked for it.
 
     :param callback_query: incoming ``aiogram.types.CallbackQuery`` object
+    :param cur_question: current question, loaded by ``ContextMiddleware``
     """
 
-    cur_question, _ = await get_cur_question_with_count(
-        str(callback_query.from_user.id)
-    )
-
     answer_len = len(cur_question.correct_answer)
     hints_will_be_given = answer_len // 2
     random_hints_ids = random.sample(
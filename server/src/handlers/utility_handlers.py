@@ -10,6 +10,7 @@ from enums.logs import Logs
 from enums.markups import Markups
 from enums.strings import Messages, Alerts
 from loggers.setup import LOGGER
+from services.send_scheduler import send_priority, Priority
 
 
 async def try_send_msg_with_effect(
@@ -44,7 +45,7 @@ async def try_send_msg_with_effect(
             disable_notification=disable_notification,
         )
     except TelegramBadRequest:
-        LOGGER.warning(Logs.COULDNT_SEND_MSG_WITH_EFFECT % message_effect_id)
+        LOGGER.warning(Logs.COULDNT_SEND_MSG_WITH_EFFECT, message_effect_id)
         return await bot.send_message(
             chat_id=chat_id,
             text=text + Messages.INVALID_EFFECT_ID % html.code(message_effect_id),
@@ -60,8 +61,8 @@ async def delete_msg_handler(
     message_id: int = None,
 ) -> Message | None:
     """
-    Handler for inline button, which deletes specified message. Also called when new ``UserSession`` is created or next
-    ``Question`` is requested.
+    Handler for inline button, which deletes specified message. Messages of ``UserSession`` are deleted in bulk by
+    ``services.messages_service`` instead.
 
     On deletion fail catches ``aiogram.exceptions.TelegramBadRequest`` and returns message with info about invalid
     ``message_id``.
@@ -80,7 +81,7 @@ async def delete_msg_handler(
     try:
         await _bot.delete_message(chat_id=chat_id, message_id=message_id)
     except TelegramBadRequest as e:
-        LOGGER.warning(Logs.COULDN_DELETE_MSG % (message_id, chat_id))
+        LOGGER.warning(Logs.COULDN_DELETE_MSG, message_id, chat_id)
         return await _bot.send_message(
             chat_id=chat_id,
             text=Messages.COULDNT_DELETE_MSG % html.code(str(message_id))
@@ -104,9 +105,10 @@ async def sleep_for_alert(counter: int, bot: Bot, chat_id: int | str) -> Message
         return
 
     await asyncio.sleep(2)
-    return await bot.send_message(
-        chat_id=chat_id,
-        text=Alerts.HEAL_ALERT,
-        reply_markup=Markups.ONLY_DELETE_MARKUP.value,
-        disable_notification=False,
-    )
+    with send_priority(Priority.LOW):
+        return await bot.send_message(
+            chat_id=chat_id,
+            text=Alerts.HEAL_ALERT,
+            reply_markup=Markups.ONLY_DELETE_MARKUP.value,
+            disable_notification=False,
+        )
@@ -1,78 +1,241 @@
-"""Loggers setup-module."""
+"""
+Loggers setup-module.
 
+Records are put into a queue by ``LOGGER`` handler and are formatted and written to stdout by ``QueueListener`` thread,
+so the event loop never waits for terminal or log collector. High-volume lines are rate limited per category.
+"""
+
+import atexit
+import json
 import logging
 import os
+import queue
 import re
 import sys
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from time import monotonic
 
+from config import LOG_FORMAT, LOG_QUEUE, LOG_RATE_LIMIT
 from enums.colors import Colors, LOG_LEVLES
+from enums.logs import Logs
+
+# Pattern of usernames in messages
+USERNAME_PATTERN: re.Pattern = re.compile(r"(@\w+)")
+
+# Categories of high-volume lines, which are rate limited. Keys are templates of messages, logged with lazy arguments,
+# or ``category`` passed in ``extra``
+RATE_LIMITED: frozenset[str] = frozenset({Logs.CORRECT_ANS, Logs.INCORRECT_ANS})
+
+
+@lru_cache(maxsize=256)
+def _short_path(pathname: str) -> str:
+    """
+    Function, that shortens path of source file to the part inside ``src`` folder.
+
+    :param pathname: full path of source file
+    :return: path of folder relative to ``src``, ``venv`` for third-party modules
+    """
+
+    if "src" not in (parts := pathname.split(os.sep)):
+        return "venv"
+    src_dir_id = len(parts) - 1 - parts[::-1].index("src")
+    return "/".join(parts[src_dir_id:-1])
+
+
+def _suffix(record: logging.LogRecord) -> str:
+    """
+    Function, that returns note about suppressed records of the same category.
+
+    :param record: ``logging.LogRecord`` instance
+    :return: note or empty string
+    """
+
+    if suppressed := getattr(record, "suppressed", 0):
+        return f" (+{suppressed} suppressed)"
+    return ""
 
 
 class CustomFormatter(logging.Formatter):
     """Class extended from ``logging.Formatter``."""
 
+    def __init__(self, colored: bool = True) -> None:
+        """
+        Creates formatter.
+
+        :param colored: use ANSI-colors or not
+        """
+
+        super().__init__()
+        self.colored = colored
+
     def format(self, record: logging.LogRecord) -> str:
         """
-        Overriden function ``formaat`` from parent class.
+        Overriden function ``format`` from parent class.
+
+        Line is built from parts in one pass: ``[LEVEL:name] ...path/file in func:line message``.
 
         :param record: ``logging.LogRecord`` instance
         :return: formatted string
         """
 
-        lvl_color = LOG_LEVLES.get(record.levelname, Colors.END)
-        username_color = Colors.LIGHT_BLUE
-        message_color = Colors.WHITE
-        path_color = Colors.LIGHT_CYAN
-        reset = Colors.END
-
-        if "src" not in (parts := record.pathname.split(os.sep)):
-            record.pathname = "venv"
-        else:
-            src_dir_id = len(parts) - 1 - parts[::-1].index("src")
-            record.pathname = "/".join(parts[src_dir_id:-1])
-        if record.funcName == "<module>":
-            record.funcName = "root"
-        record.name = record.name.split(".")[0]
-        msg = super().format(record)
-
-        lvl_str = "[" + record.levelname + ":" + record.name + "]"
+        message = record.getMessage() + _suffix(record)
+        lvl_str = "[" + record.levelname + ":" + record.name.split(".")[0] + "]"
         path_str = (
             "..."
-            + record.pathname
+            + _short_path(record.pathname)
             + "/"
             + record.filename
             + " in "
-            + record.funcName
+            + ("root" if record.funcName == "<module>" else record.funcName)
             + ":"
             + str(record.lineno)
         )
 
-        msg = msg.replace(lvl_str, f"{lvl_color}{lvl_str}{reset}")
-        msg = msg.replace(path_str, f"{path_color}{path_str}{reset}")
-        msg = msg.replace(record.message, f"{message_color}{record.message}{reset}")
-
-        at_pattern = re.compile(r"(@\w+)")
-        msg = at_pattern.sub(f"{username_color}\\1{reset}{message_color}", msg)
+        if self.colored:
+            reset = Colors.END
+            message_color = Colors.WHITE
+            message = USERNAME_PATTERN.sub(
+                f"{Colors.LIGHT_BLUE}\\1{reset}{message_color}", message
+            )
+            msg = (
+                f"{LOG_LEVLES.get(record.levelname, reset)}{lvl_str}{reset} "
+                f"{Colors.LIGHT_CYAN}{path_str}{reset} "
+                f"{message_color}{message}{reset}"
+            )
+        else:
+            msg = lvl_str + " " + path_str + " " + message
 
+        if record.exc_info:
+            msg += "\n" + self.formatException(record.exc_info)
         return msg
 
 
+class JsonFormatter(logging.Formatter):
+    """Class extended from ``logging.Formatter``, which formats records as JSON lines for log collectors."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Overriden function ``format`` from parent class.
+
+        :param record: ``logging.LogRecord`` instance
+        :return: JSON string
+        """
+
+        line = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "path": _short_path(record.pathname) + "/" + record.filename,
+            "func": record.funcName,
+            "line": record.lineno,
+            "msg": record.getMessage() + _suffix(record),
+        }
+        if record.exc_info:
+            line["exc"] = self.formatException(record.exc_info)
+        return json.dumps(line, ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    """Filter, which passes not more than ``rate`` records of each rate limited category per second."""
+
+    def __init__(self, rate: float, categories: frozenset[str]) -> None:
+        """
+        Creates filter.
+
+        :param rate: records per second for each category
+        :param categories: rate limited categories
+        """
+
+        super().__init__()
+        self.rate = rate
+        self.categories = categories
+        # Category -> [window start, passed records, suppressed records]
+        self._windows: dict[str, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Overriden function ``filter`` from parent class.
+
+        Number of records, dropped in previous window, is attached to the first passed record as ``suppressed``.
+
+        :param record: ``logging.LogRecord`` instance
+        :return: ``True`` if record should be logged
+        """
+
+        category = getattr(record, "category", record.msg)
+        if not isinstance(category, str) or category not in self.categories:
+            return True
+
+        now = monotonic()
+        if (window := self._windows.get(category)) is None or now - window[0] >= 1:
+            suppressed = window[2] if window else 0
+            window = self._windows[category] = [now, 0, 0]
+            if suppressed:
+                record.suppressed = suppressed
+
+        if window[1] >= self.rate:
+            window[2] += 1
+            return False
+        window[1] += 1
+        return True
+
+
+class LazyQueueHandler(QueueHandler):
+    """Class extended from ``logging.handlers.QueueHandler``, which leaves all formatting to listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Overriden function ``prepare`` from parent class.
+
+        Record is enqueued as is. Listener runs in the same process, so arguments and traceback don't need to be
+        pickled or pre-rendered.
+
+        :param record: ``logging.LogRecord`` instance
+        :return: the same record
+        """
+
+        return record
+
+
+# Formatters don't use these record attributes, collecting them costs time on every call
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logging.logAsyncioTasks = False
+
 # Set basic loggers to warning-level
 logging.getLogger("sqlalchemy").setLevel(logging.WARN)
 logging.getLogger("aiohttp").setLevel(logging.WARN)
 logging.getLogger("aiogram").setLevel(logging.WARN)
+# SQLAlchemy logger of custom pool class is named after its module
+logging.getLogger("database.pool").setLevel(logging.WARN)
 
 # Setup root logger
 LOGGER: logging.Logger = logging.getLogger()
 
-formatter = CustomFormatter(
-    # fmt="%(asctime)s [%(levelname)s:%(name)s] ...%(pathname)s/%(filename)s in %(funcName)s:%(lineno)s %(message)s",
-    fmt="[%(levelname)s:%(name)s] ...%(pathname)s/%(filename)s in %(funcName)s:%(lineno)s %(message)s",  # For render
-    datefmt="%d.%m %H:%M:%S",
-)
+# ``color`` for terminal, ``plain`` and ``json`` for log collectors
+if LOG_FORMAT == "json":
+    formatter = JsonFormatter()
+else:
+    formatter = CustomFormatter(colored=LOG_FORMAT != "plain")
 
 stream_handler = logging.StreamHandler(sys.stdout)
 stream_handler.setFormatter(formatter)
 
-LOGGER.handlers = [stream_handler]
+if LOG_QUEUE:
+    queue_handler = LazyQueueHandler(queue.SimpleQueue())
+    LOG_LISTENER: QueueListener | None = QueueListener(
+        queue_handler.queue, stream_handler
+    )
+    LOG_LISTENER.start()
+    # Flush queued records on exit
+    atexit.register(LOG_LISTENER.stop)
+    root_handler = queue_handler
+else:
+    LOG_LISTENER = None
+    root_handler = stream_handler
+
+root_handler.addFilter(RateLimitFilter(LOG_RATE_LIMIT, RATE_LIMITED))
+LOGGER.handlers = [root_handler]
 LOGGER.setLevel(logging.INFO)
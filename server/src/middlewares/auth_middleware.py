@@ -1,14 +1,15 @@
 """Module for auth middleware."""
 
+from dataclasses import replace
 from typing import Callable, Any, Awaitable
 
 from aiogram import BaseMiddleware
-from aiogram.types import TelegramObject, Message, CallbackQuery, PollAnswer
+from aiogram.types import TelegramObject
 
 from enums.strings import Messages
 from enums.types import EVENT_TYPES
 from middlewares.miscellaneous import collect_username
-from services.entities_service import get_user, set_username
+from services.entities_service import set_username
 
 
 class AuthMiddleware(BaseMiddleware):
@@ -23,7 +24,8 @@ class AuthMiddleware(BaseMiddleware):
         """
         Overrided function ``__call__`` from parent class.
 
-        Checks if user is authorized (basically if user exists in DB).
+        Checks if user is authorized (basically if user exists in DB). User is taken from ``data``, where it was put by
+        ``ContextMiddleware``.
 
         :param handler: handler, which will be called after middleware function
         :param event: incoming event, basically ``aiogram.Message``, ``aiogram.CallbackQuery`` or ``aiogram.PollAnswer``
@@ -31,13 +33,7 @@ class AuthMiddleware(BaseMiddleware):
         :return: ``Any``
         """
 
-        telegram_id: str = "<unknown_id>"
-        if isinstance(event, (Message, CallbackQuery)):
-            telegram_id = str(event.from_user.id)
-        elif isinstance(event, PollAnswer):
-            telegram_id = str(event.user.id)
-
-        if not (user := await get_user(telegram_id)):
+        if not (user := data.get("user")):
             return await event.answer(
                 Messages.NOT_AUTHORIZED,
                 disable_notification=True,
@@ -46,4 +42,6 @@ class AuthMiddleware(BaseMiddleware):
             if not user.username:
                 username = collect_username(event, EVENT_TYPES.get(type(event), ""))
                 await set_username(user.telegram_id, username)
+                # Keep loaded context in sync with DB, entries are immutable
+                data["user"] = replace(user, username="@" + username)
             return await handler(event, data)
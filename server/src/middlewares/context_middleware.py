@@ -0,0 +1,48 @@
+"""Module for per-update context middleware."""
+
+from typing import Callable, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Message, CallbackQuery, PollAnswer
+
+from services.entities_service import get_user_context, bind_user
+
+
+class ContextMiddleware(BaseMiddleware):
+    """Context middleware-class extended from ``aiogram.BaseMiddleware``."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        """
+        Overrided function ``__call__`` from parent class.
+
+        Loads ``UserEntry``, its ``UserSessionEntry`` and current ``QuestionEntry`` once per update and puts them
+        into ``data`` under ``user``, ``user_session`` and ``cur_question`` keys. Downstream middlewares and handlers
+        take them from there instead of querying DB again.
+
+        Must be registered before any other outer middleware.
+
+        :param handler: handler, which will be called after middleware function
+        :param event: incoming event, basically ``aiogram.Message``, ``aiogram.CallbackQuery`` or ``aiogram.PollAnswer``
+        :param data: incoming event data
+        :return: ``Any``
+        """
+
+        telegram_id: str = "<unknown_id>"
+        if isinstance(event, (Message, CallbackQuery)):
+            telegram_id = str(event.from_user.id)
+        elif isinstance(event, PollAnswer):
+            telegram_id = str(event.user.id)
+
+        # Writes in this update are writes of the user, the user reads them back
+        bind_user(telegram_id)
+        user, user_session, cur_question = await get_user_context(telegram_id)
+        data["user"] = user
+        data["user_session"] = user_session
+        data["cur_question"] = cur_question
+
+        return await handler(event, data)
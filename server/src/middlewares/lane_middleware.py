@@ -0,0 +1,70 @@
+"""Module for per-user lanes middleware."""
+
+from typing import Callable, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, TelegramObject, Update, User
+
+from enums.logs import Logs
+from loggers.setup import LOGGER
+from middlewares.miscellaneous import collect_username
+from services.lanes import USER_LANES, CallbackKey
+
+
+def callback_key(callback_query: CallbackQuery | None) -> CallbackKey | None:
+    """
+    Function, that returns key of callback query, which is used to detect double taps.
+
+    :param callback_query: callback query of update, ``None`` for other updates
+    :return: message id and data of callback query, ``None`` for other updates and callbacks without data
+    """
+
+    if callback_query is None or callback_query.data is None:
+        return None
+    message_id = (
+        callback_query.message.message_id
+        if callback_query.message is not None
+        else callback_query.inline_message_id
+    )
+    return message_id, callback_query.data
+
+
+class LaneMiddleware(BaseMiddleware):
+    """Lanes middleware-class extended from ``aiogram.BaseMiddleware``. Registered on ``dp.update``."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+    ) -> Any:
+        """
+        Overrided function ``__call__`` from parent class.
+
+        Runs update in the lane of its user, so context is loaded and handlers are called only after previous update
+        of the same user is handled. Duplicate callback is answered and dropped.
+
+        Must be registered before ``ContextMiddleware`` is called, i.e. on ``dp.update``.
+
+        :param handler: handler, which will be called after middleware function
+        :param event: incoming ``aiogram.types.Update``
+        :param data: incoming event data, ``event_from_user`` key is set by ``aiogram`` before this middleware
+        :return: ``Any``
+        """
+
+        user: User | None = data.get("event_from_user")
+        if user is None:
+            return await handler(event, data)
+
+        callback = callback_key(event.callback_query)
+        if USER_LANES.is_duplicate(user.id, callback):
+            LOGGER.info(
+                Logs.DUPLICATE_CALLBACK,
+                callback[1],
+                callback[0],
+                f"{user.id}@{collect_username(event.callback_query, 'q')}",
+            )
+            await event.callback_query.answer()
+            return None
+
+        return await USER_LANES.run(user.id, callback, lambda: handler(event, data))
@@ -9,19 +9,12 @@ from aiogram.types import TelegramObject, Message, CallbackQuery, PollAnswer
 from enums.logs import Logs
 from loggers.setup import LOGGER
 from middlewares.miscellaneous import collect_username
-from services.entities_service import get_user
+from services.metrics_service import UPDATE_COUNTERS
 
 
 class LoggingMiddleware(BaseMiddleware):
     """Logging middleware-class extended from ``aiogram.BaseMiddleware``."""
 
-    # Events counter
-    __AVG_TIME_COUNTER = 0
-
-    # List of timings, resets each 25 requests
-    # Used to calcu;at eaverage timing
-    __TIMINGS_LIST = []
-
     async def __call__(
         self,
         handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
@@ -33,7 +26,7 @@ class LoggingMiddleware(BaseMiddleware):
 
         Spawns logs for each incoming authorized or not event. Log strings are based on event type.
 
-        Each 25 events this middleware calculates aberage response time.
+        Latency histograms are collected by ``middlewares.metrics_middleware``.
 
         :param handler: handler, which will be called after middleware function
         :param event: incoming event, basically ``aiogram.Message``, ``aiogram.CallbackQuery`` or ``aiogram.PollAnswer``
@@ -45,40 +38,46 @@ class LoggingMiddleware(BaseMiddleware):
         await handler(event, data)
         te = time()
 
-        if (timing := round(te - ts, 5)) >= 5:
-            timing = round(timing - 5, 5)
-        LoggingMiddleware.__AVG_TIME_COUNTER += 1
-        LoggingMiddleware.__TIMINGS_LIST.append(timing)
+        # Deliberate pauses (changelog) are not counted
+        counters = UPDATE_COUNTERS.get()
+        timing = round(te - ts - (counters.paused if counters else 0), 5)
 
-        if LoggingMiddleware.__AVG_TIME_COUNTER % 25 == 0:
-            LOGGER.info(Logs.AVG_TIMING % (sum(LoggingMiddleware.__TIMINGS_LIST) / 25))
-            LoggingMiddleware.__AVG_TIME_COUNTER = 0
-            LoggingMiddleware.__TIMINGS_LIST = []
-
-        telegram_id = "<unknown_id>"
-        msg = f"[{Logs.LOCK}] Unknown event from @anonymous in {te - ts}"
+        lock = Logs.UNLOCK if data.get("user") else Logs.LOCK
+        # Message is formatted by ``LOGGER`` handler, out of the event loop
         if isinstance(event, Message):
             username = collect_username(event, "m")
-            telegram_id = event.from_user.id
-            if event.text:
-                if "/" in event.text:
-                    msg = f'[%s{Logs.COMMAND}] Command "{event.text}" from {event.from_user.id}@{username} in {timing}'
-                else:
-                    msg = f'[%s{Logs.MESSAGE}] Message "{event.text}" from {event.from_user.id}@{username} in {timing}'
+            if event.text and "/" in event.text:
+                tag, kind = Logs.COMMAND, "Command"
             else:
-                msg = f'[%s{Logs.MESSAGE}] Message "<non_text_data>" from {event.from_user.id}@{username} in {timing}'
+                tag, kind = Logs.MESSAGE, "Message"
+            text = event.text or "<non_text_data>"
+            LOGGER.info(
+                Logs.EVENT, lock, tag, kind, text, event.from_user.id, username, timing
+            )
         elif isinstance(event, CallbackQuery):
             username = collect_username(event, "q")
-            telegram_id = event.from_user.id
-            msg = f'[%s{Logs.CALLBACK}] Callback "{event.data}" from {event.from_user.id}@{username} in {timing}'
+            LOGGER.info(
+                Logs.EVENT,
+                lock,
+                Logs.CALLBACK,
+                "Callback",
+                event.data,
+                event.from_user.id,
+                username,
+                timing,
+            )
         elif isinstance(event, PollAnswer):
             username = collect_username(event, "p")
-            telegram_id = event.user.id
             answer = "".join(["абвгдежзиклмн"[i] for i in event.option_ids])
-            msg = f'[%s{Logs.ANSWER}] Answer "{answer}" from {event.user.id}@{username} in {timing}'
-
-        user = await get_user(str(telegram_id))
-        if not user:
-            LOGGER.info(msg % Logs.LOCK)
+            LOGGER.info(
+                Logs.EVENT,
+                lock,
+                Logs.ANSWER,
+                "Answer",
+                answer,
+                event.user.id,
+                username,
+                timing,
+            )
         else:
-            LOGGER.info(msg % Logs.UNLOCK)
+            LOGGER.info(Logs.UNKNOWN_EVENT, lock, timing)
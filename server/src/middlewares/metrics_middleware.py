@@ -0,0 +1,80 @@
+"""Module for metrics middlewares."""
+
+from time import perf_counter
+from typing import Callable, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from services.metrics_service import METRICS, UPDATE_COUNTERS, UpdateCounters
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """Update metrics middleware-class extended from ``aiogram.BaseMiddleware``. Registered on ``dp.update``."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+    ) -> Any:
+        """
+        Overrided function ``__call__`` from parent class.
+
+        Measures time of the whole update, including other middlewares, and counts DB queries and Telegram API calls
+        made while it is handled.
+
+        :param handler: handler, which will be called after middleware function
+        :param event: incoming ``aiogram.types.Update``
+        :param data: incoming event data
+        :return: ``Any``
+        """
+
+        counters = UpdateCounters()
+        token = UPDATE_COUNTERS.set(counters)
+        start = perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            METRICS.observe_update(event.event_type, perf_counter() - start, counters)
+            UPDATE_COUNTERS.reset(token)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Handler metrics middleware-class extended from ``aiogram.BaseMiddleware``. Registered as inner middleware."""
+
+    def __init__(self, event_type: str) -> None:
+        """
+        Creates middleware for specific observer.
+
+        :param event_type: type of events of observer, e.g. ``callback_query``
+        """
+
+        self.event_type = event_type
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        """
+        Overrided function ``__call__`` from parent class.
+
+        Measures time spent in matched handler.
+
+        :param handler: handler, which will be called after middleware function
+        :param event: incoming event, basically ``aiogram.Message``, ``aiogram.CallbackQuery`` or ``aiogram.PollAnswer``
+        :param data: incoming event data, ``handler`` key holds matched handler object
+        :return: ``Any``
+        """
+
+        start = perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            METRICS.observe_handler(
+                self.event_type,
+                data["handler"].callback.__name__,
+                perf_counter() - start,
+            )
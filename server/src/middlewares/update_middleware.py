@@ -6,24 +6,26 @@ from typing import Callable, Any, Awaitable
 
 from aiogram import BaseMiddleware, html
 from aiogram.exceptions import TelegramBadRequest
-from aiogram.types import (
-    TelegramObject,
-    LinkPreviewOptions,
-    Message,
-    CallbackQuery,
-    PollAnswer,
-)
+from aiogram.types import TelegramObject, LinkPreviewOptions
 
 from enums.logs import Logs
 from enums.markups import Markups
 from enums.strings import Arrays, Messages
 from loggers.setup import LOGGER
-from services.entities_service import get_user, changelog_seen
+from services.entities_service import changelog_seen, get_user_context
+from services.lanes import USER_LANES
+from services.metrics_service import pause
+from services.send_scheduler import send_priority, Priority
 
 
 class ChangelogSeenMiddleware(BaseMiddleware):
     """``changelog_seen`` middleware-class extended from ``aiogram.BaseMiddleware``."""
 
+    def __init__(self) -> None:
+        """Creates middleware. Handlers, deferred after changelog, are kept here until they are done."""
+
+        self._deferred: set[asyncio.Task] = set()
+
     async def __call__(
         self,
         handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
@@ -33,7 +35,9 @@ class ChangelogSeenMiddleware(BaseMiddleware):
         """
         Overrided function ``__call__`` from parent class.
 
-        Checks if user seen latest changelog or not.
+        Checks if user seen latest changelog or not. User is taken from ``data``, where it was put by
+        ``ContextMiddleware``. If changelog is sent, handler is deferred to give user time to read it, and update is
+        finished right away, so the pause holds neither the lane of user nor a webhook task.
 
         :param handler: handler, which will be called after middleware function
         :param event: incoming event, basically ``aiogram.Message``, ``aiogram.CallbackQuery`` or ``aiogram.PollAnswer``
@@ -41,33 +45,65 @@ class ChangelogSeenMiddleware(BaseMiddleware):
         :return: ``Any``
         """
 
-        telegram_id: str = "<unknown_id>"
-        if isinstance(event, (Message, CallbackQuery)):
-            telegram_id = str(event.from_user.id)
-        elif isinstance(event, PollAnswer):
-            telegram_id = str(event.user.id)
-
-        user = await get_user(telegram_id)
+        user = data["user"]
         if not user.checked_update:
             effect_id = random.choice(Arrays.SUCCESS_EFFECT_IDS.value)
-            try:
-                await event.answer(
-                    Arrays.CHANGELOGS.value[-1],
-                    disable_notification=False,
-                    link_preview_options=LinkPreviewOptions(is_disabled=True),
-                    message_effect_id=effect_id,
-                    reply_markup=Markups.ONLY_DELETE_MARKUP.value,
-                )
-            except TelegramBadRequest:
-                await event.answer(
-                    Arrays.CHANGELOGS.value[-1]
-                    + Messages.INVALID_EFFECT_ID % html.code(effect_id),
-                    link_preview_options=LinkPreviewOptions(is_disabled=True),
-                    disable_notification=False,
-                    reply_markup=Markups.ONLY_DELETE_MARKUP.value,
-                )
-            LOGGER.info(Logs.CHANGE_LOG_SEEN % (user.telegram_id + "@" + user.username))
+            # Changelog yields to questions and polls of other users
+            with send_priority(Priority.LOW):
+                try:
+                    await event.answer(
+                        Arrays.CHANGELOGS.value[-1],
+                        disable_notification=False,
+                        link_preview_options=LinkPreviewOptions(is_disabled=True),
+                        message_effect_id=effect_id,
+                        reply_markup=Markups.ONLY_DELETE_MARKUP.value,
+                    )
+                except TelegramBadRequest:
+                    await event.answer(
+                        Arrays.CHANGELOGS.value[-1]
+                        + Messages.INVALID_EFFECT_ID % html.code(effect_id),
+                        link_preview_options=LinkPreviewOptions(is_disabled=True),
+                        disable_notification=False,
+                        reply_markup=Markups.ONLY_DELETE_MARKUP.value,
+                    )
+            LOGGER.info(Logs.CHANGE_LOG_SEEN, user.telegram_id + "@" + user.username)
             await changelog_seen(str(event.from_user.id))
-            await asyncio.sleep(5)
+
+            task = asyncio.create_task(self._defer(handler, event, data))
+            self._deferred.add(task)
+            task.add_done_callback(self._deferred.discard)
+            return None
 
         return await handler(event, data)
+
+    @staticmethod
+    async def _defer(
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> None:
+        """
+        Method, that calls handler after user had time to read the changelog.
+
+        Handler runs in the lane of user again, context is reloaded, because other updates of user could be handled
+        during the pause.
+
+        :param handler: handler, which will be called after the pause
+        :param event: incoming event, basically ``aiogram.Message``, ``aiogram.CallbackQuery`` or ``aiogram.PollAnswer``
+        :param data: incoming event data
+        """
+
+        await pause(5)
+
+        telegram_id = data["user"].telegram_id
+
+        async def call() -> Any:
+            data["user"], data["user_session"], data["cur_question"] = (
+                await get_user_context(telegram_id)
+            )
+            return await handler(event, data)
+
+        try:
+            await USER_LANES.run(int(telegram_id), None, call)
+        except Exception as e:
+            LOGGER.exception(Logs.DEFERRED_HANDLER_FAILED, telegram_id, e)
@@ -0,0 +1,249 @@
+"""
+Module with interface of storage, which keeps users, their sessions and progress and the question bank.
+
+Service layer (``services.entities_service``) talks to storage only through ``Repository``, so handlers don't depend
+on the backend. Users and sessions are returned as immutable entries of ``repositories.entries``, every write goes
+through a method.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from catalog.entries import SectionEntry, ThemeEntry, QuestionEntry
+from database.models import ThemeProgress
+from repositories.entries import UserEntry
+
+
+class AnsweredState(NamedTuple):
+    """State of session after the answer was recorded."""
+
+    progress: int
+    incorrect_questions: list[int]
+    cur_a_msg: int | None
+
+
+class Repository(ABC):
+    """Storage backend interface."""
+
+    async def start(self) -> None:
+        """Method, that prepares storage before handling any update. Registered as ``aiogram.Dispatcher`` startup hook."""
+
+    async def close(self) -> None:
+        """Method, that releases resources of storage, e.g. closes connections."""
+
+    def bind(self, telegram_id: str) -> None:
+        """
+        Method, that binds user to current update, so writes in it are attributed to the user.
+
+        :param telegram_id: string with user's unique Telegram id
+        """
+
+    def pin(self, telegram_id: str) -> None:
+        """
+        Method, that marks write of user outside of update (e.g. by timer), so user reads own writes.
+
+        :param telegram_id: string with user's unique Telegram id
+        """
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Method, that returns runtime metrics of storage.
+
+        :return: dictionary of metrics groups, e.g. ``pool`` and ``replica``; empty if storage has no metrics
+        """
+
+        return {}
+
+    # Catalog
+
+    async def catalog_version(self) -> int | None:
+        """
+        Method, that returns version of question bank, which is bumped on any change of it.
+
+        :return: version or ``None`` if storage doesn't track versions (catalog snapshot is not used then)
+        """
+
+        return None
+
+    @abstractmethod
+    async def read_catalog(
+        self,
+    ) -> tuple[list[SectionEntry], list[ThemeEntry], list[QuestionEntry]]:
+        """
+        Method, that reads question bank into catalog entries, ordered by ``id``.
+
+        :return: tuple of lists with ``SectionEntry``, ``ThemeEntry`` and ``QuestionEntry`` objects
+        """
+
+    # Users
+
+    @abstractmethod
+    async def get_user_with_session(self, telegram_id: str) -> UserEntry | None:
+        """
+        Method, that returns user by Telegram id with loaded ``UserEntry.session``.
+
+        :param telegram_id: string with user's unique Telegram id
+        :return: matching ``UserEntry`` object or ``None``
+        """
+
+    @abstractmethod
+    async def get_users_with_session(self, telegram_ids: list[str]) -> list[UserEntry]:
+        """
+        Method, that returns several users with loaded ``UserEntry.session``. Always reads the latest state.
+
+        :param telegram_ids: list of strings with users' unique Telegram ids
+        :return: list of matching ``UserEntry`` objects
+        """
+
+    @abstractmethod
+    async def changelog_seen(self, telegram_id: str) -> None:
+        """
+        Method, that sets user's ``checked_update`` field to ``True``.
+
+        :param telegram_id: string with user's unique Telegram id
+        """
+
+    @abstractmethod
+    async def set_username(self, telegram_id: str, username: str) -> None:
+        """
+        Method, that sets user's ``username``.
+
+        :param telegram_id: string with user's unique Telegram id
+        :param username: username, which will be stored as is
+        """
+
+    @abstractmethod
+    async def change_hints_policy(self, telegram_id: str) -> bool | None:
+        """
+        Method, that switches user's ``hints_allowed`` field.
+
+        :param telegram_id: string with user's unique Telegram id
+        :return: new value of field or ``None`` if there is no such user
+        """
+
+    @abstractmethod
+    async def increase_help_alert_counter(self, telegram_id: str) -> int | None:
+        """
+        Method, that increases user's ``help_alert_counter``.
+
+        :param telegram_id: string with user's unique Telegram id
+        :return: increased value of counter or ``None`` if there is no such user
+        """
+
+    @abstractmethod
+    async def update_exam_best(
+        self, telegram_id: str, score: int, profile: str
+    ) -> str | None:
+        """
+        Method, that sets user's ``exam_best`` field, if ``score`` is greater than stored one or stored one was reached
+        in other exam profile.
+
+        :param telegram_id: string with user's unique Telegram id
+        :param score: number of correct answers
+        :param profile: name of exam profile, ``score`` was reached in
+        :return: username of user if ``exam_best`` was updated, ``None`` otherwise
+        """
+
+    # Progress
+
+    @abstractmethod
+    async def raise_theme_progress(
+        self, telegram_id: str, theme_id: int, state: ThemeProgress
+    ) -> tuple[int, ThemeProgress] | None:
+        """
+        Method, that raises theme progress of user to ``state``. State is never lowered.
+
+        :param telegram_id: string with user's unique Telegram id
+        :param theme_id: integer theme's id
+        :param state: new state of theme
+        :return: tuple of user's id and resulting state or ``None`` if there is no such user
+        """
+
+    @abstractmethod
+    async def get_themes_progress(self, user_id: int) -> dict[int, ThemeProgress]:
+        """
+        Method, that returns progress of user by themes. Always reads the latest state.
+
+        :param user_id: identifier of user
+        :return: dictionary of theme ids and states, themes without progress are absent
+        """
+
+    # Sessions
+
+    @abstractmethod
+    async def create_session(self, telegram_id: str, **fields: Any) -> bool:
+        """
+        Method, that creates session for user, if user has no session.
+
+        :param telegram_id: string with user's unique Telegram id
+        :param fields: values of ``UserSession`` fields, except ``id`` and ``user_id``
+        :return: ``False`` if there is no such user or user already has session, ``True`` otherwise
+        """
+
+    @abstractmethod
+    async def delete_session(self, session_id: int) -> None:
+        """
+        Method, that deletes session.
+
+        :param session_id: identifier of session
+        """
+
+    @abstractmethod
+    async def rerun_session(self, telegram_id: str) -> None:
+        """
+        Method, that replaces ``questions_queue`` of user's session with its ``incorrect_questions`` and resets
+        ``incorrect_questions``, ``progress`` and hints.
+
+        :param telegram_id: string with user's unique Telegram id
+        """
+
+    @abstractmethod
+    async def decrease_hints(self, telegram_id: str) -> int | None:
+        """
+        Method, that decreases ``hints`` of user's session.
+
+        :param telegram_id: string with user's unique Telegram id
+        :return: decreased value of field or ``None`` if user has no session
+        """
+
+    @abstractmethod
+    async def record_answer(
+        self,
+        session_id: int,
+        progress: int,
+        question_id: int,
+        correct: bool,
+        a_msg_id: int,
+    ) -> AnsweredState | None:
+        """
+        Method, that records answer at once: increases ``progress``, appends question to ``incorrect_questions``, if
+        answer was not correct, and sets ``cur_a_msg``. Answer is recorded only if ``progress`` of session is still
+        the one, which question was answered at, so the same answer is never recorded twice.
+
+        :param session_id: identifier of session
+        :param progress: ``progress`` of session, when question was asked
+        :param question_id: identifier of question
+        :param correct: flag, whether user's answer was correct
+        :param a_msg_id: unique identifier of message with answer result
+        :return: new state of session or ``None`` if session is gone or answer is already recorded
+        """
+
+    @abstractmethod
+    async def save_session_msgs(
+        self, session_id: int, msg_ids: dict[str, int | None]
+    ) -> None:
+        """
+        Method, that saves message ids of session.
+
+        :param session_id: identifier of session
+        :param msg_ids: message ids by flags of slots (``q``, ``p``, ``a``, ``s``), ``None`` clears the slot
+        """
+
+    @abstractmethod
+    async def get_exam_deadlines(self) -> list[tuple[str, datetime]]:
+        """
+        Method, that returns deadlines of exam sessions, which summary was not sent yet.
+
+        :return: list of tuples with user's unique Telegram id and exam deadline
+        """
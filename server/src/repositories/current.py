@@ -0,0 +1,41 @@
+"""
+Module with storage instance, chosen by ``STORAGE_BACKEND``.
+
+Backends are imported lazily: PostgreSQL engine is created on import of ``database.connection``, so it is not imported
+at all, when another backend is used.
+"""
+
+from config import STORAGE_BACKEND
+from repositories.base import Repository
+
+# Names of backends for ``STORAGE_BACKEND``
+BACKENDS: tuple[str, ...] = ("postgres", "sqlite", "memory")
+
+
+def create_repository(backend: str) -> Repository:
+    """
+    Function, that creates storage of specified backend.
+
+    :param backend: name of backend, one of ``BACKENDS``
+    :return: ``Repository`` instance
+    :raises ValueError: if backend is unknown
+    """
+
+    match backend:
+        case "postgres":
+            from repositories.postgres import PostgresRepository
+
+            return PostgresRepository()
+        case "sqlite":
+            from repositories.sqlite import SqliteRepository
+
+            return SqliteRepository()
+        case "memory":
+            from repositories.memory import MemoryRepository
+
+            return MemoryRepository()
+    raise ValueError(f"Unknown STORAGE_BACKEND {backend!r}, expected one of {BACKENDS}")
+
+
+# Storage instance shared by the whole application
+REPOSITORY: Repository = create_repository(STORAGE_BACKEND)
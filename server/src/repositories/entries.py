@@ -0,0 +1,46 @@
+"""
+Module with lightweight read-only entries, which storage returns instead of ORM objects.
+
+Entries hold only the columns, which handlers read. They are built straight from result rows, without identity map and
+relationship bookkeeping of ORM. To change stored values use write methods of ``Repository``.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True, slots=True)
+class UserSessionEntry:
+    """Immutable copy of a row from ``sessions`` table."""
+
+    id: int
+    theme_id: int | None
+    incorrect_questions: tuple[int, ...]
+    progress: int
+    questions_queue: tuple[int, ...]
+    questions_total: int
+    hints: int
+    hints_total: int
+    cur_q_msg: int | None
+    cur_p_msg: int | None
+    cur_a_msg: int | None
+    cur_s_msg: int | None
+    exam_deadline: datetime | None
+
+
+@dataclass(frozen=True, slots=True)
+class UserEntry:
+    """
+    Immutable copy of a row from ``users`` table.
+
+    ``session`` is the user's session, it is ``None`` if user has no session.
+    """
+
+    id: int
+    telegram_id: str
+    username: str | None
+    exam_best: int
+    exam_profile: str | None
+    hints_allowed: bool
+    checked_update: bool
+    session: UserSessionEntry | None = None
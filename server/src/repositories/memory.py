@@ -0,0 +1,304 @@
+"""
+Module with storage in process memory, for benchmarks and single-node deployments, which don't need persistence.
+
+Rows are kept in dictionaries, arrays are stored as tuples, so immutable entries share them with the storage without
+copying. Question bank is read from ``static/parsed.json`` and users are created from ``STORAGE_USERS`` on start.
+Nothing survives restart. With ``--workers N`` every worker has its own storage, which is consistent, because updates of
+one user are always handled by the same worker.
+
+Every method runs without ``await`` between reading and writing a row, so it is atomic for the event loop.
+"""
+
+import dataclasses
+import math
+from datetime import datetime
+from itertools import count
+from typing import Any
+
+from catalog.bank import bank_entries
+from catalog.entries import SectionEntry, ThemeEntry, QuestionEntry
+from config import STORAGE_USERS
+from database.models import UserSession, ThemeProgress
+from enums.logs import Logs
+from loggers.setup import LOGGER
+from repositories.base import Repository, AnsweredState
+from repositories.entries import UserEntry, UserSessionEntry
+
+# Fields of ``sessions`` rows
+_SESSION_FIELDS: tuple[str, ...] = tuple(UserSession.__table__.columns.keys())
+# Fields of entries, which are copied from rows
+_USER_ENTRY_FIELDS: tuple[str, ...] = tuple(
+    field.name for field in dataclasses.fields(UserEntry) if field.name != "session"
+)
+_SESSION_ENTRY_FIELDS: tuple[str, ...] = tuple(
+    field.name for field in dataclasses.fields(UserSessionEntry)
+)
+
+
+class MemoryRepository(Repository):
+    """Storage in dictionaries."""
+
+    def __init__(self, users: list[str] = STORAGE_USERS) -> None:
+        """
+        Creates empty storage. Use ``MemoryRepository.start`` to fill it.
+
+        :param users: Telegram ids of users, which are created on start
+        """
+
+        self._initial_users = users
+        self._catalog: tuple[
+            list[SectionEntry], list[ThemeEntry], list[QuestionEntry]
+        ] = ([], [], [])
+        self._user_ids = count(1)
+        self._session_ids = count(1)
+        # Telegram id -> row of ``users``
+        self._users: dict[str, dict[str, Any]] = {}
+        # Session id -> row of ``sessions``
+        self._sessions: dict[int, dict[str, Any]] = {}
+        # User id -> session id
+        self._session_of: dict[int, int] = {}
+        # User id -> theme id -> state
+        self._progress: dict[int, dict[int, ThemeProgress]] = {}
+
+    async def start(self) -> None:
+        """
+        Overrided function ``start`` from parent class.
+
+        Reads question bank and creates users.
+        """
+
+        if not self._catalog[2]:
+            self._catalog = bank_entries()
+            LOGGER.info(Logs.STORAGE_BANK_LOADED, "memory", *map(len, self._catalog))
+        for telegram_id in self._initial_users:
+            self.add_user(telegram_id)
+
+    def add_user(self, telegram_id: str, **fields: Any) -> None:
+        """
+        Method, that creates user, if there is no user with such Telegram id.
+
+        :param telegram_id: string with user's unique Telegram id
+        :param fields: values of ``User`` fields, defaults are used for missing ones
+        """
+
+        if telegram_id in self._users:
+            return
+        self._users[telegram_id] = {
+            "id": next(self._user_ids),
+            "telegram_id": telegram_id,
+            "username": None,
+            "exam_best": 0,
+            "exam_profile": None,
+            "hints_allowed": True,
+            "checked_update": False,
+            "help_alert_counter": 0,
+            **fields,
+        }
+
+    def _user_session(self, telegram_id: str) -> dict[str, Any] | None:
+        """
+        Method, that returns row of user's session.
+
+        :param telegram_id: string with user's unique Telegram id
+        :return: row of ``sessions`` or ``None`` if there is no such user or session
+        """
+
+        if (user := self._users.get(telegram_id)) is None:
+            return None
+        if (session_id := self._session_of.get(user["id"])) is None:
+            return None
+        return self._sessions[session_id]
+
+    def _to_user(self, row: dict[str, Any]) -> UserEntry:
+        """
+        Method, that creates ``UserEntry`` from row.
+
+        :param row: row of ``users``
+        :return: ``UserEntry`` object
+        """
+
+        session = None
+        if (session_id := self._session_of.get(row["id"])) is not None:
+            session_row = self._sessions[session_id]
+            session = UserSessionEntry(
+                **{field: session_row[field] for field in _SESSION_ENTRY_FIELDS}
+            )
+        return UserEntry(
+            **{field: row[field] for field in _USER_ENTRY_FIELDS}, session=session
+        )
+
+    # Catalog
+
+    async def read_catalog(
+        self,
+    ) -> tuple[list[SectionEntry], list[ThemeEntry], list[QuestionEntry]]:
+        """Overrided function ``read_catalog`` from parent class."""
+
+        return self._catalog
+
+    # Users
+
+    async def get_user_with_session(self, telegram_id: str) -> UserEntry | None:
+        """Overrided function ``get_user_with_session`` from parent class."""
+
+        row = self._users.get(telegram_id)
+        return self._to_user(row) if row is not None else None
+
+    async def get_users_with_session(self, telegram_ids: list[str]) -> list[UserEntry]:
+        """Overrided function ``get_users_with_session`` from parent class."""
+
+        return [
+            self._to_user(row)
+            for telegram_id in telegram_ids
+            if (row := self._users.get(telegram_id)) is not None
+        ]
+
+    async def changelog_seen(self, telegram_id: str) -> None:
+        """Overrided function ``changelog_seen`` from parent class."""
+
+        if (user := self._users.get(telegram_id)) is not None:
+            user["checked_update"] = True
+
+    async def set_username(self, telegram_id: str, username: str) -> None:
+        """Overrided function ``set_username`` from parent class."""
+
+        if (user := self._users.get(telegram_id)) is not None:
+            user["username"] = username
+
+    async def change_hints_policy(self, telegram_id: str) -> bool | None:
+        """Overrided function ``change_hints_policy`` from parent class."""
+
+        if (user := self._users.get(telegram_id)) is None:
+            return None
+        user["hints_allowed"] = not user["hints_allowed"]
+        return user["hints_allowed"]
+
+    async def increase_help_alert_counter(self, telegram_id: str) -> int | None:
+        """Overrided function ``increase_help_alert_counter`` from parent class."""
+
+        if (user := self._users.get(telegram_id)) is None:
+            return None
+        user["help_alert_counter"] += 1
+        return user["help_alert_counter"]
+
+    async def update_exam_best(
+        self, telegram_id: str, score: int, profile: str
+    ) -> str | None:
+        """Overrided function ``update_exam_best`` from parent class."""
+
+        user = self._users.get(telegram_id)
+        if user is None or (
+            user["exam_profile"] == profile and score <= user["exam_best"]
+        ):
+            return None
+        user["exam_best"] = score
+        user["exam_profile"] = profile
+        return user["username"]
+
+    # Progress
+
+    async def raise_theme_progress(
+        self, telegram_id: str, theme_id: int, state: ThemeProgress
+    ) -> tuple[int, ThemeProgress] | None:
+        """Overrided function ``raise_theme_progress`` from parent class."""
+
+        if (user := self._users.get(telegram_id)) is None:
+            return None
+        progress = self._progress.setdefault(user["id"], {})
+        progress[theme_id] = max(progress.get(theme_id, ThemeProgress.NONE), state)
+        return user["id"], progress[theme_id]
+
+    async def get_themes_progress(self, user_id: int) -> dict[int, ThemeProgress]:
+        """Overrided function ``get_themes_progress`` from parent class."""
+
+        return dict(self._progress.get(user_id, {}))
+
+    # Sessions
+
+    async def create_session(self, telegram_id: str, **fields: Any) -> bool:
+        """Overrided function ``create_session`` from parent class."""
+
+        user = self._users.get(telegram_id)
+        if user is None or user["id"] in self._session_of:
+            return False
+        row = dict.fromkeys(_SESSION_FIELDS)
+        row.update(
+            {
+                field: tuple(value) if isinstance(value, list) else value
+                for field, value in fields.items()
+            },
+            id=next(self._session_ids),
+            user_id=user["id"],
+        )
+        self._sessions[row["id"]] = row
+        self._session_of[user["id"]] = row["id"]
+        return True
+
+    async def delete_session(self, session_id: int) -> None:
+        """Overrided function ``delete_session`` from parent class."""
+
+        if (row := self._sessions.pop(session_id, None)) is not None:
+            del self._session_of[row["user_id"]]
+
+    async def rerun_session(self, telegram_id: str) -> None:
+        """Overrided function ``rerun_session`` from parent class."""
+
+        if (row := self._user_session(telegram_id)) is None:
+            return
+        total = len(row["incorrect_questions"])
+        row.update(
+            questions_queue=row["incorrect_questions"],
+            incorrect_questions=(),
+            progress=0,
+            questions_total=total,
+            hints=math.ceil(total / 10),
+            hints_total=math.ceil(total / 10),
+        )
+
+    async def decrease_hints(self, telegram_id: str) -> int | None:
+        """Overrided function ``decrease_hints`` from parent class."""
+
+        if (row := self._user_session(telegram_id)) is None:
+            return None
+        row["hints"] -= 1
+        return row["hints"]
+
+    async def record_answer(
+        self,
+        session_id: int,
+        progress: int,
+        question_id: int,
+        correct: bool,
+        a_msg_id: int,
+    ) -> AnsweredState | None:
+        """Overrided function ``record_answer`` from parent class."""
+
+        row = self._sessions.get(session_id)
+        if row is None or row["progress"] != progress:
+            return None
+        row["progress"] += 1
+        if not correct:
+            row["incorrect_questions"] = (*row["incorrect_questions"], question_id)
+        row["cur_a_msg"] = a_msg_id
+        return AnsweredState(
+            row["progress"], list(row["incorrect_questions"]), row["cur_a_msg"]
+        )
+
+    async def save_session_msgs(
+        self, session_id: int, msg_ids: dict[str, int | None]
+    ) -> None:
+        """Overrided function ``save_session_msgs`` from parent class."""
+
+        if (row := self._sessions.get(session_id)) is not None:
+            row.update({f"cur_{flag}_msg": msg_id for flag, msg_id in msg_ids.items()})
+
+    async def get_exam_deadlines(self) -> list[tuple[str, datetime]]:
+        """Overrided function ``get_exam_deadlines`` from parent class."""
+
+        return [
+            (telegram_id, row["exam_deadline"])
+            for telegram_id, user in self._users.items()
+            if (session_id := self._session_of.get(user["id"])) is not None
+            and (row := self._sessions[session_id])["exam_deadline"] is not None
+            and row["cur_s_msg"] is None
+        ]
@@ -0,0 +1,116 @@
+"""
+Module with PostgreSQL storage.
+
+Read-only getters of user state go through ``READ_ROUTER``, which sends them to read replica, if it is configured, is
+not lagging and the user didn't write anything recently. Everything else goes to primary.
+"""
+
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, Insert
+
+from config import DB_POOL_WARMUP
+from database.connection import SessionLocal, engine, replica_engine
+from database.migrations import check_indexes, check_migrations
+from database.pool import pool_stats, warm_up_pool
+from database.routing import READ_ROUTER
+from repositories.sql import SqlRepository, T
+from services.metrics_service import instrument_engine
+
+
+class PostgresRepository(SqlRepository):
+    """Storage in PostgreSQL with optional read replica."""
+
+    def __init__(self) -> None:
+        """Creates storage on engines of ``database.connection``."""
+
+        super().__init__(SessionLocal)
+        # Count DB queries for ``/metrics``
+        instrument_engine(engine)
+        if replica_engine is not None:
+            instrument_engine(replica_engine)
+
+    async def start(self) -> None:
+        """
+        Overrided function ``start`` from parent class.
+
+        Opens minimum number of DB connections, refuses to start with pending migrations and warns about schema, which
+        is behind ORM models.
+        """
+
+        if DB_POOL_WARMUP:
+            await warm_up_pool(engine)
+        await check_migrations()
+        await check_indexes()
+
+    async def close(self) -> None:
+        """Overrided function ``close`` from parent class."""
+
+        await engine.dispose()
+        if replica_engine is not None:
+            await replica_engine.dispose()
+
+    def bind(self, telegram_id: str) -> None:
+        """
+        Overrided function ``bind`` from parent class.
+
+        Commits in current update are writes of the user, they are read from primary for a while.
+        """
+
+        READ_ROUTER.bind(telegram_id)
+
+    def pin(self, telegram_id: str) -> None:
+        """Overrided function ``pin`` from parent class."""
+
+        READ_ROUTER.pin(telegram_id)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Overrided function ``stats`` from parent class."""
+
+        return {"pool": pool_stats(engine), "replica": READ_ROUTER.stats()}
+
+    async def _read(
+        self, telegram_id: str | None, query: Callable[[AsyncSession], Awaitable[T]]
+    ) -> T:
+        """Overrided function ``_read`` from parent class."""
+
+        return await READ_ROUTER.read(telegram_id, query)
+
+    def _insert(self, table: type) -> Insert:
+        """Overrided function ``_insert`` from parent class."""
+
+        return insert(table)
+
+    def _greatest(self, a: Any, b: Any) -> ColumnElement:
+        """Overrided function ``_greatest`` from parent class."""
+
+        return func.greatest(a, b)
+
+    def _append(self, array: Any, item: Any) -> ColumnElement:
+        """Overrided function ``_append`` from parent class."""
+
+        return func.array_append(array, item)
+
+    def _length(self, array: Any) -> ColumnElement:
+        """Overrided function ``_length`` from parent class."""
+
+        # ``array_length`` is ``NULL`` for empty array
+        return func.cardinality(array)
+
+    async def catalog_version(self) -> int | None:
+        """
+        Overrided function ``catalog_version`` from parent class.
+
+        Version is bumped by triggers on any change of ``sections``, ``themes`` and ``questions``. ``None`` is returned
+        if migration with ``catalog_version`` table is not applied.
+        """
+
+        async with self._sessions() as session:
+            if not await session.scalar(
+                text("SELECT to_regclass('catalog_version') IS NOT NULL")
+            ):
+                return None
+            return await session.scalar(text("SELECT version FROM catalog_version"))
@@ -0,0 +1,526 @@
+"""
+Module with storage on top of SQLAlchemy ORM.
+
+``SqlRepository`` holds everything, that is common for SQL databases. Dialect-specific parts (upsert, ``GREATEST``,
+appending to array, array length) are hooks, which are overridden by ``PostgresRepository`` and ``SqliteRepository``.
+Users and sessions are read with Core queries of only needed columns, rows are turned into entries without ORM objects.
+"""
+
+from abc import abstractmethod
+from datetime import datetime
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy import Row, Select, Table, select, update, delete, literal, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.sql import ColumnElement, Insert
+
+from catalog.entries import SectionEntry, ThemeEntry, QuestionEntry
+from catalog.rendering import render_question
+from database.models import (
+    Section,
+    Theme,
+    Question,
+    User,
+    UserSession,
+    UserThemeProgress,
+    ThemeProgress,
+)
+from repositories.base import Repository, AnsweredState
+from repositories.entries import UserEntry, UserSessionEntry
+
+T = TypeVar("T")
+
+# Tables of ORM models
+_USERS: Table = User.__table__
+_SESSIONS: Table = UserSession.__table__
+# Columns of ``UserEntry`` and ``UserSessionEntry``, session's id is labeled to not clash with user's one
+_USER_COLUMNS: tuple[ColumnElement, ...] = (
+    _USERS.c.id,
+    _USERS.c.telegram_id,
+    _USERS.c.username,
+    _USERS.c.exam_best,
+    _USERS.c.exam_profile,
+    _USERS.c.hints_allowed,
+    _USERS.c.checked_update,
+)
+_SESSION_COLUMNS: tuple[ColumnElement, ...] = (
+    _SESSIONS.c.id.label("session_id"),
+    _SESSIONS.c.theme_id,
+    _SESSIONS.c.incorrect_questions,
+    _SESSIONS.c.progress,
+    _SESSIONS.c.questions_queue,
+    _SESSIONS.c.questions_total,
+    _SESSIONS.c.hints,
+    _SESSIONS.c.hints_total,
+    _SESSIONS.c.cur_q_msg,
+    _SESSIONS.c.cur_p_msg,
+    _SESSIONS.c.cur_a_msg,
+    _SESSIONS.c.cur_s_msg,
+    _SESSIONS.c.exam_deadline,
+)
+_SELECT_WITH_SESSION: Select = select(*_USER_COLUMNS, *_SESSION_COLUMNS).select_from(
+    _USERS.outerjoin(_SESSIONS, _SESSIONS.c.user_id == _USERS.c.id)
+)
+
+
+def _session_entry(row: Row) -> UserSessionEntry | None:
+    """
+    Function, that creates ``UserSessionEntry`` from row with ``_SESSION_COLUMNS``.
+
+    :param row: result row
+    :return: ``UserSessionEntry`` object or ``None`` if user has no session
+    """
+
+    if row.session_id is None:
+        return None
+    return UserSessionEntry(
+        id=row.session_id,
+        theme_id=row.theme_id,
+        incorrect_questions=tuple(row.incorrect_questions),
+        progress=row.progress,
+        questions_queue=tuple(row.questions_queue),
+        questions_total=row.questions_total,
+        hints=row.hints,
+        hints_total=row.hints_total,
+        cur_q_msg=row.cur_q_msg,
+        cur_p_msg=row.cur_p_msg,
+        cur_a_msg=row.cur_a_msg,
+        cur_s_msg=row.cur_s_msg,
+        exam_deadline=row.exam_deadline,
+    )
+
+
+def _user_entry(row: Row, session: UserSessionEntry | None) -> UserEntry:
+    """
+    Function, that creates ``UserEntry`` from row with ``_USER_COLUMNS``.
+
+    :param row: result row
+    :param session: user's session
+    :return: ``UserEntry`` object
+    """
+
+    return UserEntry(
+        id=row.id,
+        telegram_id=row.telegram_id,
+        username=row.username,
+        exam_best=row.exam_best,
+        exam_profile=row.exam_profile,
+        hints_allowed=row.hints_allowed,
+        checked_update=row.checked_update,
+        session=session,
+    )
+
+
+class SqlRepository(Repository):
+    """Storage in SQL database. Writes and reads, which precede writes, use ``sessions``."""
+
+    def __init__(self, sessions: async_sessionmaker[AsyncSession]) -> None:
+        """
+        Creates storage.
+
+        :param sessions: session maker of database
+        """
+
+        self._sessions = sessions
+
+    async def _read(
+        self, telegram_id: str | None, query: Callable[[AsyncSession], Awaitable[T]]
+    ) -> T:
+        """
+        Method, that runs read-only query. Overridden by backends, which can read from elsewhere (e.g. replica).
+
+        :param telegram_id: string with user's unique Telegram id or ``None`` if read is not bound to user
+        :param query: coroutine function, which receives session and returns result
+        :return: result of ``query``
+        """
+
+        async with self._sessions() as session:
+            return await query(session)
+
+    @abstractmethod
+    def _insert(self, table: type) -> Insert:
+        """
+        Method, that creates ``INSERT`` statement of dialect, which supports ``ON CONFLICT``.
+
+        :param table: ORM model
+        :return: ``INSERT`` statement
+        """
+
+    @abstractmethod
+    def _greatest(self, a: Any, b: Any) -> ColumnElement:
+        """
+        Method, that creates SQL expression of greatest of two values.
+
+        :param a: first value
+        :param b: second value
+        :return: SQL expression
+        """
+
+    @abstractmethod
+    def _append(self, array: Any, item: Any) -> ColumnElement:
+        """
+        Method, that creates SQL expression of array with appended item.
+
+        :param array: array column
+        :param item: appended value
+        :return: SQL expression
+        """
+
+    @abstractmethod
+    def _length(self, array: Any) -> ColumnElement:
+        """
+        Method, that creates SQL expression of number of array items, ``0`` for empty array.
+
+        :param array: array column
+        :return: SQL expression
+        """
+
+    # Catalog
+
+    # noinspection PyTypeChecker
+    async def read_catalog(
+        self,
+    ) -> tuple[list[SectionEntry], list[ThemeEntry], list[QuestionEntry]]:
+        """
+        Overrided function ``read_catalog`` from parent class.
+
+        Each question is precompiled with ``render_question`` here, so handlers never parse answers themselves.
+        """
+
+        async with self._sessions() as session:
+            sections = await session.execute(select(Section).order_by(Section.id))
+            themes = await session.execute(select(Theme).order_by(Theme.id))
+            questions = await session.execute(select(Question).order_by(Question.id))
+
+            section_entries = [
+                SectionEntry(id=s.id, title=s.title) for s in sections.scalars().all()
+            ]
+            theme_entries = [
+                ThemeEntry(id=t.id, title=t.title, section_id=t.section_id)
+                for t in themes.scalars().all()
+            ]
+            themes_by_id = {t.id: t for t in theme_entries}
+            question_entries = [
+                QuestionEntry(
+                    id=q.id,
+                    title=q.title,
+                    answers=tuple(q.answers),
+                    correct_answer=q.correct_answer,
+                    theme_id=q.theme_id,
+                    theme=themes_by_id[q.theme_id],
+                    rendered=render_question(q.answers, q.correct_answer),
+                )
+                for q in questions.scalars().all()
+            ]
+        return section_entries, theme_entries, question_entries
+
+    # Users
+
+    @staticmethod
+    async def _select_users(session: AsyncSession, query: Select) -> list[UserEntry]:
+        """
+        Method, that runs ``SELECT`` of ``_USER_COLUMNS`` and ``_SESSION_COLUMNS`` in specified session.
+
+        :param session: ``AsyncSession`` object
+        :param query: ``SELECT`` statement, based on ``_SELECT_WITH_SESSION``
+        :return: list of ``UserEntry`` objects
+        """
+
+        rows = await session.execute(query)
+        return [_user_entry(row, _session_entry(row)) for row in rows]
+
+    async def get_user_with_session(self, telegram_id: str) -> UserEntry | None:
+        """Overrided function ``get_user_with_session`` from parent class."""
+
+        users = await self._read(
+            telegram_id,
+            lambda session: self._select_users(
+                session,
+                _SELECT_WITH_SESSION.where(_USERS.c.telegram_id == telegram_id),
+            ),
+        )
+        return users[0] if users else None
+
+    async def get_users_with_session(self, telegram_ids: list[str]) -> list[UserEntry]:
+        """Overrided function ``get_users_with_session`` from parent class."""
+
+        # Read from primary: exams are finalized with this state
+        async with self._sessions() as session:
+            return await self._select_users(
+                session,
+                _SELECT_WITH_SESSION.where(_USERS.c.telegram_id.in_(telegram_ids)),
+            )
+
+    async def _update_user(
+        self, telegram_id: str, returning: ColumnElement, **values: Any
+    ) -> Any:
+        """
+        Method, that updates user's fields with a single ``UPDATE ... RETURNING`` statement. Values may be SQL
+        expressions of the stored ones, so concurrent updates can't lose each other.
+
+        :param telegram_id: string with user's unique Telegram id
+        :param returning: returned column
+        :param values: new values of ``User`` fields
+        :return: value of ``returning`` after update or ``None`` if no row was updated
+        """
+
+        async with self._sessions() as session:
+            result = await session.scalar(
+                update(User)
+                .where(User.telegram_id == telegram_id)
+                .values(**values)
+                .returning(returning)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        return result
+
+    async def changelog_seen(self, telegram_id: str) -> None:
+        """Overrided function ``changelog_seen`` from parent class."""
+
+        await self._update_user(telegram_id, User.id, checked_update=True)
+
+    async def set_username(self, telegram_id: str, username: str) -> None:
+        """Overrided function ``set_username`` from parent class."""
+
+        await self._update_user(telegram_id, User.id, username=username)
+
+    async def change_hints_policy(self, telegram_id: str) -> bool | None:
+        """Overrided function ``change_hints_policy`` from parent class."""
+
+        return await self._update_user(
+            telegram_id, User.hints_allowed, hints_allowed=~User.hints_allowed
+        )
+
+    async def increase_help_alert_counter(self, telegram_id: str) -> int | None:
+        """Overrided function ``increase_help_alert_counter`` from parent class."""
+
+        return await self._update_user(
+            telegram_id,
+            User.help_alert_counter,
+            help_alert_counter=User.help_alert_counter + 1,
+        )
+
+    async def update_exam_best(
+        self, telegram_id: str, score: int, profile: str
+    ) -> str | None:
+        """Overrided function ``update_exam_best`` from parent class."""
+
+        async with self._sessions() as session:
+            username = await session.scalar(
+                update(User)
+                .where(
+                    User.telegram_id == telegram_id,
+                    or_(
+                        User.exam_profile.is_distinct_from(profile),
+                        User.exam_best < score,
+                    ),
+                )
+                .values(exam_best=score, exam_profile=profile)
+                .returning(User.username)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        return username
+
+    # Progress
+
+    async def raise_theme_progress(
+        self, telegram_id: str, theme_id: int, state: ThemeProgress
+    ) -> tuple[int, ThemeProgress] | None:
+        """
+        Overrided function ``raise_theme_progress`` from parent class.
+
+        Transition is made with a single ``INSERT ... ON CONFLICT DO UPDATE`` statement, so concurrent updates can't
+        lose each other.
+        """
+
+        insert_stmt = self._insert(UserThemeProgress).from_select(
+            ["user_id", "theme_id", "state"],
+            select(User.id, literal(theme_id), literal(int(state))).where(
+                User.telegram_id == telegram_id
+            ),
+        )
+        async with self._sessions() as session:
+            saved = await session.execute(
+                insert_stmt.on_conflict_do_update(
+                    index_elements=["user_id", "theme_id"],
+                    set_={
+                        "state": self._greatest(
+                            UserThemeProgress.state, insert_stmt.excluded.state
+                        )
+                    },
+                ).returning(UserThemeProgress.user_id, UserThemeProgress.state)
+            )
+            saved = saved.first()
+            await session.commit()
+
+        if saved is None:
+            return None
+        return saved.user_id, ThemeProgress(saved.state)
+
+    # noinspection PyTypeChecker
+    async def get_themes_progress(self, user_id: int) -> dict[int, ThemeProgress]:
+        """Overrided function ``get_themes_progress`` from parent class."""
+
+        # Read from primary: stale progress from replica would stay in cache
+        async with self._sessions() as session:
+            rows = await session.execute(
+                select(UserThemeProgress.theme_id, UserThemeProgress.state).where(
+                    UserThemeProgress.user_id == user_id
+                )
+            )
+            return {theme_id: ThemeProgress(state) for theme_id, state in rows.all()}
+
+    # Sessions
+
+    async def create_session(self, telegram_id: str, **fields: Any) -> bool:
+        """Overrided function ``create_session`` from parent class."""
+
+        async with self._sessions() as session:
+            user = await session.execute(
+                select(User.id, UserSession.id.label("session_id"))
+                .outerjoin(UserSession, UserSession.user_id == User.id)
+                .where(User.telegram_id == telegram_id)
+            )
+            user = user.first()
+            if user is None or user.session_id is not None:
+                return False
+
+            session.add(UserSession(user_id=user.id, **fields))
+            try:
+                await session.commit()
+            except IntegrityError:
+                # Concurrent update has already created a session for this user
+                return False
+            return True
+
+    async def delete_session(self, session_id: int) -> None:
+        """Overrided function ``delete_session`` from parent class."""
+
+        async with self._sessions() as session:
+            await session.execute(
+                delete(UserSession)
+                .where(UserSession.id == session_id)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+    async def _update_session(
+        self, telegram_id: str, returning: ColumnElement, **values: Any
+    ) -> Any:
+        """
+        Method, that updates fields of user's session with a single ``UPDATE ... RETURNING`` statement. Values may be
+        SQL expressions of the stored ones, so concurrent updates can't lose each other.
+
+        :param telegram_id: string with user's unique Telegram id
+        :param returning: returned column
+        :param values: new values of ``UserSession`` fields
+        :return: value of ``returning`` after update or ``None`` if user has no session
+        """
+
+        async with self._sessions() as session:
+            result = await session.scalar(
+                update(UserSession)
+                .where(
+                    UserSession.user_id
+                    == select(User.id)
+                    .where(User.telegram_id == telegram_id)
+                    .scalar_subquery()
+                )
+                .values(**values)
+                .returning(returning)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        return result
+
+    async def rerun_session(self, telegram_id: str) -> None:
+        """Overrided function ``rerun_session`` from parent class."""
+
+        # Right sides of ``SET`` are computed from the row before update
+        questions_total = self._length(UserSession.incorrect_questions)
+        # One hint per 10 questions, rounded up
+        hints = (questions_total + 9) // 10
+        await self._update_session(
+            telegram_id,
+            UserSession.id,
+            questions_queue=UserSession.incorrect_questions,
+            incorrect_questions=[],
+            progress=0,
+            questions_total=questions_total,
+            hints=hints,
+            hints_total=hints,
+        )
+
+    async def decrease_hints(self, telegram_id: str) -> int | None:
+        """Overrided function ``decrease_hints`` from parent class."""
+
+        return await self._update_session(
+            telegram_id, UserSession.hints, hints=UserSession.hints - 1
+        )
+
+    async def record_answer(
+        self,
+        session_id: int,
+        progress: int,
+        question_id: int,
+        correct: bool,
+        a_msg_id: int,
+    ) -> AnsweredState | None:
+        """Overrided function ``record_answer`` from parent class."""
+
+        async with self._sessions() as session:
+            new_state = await session.execute(
+                update(UserSession)
+                .where(UserSession.id == session_id, UserSession.progress == progress)
+                .values(
+                    progress=UserSession.progress + 1,
+                    incorrect_questions=(
+                        UserSession.incorrect_questions
+                        if correct
+                        else self._append(UserSession.incorrect_questions, question_id)
+                    ),
+                    cur_a_msg=a_msg_id,
+                )
+                .returning(
+                    UserSession.progress,
+                    UserSession.incorrect_questions,
+                    UserSession.cur_a_msg,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            new_state = new_state.first()
+            await session.commit()
+        return AnsweredState(*new_state) if new_state is not None else None
+
+    async def save_session_msgs(
+        self, session_id: int, msg_ids: dict[str, int | None]
+    ) -> None:
+        """Overrided function ``save_session_msgs`` from parent class."""
+
+        async with self._sessions() as session:
+            await session.execute(
+                update(UserSession)
+                .where(UserSession.id == session_id)
+                .values({f"cur_{flag}_msg": msg_id for flag, msg_id in msg_ids.items()})
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+    async def get_exam_deadlines(self) -> list[tuple[str, datetime]]:
+        """Overrided function ``get_exam_deadlines`` from parent class."""
+
+        async with self._sessions() as session:
+            deadlines = await session.execute(
+                select(User.telegram_id, UserSession.exam_deadline)
+                .join(UserSession, UserSession.user_id == User.id)
+                .where(
+                    UserSession.exam_deadline.is_not(None),
+                    UserSession.cur_s_msg.is_(None),
+                )
+            )
+            return [
+                (telegram_id, deadline) for telegram_id, deadline in deadlines.all()
+            ]
@@ -0,0 +1,138 @@
+"""
+Module with embedded SQLite storage for small deployments, which don't need a separate DB server.
+
+Tables are created from ORM models on start, array columns are stored as JSON (see ``database.models.Base``). Empty
+database is filled with questions from ``static/parsed.json`` and with users from ``STORAGE_USERS``. Schema
+migrations and ``--load-bank`` are PostgreSQL-only, new questions get into SQLite storage only with a new file.
+"""
+
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import event, func, select, literal
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql import ColumnElement, Insert
+
+from catalog.bank import bank_entries
+from config import SQLITE_PATH, STORAGE_USERS
+from database.models import Base, Section, Theme, Question, User
+from enums.logs import Logs
+from loggers.setup import LOGGER
+from repositories.sql import SqlRepository
+from services.metrics_service import instrument_engine
+
+
+def _set_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+    """
+    Function, that configures every new SQLite connection.
+
+    :param dbapi_connection: DBAPI connection
+    :param _connection_record: pool record of connection
+    """
+
+    cursor = dbapi_connection.cursor()
+    # Readers don't wait for the writer
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    # Milliseconds to wait for lock of another worker process
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+class SqliteRepository(SqlRepository):
+    """Storage in SQLite file."""
+
+    def __init__(
+        self, path: str = SQLITE_PATH, users: list[str] = STORAGE_USERS
+    ) -> None:
+        """
+        Creates storage. Use ``SqliteRepository.start`` to prepare it.
+
+        :param path: path to database file
+        :param users: Telegram ids of users, which are created on start
+        """
+
+        self._initial_users = users
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Connections are kept open, by default each session would open the file and set pragmas again
+        self._engine = create_async_engine(
+            f"sqlite+aiosqlite:///{path}", poolclass=AsyncAdaptedQueuePool
+        )
+        event.listen(self._engine.sync_engine, "connect", _set_pragmas)
+        # Count DB queries for ``/metrics``
+        instrument_engine(self._engine)
+        super().__init__(async_sessionmaker(self._engine))
+
+    async def start(self) -> None:
+        """
+        Overrided function ``start`` from parent class.
+
+        Creates missing tables and fills empty database with questions and users.
+        """
+
+        async with self._engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with self._sessions() as session:
+            if not await session.scalar(select(func.count()).select_from(Section)):
+                sections, themes, questions = bank_entries()
+                session.add_all(Section(id=s.id, title=s.title) for s in sections)
+                session.add_all(
+                    Theme(id=t.id, title=t.title, section_id=t.section_id)
+                    for t in themes
+                )
+                session.add_all(
+                    Question(
+                        id=q.id,
+                        title=q.title,
+                        answers=list(q.answers),
+                        correct_answer=q.correct_answer,
+                        theme_id=q.theme_id,
+                    )
+                    for q in questions
+                )
+                await session.commit()
+                LOGGER.info(
+                    Logs.STORAGE_BANK_LOADED,
+                    "sqlite",
+                    len(sections),
+                    len(themes),
+                    len(questions),
+                )
+
+            if self._initial_users:
+                await session.execute(
+                    insert(User)
+                    .values([{"telegram_id": t} for t in self._initial_users])
+                    .on_conflict_do_nothing(index_elements=["telegram_id"])
+                )
+                await session.commit()
+
+    async def close(self) -> None:
+        """Overrided function ``close`` from parent class."""
+
+        await self._engine.dispose()
+
+    def _insert(self, table: type) -> Insert:
+        """Overrided function ``_insert`` from parent class."""
+
+        return insert(table)
+
+    def _greatest(self, a: Any, b: Any) -> ColumnElement:
+        """Overrided function ``_greatest`` from parent class."""
+
+        # Scalar ``max`` with several arguments
+        return func.max(a, b)
+
+    def _append(self, array: Any, item: Any) -> ColumnElement:
+        """Overrided function ``_append`` from parent class."""
+
+        return func.json_insert(array, literal("$[#]"), item)
+
+    def _length(self, array: Any) -> ColumnElement:
+        """Overrided function ``_length`` from parent class."""
+
+        return func.json_array_length(array)
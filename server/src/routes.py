@@ -0,0 +1,119 @@
+"""
+Module for HTTP routes with runtime stats.
+
+Every worker process serves its own stats, responses are marked with index of the worker.
+"""
+
+from aiohttp import web
+
+from repositories.current import REPOSITORY
+from services.lanes import USER_LANES
+from services.metrics_service import METRICS
+from services.send_scheduler import SEND_SCHEDULER
+from services.sharding import CURRENT_SHARD
+
+
+async def _send_stats(_request: web.Request) -> web.Response:
+    """
+    Handler for ``/stats/send`` route, which returns metrics of outbound requests scheduler.
+
+    :param _request: incoming HTTP request
+    :return: JSON response with queue depth and wait time by priority
+    """
+
+    return web.json_response({"worker": CURRENT_SHARD.index, **SEND_SCHEDULER.stats()})
+
+
+def _storage_stats(group: str) -> web.Response:
+    """
+    Function, that returns group of storage metrics, see ``Repository.stats``.
+
+    :param group: name of metrics group
+    :return: JSON response with metrics or 404 if storage has no such metrics
+    """
+
+    if (stats := REPOSITORY.stats().get(group)) is None:
+        raise web.HTTPNotFound(text=f"{group} stats are not available for this storage")
+    return web.json_response({"worker": CURRENT_SHARD.index, **stats})
+
+
+async def _pool_stats(_request: web.Request) -> web.Response:
+    """
+    Handler for ``/stats/pool`` route, which returns metrics of database connection pool.
+
+    :param _request: incoming HTTP request
+    :return: JSON response with checked out connections, acquire wait time and overflow events, 404 if storage has no
+        pool
+    """
+
+    return _storage_stats("pool")
+
+
+async def _replica_stats(_request: web.Request) -> web.Response:
+    """
+    Handler for ``/stats/replica`` route, which returns metrics of reads routing between primary and replica.
+
+    :param _request: incoming HTTP request
+    :return: JSON response with reads by target, replica lag and failovers, 404 if storage has no replica routing
+    """
+
+    return _storage_stats("replica")
+
+
+async def _lanes_stats(_request: web.Request) -> web.Response:
+    """
+    Handler for ``/stats/lanes`` route, which returns metrics of per-user lanes.
+
+    :param _request: incoming HTTP request
+    :return: JSON response with queue depth, wait time and dropped duplicate callbacks
+    """
+
+    return web.json_response({"worker": CURRENT_SHARD.index, **USER_LANES.stats()})
+
+
+async def _metrics(_request: web.Request) -> web.Response:
+    """
+    Handler for ``/metrics`` route, which returns metrics in Prometheus text format.
+
+    :param _request: incoming HTTP request
+    :return: text response with latency histograms and call counters
+    """
+
+    return web.Response(
+        text=METRICS.render()
+        + "# HELP bot_worker Index of worker process, which served metrics\n"
+        + "# TYPE bot_worker gauge\n"
+        + f'bot_worker{{workers="{CURRENT_SHARD.count}"}} {CURRENT_SHARD.index}\n',
+        content_type="text/plain",
+    )
+
+
+def add_stats_routes(app: web.Application) -> None:
+    """
+    Function, that registers metrics and stats routes on application.
+
+    :param app: ``aiohttp.web.Application`` instance
+    """
+
+    app.router.add_get("/metrics", _metrics)
+    app.router.add_get("/stats/send", _send_stats)
+    app.router.add_get("/stats/pool", _pool_stats)
+    app.router.add_get("/stats/lanes", _lanes_stats)
+    app.router.add_get("/stats/replica", _replica_stats)
+
+
+async def start_stats_server(host: str | None, port: int) -> web.AppRunner:
+    """
+    Function, that starts side server with stats routes.
+
+    :param host: host to bind
+    :param port: port to bind
+    :return: runner of server, which must be cleaned up on exit
+    """
+
+    app = web.Application()
+    add_stats_routes(app)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host=host, port=port).start()
+    return runner
@@ -1,39 +1,30 @@
-"""Module for CRUD functions."""
+"""
+Module for CRUD functions.
+
+Users, sessions and progress are kept in ``REPOSITORY``, which backend is chosen by ``STORAGE_BACKEND`` (see
+``repositories``). Question bank is served from the in-memory ``CATALOG``.
+"""
 
 import math
 import random
-from typing import Literal
+from datetime import datetime
 
 from aiogram import Bot
-from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import Message, CallbackQuery
-from sqlalchemy import select, update, func
-from sqlalchemy.orm import selectinload
 
-from database.connection import SessionLocal
-from database.models import User, UserSession, Theme, Question, Section
+from catalog.entries import SectionEntry, ThemeEntry, QuestionEntry
+from catalog.sampling import get_exam_profile
+from catalog.storage import CATALOG
+from database.models import ThemeProgress
 from enums.logs import Logs
 from loggers.setup import LOGGER
-from services.utility_service import parse_answers_from_question
-
-
-# noinspection PyTypeChecker
-async def get_user(telegram_id: str) -> User:
-    """
-    Function, that returns ``User`` object from DB by specified ``telegram_id``.
-
-    :param telegram_id: string with user's unique Telegram id
-    :return: matching ``User`` object
-    """
-
-    async with SessionLocal() as session:
-        user = await session.execute(
-            select(User).where(User.telegram_id == telegram_id)
-        )
-        return user.scalars().first()
+from repositories.base import AnsweredState
+from repositories.current import REPOSITORY
+from repositories.entries import UserEntry, UserSessionEntry
+from services.messages_service import delete_messages, session_msg_ids
+from services.progress_service import PROGRESS_CACHE, pack_progress
 
 
-# noinspection PyTypeChecker
 async def changelog_seen(telegram_id: str) -> None:
     """
     Function, that sets user's ``changelog_seen`` field to True.
@@ -41,17 +32,9 @@ async def changelog_seen(telegram_id: str) -> None:
     :param telegram_id: string with user's unique Telegram id
     """
 
-    async with SessionLocal() as session:
-        user = await session.execute(
-            select(User).where(User.telegram_id == telegram_id)
-        )
-        user = user.scalars().first()
-        user.checked_update = True
-        await session.commit()
-        await session.refresh(user)
+    await REPOSITORY.changelog_seen(telegram_id)
 
 
-# noinspection PyTypeChecker
 async def set_username(telegram_id: str, username: str) -> None:
     """
     Function, that sets the user's ``username``, if it is not listed in the DB.
@@ -60,284 +43,256 @@ async def set_username(telegram_id: str, username: str) -> None:
     :param username: username, which will be set
     """
 
-    async with SessionLocal() as session:
-        user = await session.execute(
-            select(User).where(User.telegram_id == telegram_id)
-        )
-        user = user.scalars().first()
-        # Username starts from @
-        user.username = "@" + username
-        await session.commit()
-        await session.refresh(user)
+    # Username starts from @
+    await REPOSITORY.set_username(telegram_id, "@" + username)
 
 
-# noinspection PyTypeChecker
-async def change_hints_policy(telegram_id: str) -> None:
+async def change_hints_policy(telegram_id: str) -> bool | None:
     """
     Function, that switches user's ``hints_allowed`` field.
 
     :param telegram_id: string with user's unique Telegram id
+    :return: new value of ``hints_allowed``
     """
 
-    async with SessionLocal() as session:
-        user = await session.execute(
-            select(User).where(User.telegram_id == telegram_id)
-        )
-        user = user.scalars().first()
-        user.hints_allowed = not user.hints_allowed
-        await session.commit()
-        await session.refresh(user)
+    return await REPOSITORY.change_hints_policy(telegram_id)
 
 
-# noinspection PyTypeChecker
 async def update_themes_progress(
     telegram_id: str, theme_id: int, success: bool | None
 ) -> None:
     """
-    Function, that updates ``themes_done_full``, ``themes_done_particular`` and ``themes_tried`` fields in ``users``
-    table.
+    Function, that moves theme progress of user.
 
-    If theme must be set to any of these fields, it will be removed from others.
+    State is never lowered, so "green" theme stays "green" and concurrent updates can't lose each other.
 
     :param telegram_id: string with user's unique Telegram id
     :param theme_id: integer theme's id in ``themes`` table
-    :param success: boolean flag, which should be provided in case of ``theme_done_full``
+    :param success: ``True`` marks theme as done fully, ``False`` - particularly, ``None`` - as tried
     """
 
-    async with SessionLocal() as session:
-        user = await session.execute(
-            select(User).where(User.telegram_id == telegram_id)
-        )
-        user = user.scalars().first()
-
-        if theme_id in user.themes_done_full:
-            return
-
-        if isinstance(success, bool):
-            if success:
-                await session.execute(
-                    update(User)
-                    .where(User.telegram_id == telegram_id)
-                    .values(
-                        themes_done_full=func.array_append(
-                            user.themes_done_full, theme_id
-                        )
-                    )
-                )
-                await session.execute(
-                    update(User)
-                    .where(User.telegram_id == telegram_id)
-                    .values(
-                        themes_done_particular=func.array_remove(
-                            user.themes_done_particular, theme_id
-                        )
-                    )
-                )
-                await session.execute(
-                    update(User)
-                    .where(User.telegram_id == telegram_id)
-                    .values(themes_tried=func.array_remove(user.themes_tried, theme_id))
-                )
-            else:
-                if theme_id in user.themes_done_particular:
-                    return
-                await session.execute(
-                    update(User)
-                    .where(User.telegram_id == telegram_id)
-                    .values(
-                        themes_done_particular=func.array_append(
-                            user.themes_done_particular, theme_id
-                        )
-                    )
-                )
-                await session.execute(
-                    update(User)
-                    .where(User.telegram_id == telegram_id)
-                    .values(themes_tried=func.array_remove(user.themes_tried, theme_id))
-                )
-        else:
-            await session.execute(
-                update(User)
-                .where(User.telegram_id == telegram_id)
-                .values(themes_tried=func.array_append(user.themes_tried, theme_id))
-            )
-        await session.commit()
-        await session.refresh(user)
-
-
-# noinspection PyTypeChecker
-async def get_user_with_session(telegram_id: str) -> User:
-    """
-    Function, that returns the ``User`` object with ``UserSession`` selectinloaded from DB by specified ``telegram_id``.
+    if success is None:
+        state = ThemeProgress.TRIED
+    else:
+        state = ThemeProgress.FULL if success else ThemeProgress.PARTICULAR
+
+    saved = await REPOSITORY.raise_theme_progress(telegram_id, theme_id, state)
+    if saved is not None:
+        user_id, state = saved
+        PROGRESS_CACHE.raise_state(user_id, theme_id, state)
+
+
+async def get_themes_progress(user_id: int) -> int:
+    """
+    Function, that returns progress of user as bitset, see ``services.progress_service``.
+
+    Bitset is served from ``PROGRESS_CACHE`` and is loaded from storage only on cache miss.
+
+    :param user_id: identifier of user in ``users`` table
+    :return: progress bitset
+    """
+
+    if (bits := PROGRESS_CACHE.get(user_id)) is not None:
+        return bits
+
+    bits = pack_progress(await REPOSITORY.get_themes_progress(user_id))
+    PROGRESS_CACHE.put(user_id, bits)
+    return bits
+
+
+async def get_user_with_session(telegram_id: str) -> UserEntry:
+    """
+    Function, that returns the ``UserEntry`` object with ``UserSessionEntry`` loaded from DB by specified
+    ``telegram_id``.
 
     :param telegram_id: string with user's unique Telegram id
-    :return: matching ``User`` object
+    :return: matching ``UserEntry`` object
     """
 
-    async with SessionLocal() as session:
-        user = await session.execute(
-            select(User)
-            .where(User.telegram_id == telegram_id)
-            .options(selectinload(User.session))
+    return await REPOSITORY.get_user_with_session(telegram_id)
+
+
+async def get_user_context(
+    telegram_id: str,
+) -> tuple[UserEntry | None, UserSessionEntry | None, QuestionEntry | None]:
+    """
+    Function, that loads everything, what is needed to handle one update, in a single query: ``UserEntry`` object, its
+    ``UserSessionEntry`` and current ``QuestionEntry`` from the in-memory ``CATALOG``.
+
+    :param telegram_id: string with user's unique Telegram id
+    :return: tuple of user, user's session and current question (any of them can be ``None``)
+    """
+
+    user = await REPOSITORY.get_user_with_session(telegram_id)
+
+    if user is None or user.session is None:
+        return user, None, None
+
+    user_session = user.session
+    if user_session.progress < len(user_session.questions_queue):
+        cur_question = CATALOG.questions_by_id.get(
+            user_session.questions_queue[user_session.progress]
         )
-        return user.scalars().first()
+    else:
+        cur_question = None
+    return user, user_session, cur_question
+
 
+def bind_user(telegram_id: str) -> None:
+    """
+    Function, that binds user to current update, so writes in it are attributed to the user, e.g. user's next reads
+    don't go to lagging read replica.
 
-# noinspection PyTypeChecker
-async def increase_help_alert_counter(telegram_id: str) -> None:
+    :param telegram_id: string with user's unique Telegram id
+    """
+
+    REPOSITORY.bind(telegram_id)
+
+
+def mark_written(telegram_ids: list[str]) -> None:
+    """
+    Function, that marks writes of users, which were made outside of their updates (e.g. by timers).
+
+    :param telegram_ids: list of strings with users' unique Telegram ids
+    """
+
+    for telegram_id in telegram_ids:
+        REPOSITORY.pin(telegram_id)
+
+
+async def increase_help_alert_counter(telegram_id: str) -> int | None:
     """
     Function, that increases ``help_alert_counter``.
 
     If counter % 10 == 0 than the reminder about ``/heal`` command will be spawned.
 
     :param telegram_id: string with user's unique Telegram id
+    :return: increased value of counter
     """
 
-    async with SessionLocal() as session:
-        user = await session.execute(
-            select(User).where(User.telegram_id == telegram_id)
-        )
-        user = user.scalars().first()
-        user.help_alert_counter += 1
-        await session.commit()
-        await session.refresh(user)
+    return await REPOSITORY.increase_help_alert_counter(telegram_id)
 
 
-async def clear_session(message: Message | CallbackQuery, bot: Bot) -> None:
+async def clear_session(
+    message: Message | CallbackQuery,
+    bot: Bot,
+    user_session: UserSessionEntry | None = None,
+) -> None:
     """
     Function, that deletes all messages wich are bound with current ``user.session`` and deletes corresponding line
     from DB.
 
     :param message: ``aiogram.types.Message`` or ``aiogram.types.CallbackQuery`` which triggered this function
     :param bot: instance of ``aiogram.Bot``
+    :param user_session: already loaded session, if not provided - it will be selected from DB
     """
 
-    async with SessionLocal() as session:
-        user = await get_user_with_session(str(message.from_user.id))
+    if user_session is None:
+        # Read the latest state, session is deleted right after
+        user = (await REPOSITORY.get_users_with_session([str(message.from_user.id)]))[0]
         user_session = user.session
-        if user_session:
-            for msg in [
-                user_session.cur_q_msg,
-                user_session.cur_p_msg,
-                user_session.cur_a_msg,
-                user_session.cur_s_msg,
-            ]:
-                if msg:
-                    try:
-                        await bot.delete_message(
-                            chat_id=(
-                                message.chat.id
-                                if isinstance(message, Message)
-                                else message.message.chat.id
-                            ),
-                            message_id=msg,
-                        )
-                    except TelegramBadRequest:
-                        pass
-
-            await session.delete(user_session)
-            await session.commit()
-
-
-async def init_exam_session(telegram_id: str) -> bool:
+    if user_session:
+        await delete_messages(
+            bot,
+            (
+                message.chat.id
+                if isinstance(message, Message)
+                else message.message.chat.id
+            ),
+            session_msg_ids(user_session),
+        )
+
+        await REPOSITORY.delete_session(user_session.id)
+
+
+async def init_exam_session(telegram_id: str, exam_deadline: datetime) -> bool:
     """
     Function, that creates new exam session for user with specified ``telegram_id``.
 
     - Questions for exam session are randomized;
-    - There are always 35 questions;
-    - At least 1 question from each theme and 4 fully randomed from remainder;
-    - Each question has 4 or fewer variants of answer;
+    - Number of questions, questions per theme and maximum number of variants come from active ``ExamProfile``
+      (by default - 35 questions, 1 from each theme and the rest fully randomed from remainder, 4 or fewer variants);
+    - Questions are sampled from ``CATALOG.sampling`` index, so no table is scanned;
     - Hints are disabled;
     - Theme won't be specified for such session;
-    - Suggestion to solve incorrects again won't appear after exam end.
+    - Suggestion to solve incorrects again won't appear after exam end;
+    - Deadline is persisted, so exam timer survives restarts.
 
     If there is existing session for this user, function return ``False`` and creation stops.
     Otherwise - proceeds the session creation and returns ``True``.
 
     :param telegram_id: string with user's unique Telegram id
+    :param exam_deadline: time, when exam must be stopped
     :return: ``False`` if session was not created, ``True`` otherwise
     """
 
-    async with SessionLocal() as session:
-        user = await get_user_with_session(telegram_id)
-        if user.session is not None:
-            return False
+    # Randomized and shuffled questions
+    questions_queue = CATALOG.sampling.sample(get_exam_profile())
 
-        # Get all themes with loaded questions relationship
-        themes = await session.execute(
-            select(Theme).options(selectinload(Theme.questions))
-        )
-        themes = themes.scalars().all()
-
-        # List for storing randomized questions
-        selected_questions = []
-
-        # Select one question from each theme
-        for theme in themes:
-            if theme.questions:
-                randomed_q = random.choice(theme.questions)
-                if len(parse_answers_from_question(randomed_q.answers)[0]) <= 4:
-                    selected_questions.append(randomed_q)
-
-        # Select last four questions from remainder
-        num_remaining_questions = 35 - len(selected_questions)
-        if num_remaining_questions > 0:
-            # Get all questions which are not selected
-            all_questions = await session.execute(select(Question))
-            all_questions = all_questions.scalars().all()
-            remaining_questions = [
-                q
-                for q in all_questions
-                if q not in selected_questions
-                and len(parse_answers_from_question(q.answers)[0]) <= 4
-            ]
-            selected_questions.extend(
-                random.sample(remaining_questions, num_remaining_questions)
-            )
-
-        # Shuffle the selected questions
-        random.shuffle(selected_questions)
-
-        # Create new exam session
-        questions_queue = [q.id for q in selected_questions]
-        new_session = UserSession(
-            user_id=user.id,
-            incorrect_questions=[],
-            questions_queue=questions_queue,
-            questions_total=35,
-            hints=0,
-            hints_total=0,
-            progress=0,
-        )
-        session.add(new_session)
-        await session.commit()
-        await session.refresh(new_session)
-        return True
+    # Create new exam session
+    return await REPOSITORY.create_session(
+        telegram_id,
+        incorrect_questions=[],
+        questions_queue=questions_queue,
+        questions_total=len(questions_queue),
+        hints=0,
+        hints_total=0,
+        progress=0,
+        exam_deadline=exam_deadline,
+    )
+
+
+async def get_exam_deadlines() -> list[tuple[str, datetime]]:
+    """
+    Function, that returns deadlines of all unfinished exam sessions. Used to restore exam timers on startup.
+
+    Exam is considered finished when its summary message was sent (``cur_s_msg`` is set).
+
+    :return: list of tuples with user's unique Telegram id and exam deadline
+    """
+
+    return await REPOSITORY.get_exam_deadlines()
+
+
+async def get_users_with_session(telegram_ids: list[str]) -> list[UserEntry]:
+    """
+    Function, that returns ``UserEntry`` objects with ``UserSessionEntry`` joined for several users at once.
+
+    :param telegram_ids: list of strings with users' unique Telegram ids
+    :return: list of matching ``UserEntry`` objects
+    """
+
+    return await REPOSITORY.get_users_with_session(telegram_ids)
+
+
+def get_user_exam_best(user: UserEntry) -> int:
+    """
+    Function, that returns user's best exam result in active exam profile.
+
+    Result of other profile is not comparable with current one, so it is treated as no result.
+
+    :param user: user entry
+    :return: number of correct answers
+    """
+
+    return user.exam_best if user.exam_profile == get_exam_profile().name else 0
 
 
-# noinspection PyTypeChecker
 async def update_user_exam_best(telegram_id: str, score: int) -> None:
     """
     Function, that updates user's ``exam_best`` field.
 
-    If new result is fewer or equal to already stored, no change.
+    If new result is fewer or equal to already stored one of active exam profile, no change.
 
     :param telegram_id: string with user's unique Telegram id
     :param score: number of correct answers
     """
 
-    async with SessionLocal() as session:
-        user = await session.execute(
-            select(User).where(User.telegram_id == telegram_id)
-        )
-        user = user.scalars().first()
-        if score > user.exam_best:
-            user.exam_best = score
-            LOGGER.info(Logs.EXAM_RECORD % (user.telegram_id + "@" + user.username))
-            await session.commit()
-            await session.refresh(user)
-        else:
-            return
+    username = await REPOSITORY.update_exam_best(
+        telegram_id, score, get_exam_profile().name
+    )
+    if username is not None:
+        LOGGER.info(Logs.EXAM_RECORD, telegram_id + "@" + username)
 
 
 async def init_session(telegram_id: str, theme_id: int, shuffle: bool) -> bool:
@@ -359,33 +314,23 @@ async def init_session(telegram_id: str, theme_id: int, shuffle: bool) -> bool:
     :return: ``False`` if session was not created, ``True`` otherwise
     """
 
-    async with SessionLocal() as session:
-        user = await get_user_with_session(telegram_id)
-        if user.session is not None:
-            return False
+    questions, questions_total = await get_questions_with_len_by_theme(theme_id)
 
-        questions, questions_total = await get_questions_with_len_by_theme(theme_id)
+    if shuffle:
+        random.shuffle(questions)
 
-        if shuffle:
-            random.shuffle(questions)
-
-        new_session = UserSession(
-            user_id=user.id,
-            theme_id=theme_id,
-            incorrect_questions=[],
-            questions_queue=[q.id for q in questions],
-            questions_total=questions_total,
-            hints=math.ceil(questions_total / 10),
-            hints_total=math.ceil(questions_total / 10),
-            progress=0,
-        )
-        session.add(new_session)
-        await session.commit()
-        await session.refresh(new_session)
-        return True
+    return await REPOSITORY.create_session(
+        telegram_id,
+        theme_id=theme_id,
+        incorrect_questions=[],
+        questions_queue=[q.id for q in questions],
+        questions_total=questions_total,
+        hints=math.ceil(questions_total / 10),
+        hints_total=math.ceil(questions_total / 10),
+        progress=0,
+    )
 
 
-# noinspection PyTypeChecker
 async def rerun_session(telegram_id: str) -> None:
     """
     Function, that updates session if user is trying to solve incorrect questions.
@@ -398,212 +343,107 @@ async def rerun_session(telegram_id: str) -> None:
     :param telegram_id: string with user's unique Telegram id
     """
 
-    async with SessionLocal() as session:
-        user = await session.execute(
-            select(User)
-            .where(User.telegram_id == telegram_id)
-            .options(selectinload(User.session))
-        )
-        user_session = user.scalars().first().session
-        incorrects = user_session.incorrect_questions
-        user_session.questions_queue = incorrects
-        user_session.incorrect_questions = []
-        user_session.progress = 0
-        user_session.questions_total = len(user_session.questions_queue)
-        user_session.hints = math.ceil(user_session.questions_total / 10)
-        user_session.hints_total = math.ceil(user_session.questions_total / 10)
-        await session.commit()
-        await session.refresh(user_session)
+    await REPOSITORY.rerun_session(telegram_id)
 
 
-# noinspection PyTypeChecker
-async def decrease_hints(telegram_id: str) -> None:
+async def decrease_hints(telegram_id: str) -> int | None:
     """
     Function, that decreases user's hints count for current session if hint was requested.
 
     :param telegram_id: string with user's unique Telegram id
+    :return: remaining hints count
     """
 
-    async with SessionLocal() as session:
-        user = await session.execute(
-            select(User)
-            .where(User.telegram_id == telegram_id)
-            .options(selectinload(User.session))
-        )
-        user_session = user.scalars().first().session
+    return await REPOSITORY.decrease_hints(telegram_id)
 
-        user_session.hints -= 1
-        await session.commit()
-        await session.refresh(user_session)
 
-
-# noinspection PyTypeChecker
-async def save_msg_id(
-    telegram_id: str, msg_id: int | None, flag: Literal["q", "p", "a", "s"]
-) -> None:
+async def record_answer(
+    session_id: int, progress: int, question_id: int, correct: bool, a_msg_id: int
+) -> AnsweredState | None:
     """
-    Function, that saves message ids for:
+    Function, that records user's answer to current question at once:
 
-    - ``q_msg``: message with Question
-    - ``p_msg``: message with Poll
-    - ``a_msg``: message for user's Answer result
-    - ``s_msg``: message for Summary after session end
+    - ``progress`` is increased;
+    - ``question_id`` is appended to ``incorrect_questions`` if answer was not correct;
+    - ``cur_a_msg`` is set to the id of message with answer result.
 
-    Saved ids are used to delete old question before sending next one.
+    Nothing is changed, if ``progress`` of session is not ``progress`` anymore, i.e. this answer is already recorded.
 
-    :param telegram_id: string with user's unique Telegram id
-    :param msg_id: unique identifier of message to save
-    :param flag: boolean flag which is pointing to what type of message will be saved
+    :param session_id: identifier of session in ``sessions`` table
+    :param progress: ``progress`` of session, when question was asked
+    :param question_id: identifier of question in ``questions`` table
+    :param correct: flag, whether user's answer was correct
+    :param a_msg_id: unique identifier of message with answer result
+    :return: ``AnsweredState`` with new ``progress``, ``incorrect_questions`` and ``cur_a_msg`` or ``None`` if session is
+        gone or answer is already recorded
     """
 
-    async with SessionLocal() as session:
-        user = await session.execute(
-            select(User)
-            .where(User.telegram_id == telegram_id)
-            .options(selectinload(User.session))
-        )
-        user = user.scalars().first()
-        user_session = user.session
-
-        if user_session is None:
-            return
-
-        match flag:
-            case "q":
-                user_session.cur_q_msg = msg_id
-            case "p":
-                user_session.cur_p_msg = msg_id
-            case "a":
-                user_session.cur_a_msg = msg_id
-            case "s":
-                user_session.cur_s_msg = msg_id
-        await session.commit()
-
-
-# noinspection PyTypeChecker
-async def increase_progress(telegram_id: str) -> None:
-    """
-    Function, that increases user's progress in current session. This function must be called after user's answer
-    validation.
+    return await REPOSITORY.record_answer(
+        session_id, progress, question_id, correct, a_msg_id
+    )
 
-    :param telegram_id: string with user's unique Telegram id
-    """
-
-    async with SessionLocal() as session:
-        user = await session.execute(
-            select(User)
-            .where(User.telegram_id == telegram_id)
-            .options(selectinload(User.session))
-        )
-        user_session = user.scalars().first().session
-        user_session.progress += 1
-        await session.commit()
-        await session.refresh(user_session)
 
-
-# noinspection PyTypeChecker
-async def append_incorrects(telegram_id: str, cur_question_id: int) -> None:
-    """
-    Function, that adds new incorrect question to ``incorrect_questions`` array-field.
-
-    :param telegram_id: string with user's unique Telegram id
-    :param cur_question_id: identifier of question in ``questions`` table
-    """
-
-    async with SessionLocal() as session:
-        user = await session.execute(
-            select(User)
-            .where(User.telegram_id == telegram_id)
-            .options(selectinload(User.session))
-        )
-        user_session = user.scalars().first().session
-        await session.execute(
-            update(UserSession)
-            .where(UserSession.id == user_session.id)
-            .values(
-                incorrect_questions=func.array_append(
-                    user_session.incorrect_questions, cur_question_id
-                )
-            )
-        )
-        await session.commit()
-        await session.refresh(user_session)
-
-
-# noinspection PyTypeChecker
-async def get_questions_with_len_by_theme(theme_id: int) -> tuple[list[Question], int]:
+async def get_questions_with_len_by_theme(
+    theme_id: int,
+) -> tuple[list[QuestionEntry], int]:
     """
     Function, that returns list of questions from specified theme and its length.
 
+    Questions are taken from the in-memory ``CATALOG``.
+
     :param theme_id: specified id of theme from ``themes`` table
     """
 
-    async with SessionLocal() as session:
-        questions = await session.execute(
-            select(Question).where(Question.theme_id == theme_id).order_by(Question.id)
-        )
-        questions = questions.scalars().all()
-        return questions, len(questions)
+    questions = list(CATALOG.questions_by_theme.get(theme_id, ()))
+    return questions, len(questions)
 
 
-# noinspection PyTypeChecker
-async def get_cur_question_with_count(telegram_id: str) -> tuple[Question, int]:
+async def get_cur_question_with_count(
+    user_session: UserSessionEntry,
+) -> tuple[QuestionEntry, int]:
     """
     Function, that returns current user's question based on session ``progress`` field and value of ``questions_total``
     field.
 
-    :param telegram_id: string with user's unique Telegram id
+    Question itself is taken from the in-memory ``CATALOG``, so no query is made.
+
+    :param user_session: already loaded user's session
     :return: tuple of current question and total questions count
     """
 
-    async with SessionLocal() as session:
-        user = await get_user_with_session(telegram_id)
-        cur_question = await session.execute(
-            select(Question)
-            .where(Question.id == user.session.questions_queue[user.session.progress])
-            .options(selectinload(Question.theme))
-        )
-        cur_question = cur_question.scalars().first()
-        return cur_question, len(user.session.questions_queue)
+    cur_question = CATALOG.questions_by_id[
+        user_session.questions_queue[user_session.progress]
+    ]
+    return cur_question, len(user_session.questions_queue)
 
 
-async def get_sections() -> list[Section]:
+async def get_sections() -> list[SectionEntry]:
     """
-    Function, that returns a list of ``Section`` objects.
+    Function, that returns a list of ``SectionEntry`` objects from the in-memory ``CATALOG``.
 
     :return: list of all existing sections in DB
     """
 
-    async with SessionLocal() as session:
-        sections = await session.execute(select(Section))
-        return sections.scalars().all()
+    return list(CATALOG.sections)
 
 
-# noinspection PyTypeChecker
-async def get_themes_by_section(section_id: int) -> list[Theme]:
+async def get_themes_by_section(section_id: int) -> list[ThemeEntry]:
     """
-    Function, that returns a list of themes which are bounf to specified ``section_id``
+    Function, that returns a list of themes which are bound to specified ``section_id``
 
     :param section_id: identifier of section in ``sections`` table
     :return: list of all existing themes bounded with specified ``section_id``
     """
 
-    async with SessionLocal() as session:
-        themes = await session.execute(
-            select(Theme).where(Theme.section_id == section_id)
-        )
-        return themes.scalars().all()
+    return list(CATALOG.themes_by_section.get(section_id, ()))
 
 
-# noinspection PyTypeChecker
-async def get_theme_by_id(theme_id: int) -> Theme:
+async def get_theme_by_id(theme_id: int) -> ThemeEntry | None:
     """
-    Function, that returns the ``Theme`` obect based on it's identifier.
+    Function, that returns the ``ThemeEntry`` object based on it's identifier.
 
     :param theme_id: specified id of theme from ``themes`` table
-    :return: ``Theme`` object
+    :return: ``ThemeEntry`` object or ``None`` if there is no such theme
     """
 
-    async with SessionLocal() as session:
-        theme = await session.execute(select(Theme).where(Theme.id == theme_id))
-        return theme.scalars().first()
+    return CATALOG.themes_by_id.get(theme_id)
@@ -0,0 +1,130 @@
+"""
+Module for per-user execution lanes.
+
+Updates of one user are handled one at a time in order of arrival, so two handlers never work with the same
+``UserSession`` at once. Updates of different users are handled in parallel. Lanes live in one process, which is
+enough, because all updates of a user are routed to the same worker (see ``services.sharding``).
+
+Callback, which is the same as a callback of the user that is still queued or handled (double tap on a button), is
+dropped. Callbacks are the same, if they have the same data and come from the same message: the same button of another
+message is a separate action.
+"""
+
+import asyncio
+from time import monotonic
+from typing import Any, Awaitable, Callable
+
+# Callback key: id of message (or inline message), which button was pressed, and data of the button
+CallbackKey = tuple[int | str | None, str]
+
+
+class Lane:
+    """Lane of one user: FIFO-lock and callbacks, which are queued or handled in it."""
+
+    __slots__ = ("lock", "depth", "callbacks")
+
+    def __init__(self) -> None:
+        """Creates empty lane."""
+
+        self.lock = asyncio.Lock()
+        self.depth = 0
+        self.callbacks: set[CallbackKey] = set()
+
+
+class UserLanes:
+    """Scheduler, which runs updates of each user in its own ordered lane."""
+
+    def __init__(self) -> None:
+        """Creates scheduler without lanes. Lane is created with the first update of user and dropped when idle."""
+
+        self._lanes: dict[int, Lane] = {}
+
+        # Metrics
+        self._queued: int = 0
+        self._queued_max: int = 0
+        self._handled: int = 0
+        self._dropped: int = 0
+        self._wait_total: float = 0.0
+        self._wait_max: float = 0.0
+
+    def is_duplicate(self, user_id: int, callback: CallbackKey | None) -> bool:
+        """
+        Method, that checks if the same callback of user is already queued or handled. Duplicates are counted.
+
+        :param user_id: Telegram id of user
+        :param callback: key of callback query, ``None`` for other updates
+        :return: ``True`` if update should be dropped
+        """
+
+        if (
+            callback is not None
+            and (lane := self._lanes.get(user_id)) is not None
+            and callback in lane.callbacks
+        ):
+            self._dropped += 1
+            return True
+        return False
+
+    async def run(
+        self,
+        user_id: int,
+        callback: CallbackKey | None,
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Method, that waits for the turn of update in lane of user and runs it.
+
+        :param user_id: Telegram id of user
+        :param callback: key of callback query, ``None`` for other updates
+        :param call: coroutine function, which handles update
+        :return: result of ``call``
+        """
+
+        if (lane := self._lanes.get(user_id)) is None:
+            lane = self._lanes[user_id] = Lane()
+        lane.depth += 1
+        if callback is not None:
+            lane.callbacks.add(callback)
+
+        self._queued += 1
+        self._queued_max = max(self._queued_max, self._queued)
+        enqueued = monotonic()
+        try:
+            async with lane.lock:
+                waited = monotonic() - enqueued
+                self._queued -= 1
+                enqueued = None
+                self._handled += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+                return await call()
+        finally:
+            # Update was cancelled while waiting
+            if enqueued is not None:
+                self._queued -= 1
+            if callback is not None:
+                lane.callbacks.discard(callback)
+            lane.depth -= 1
+            if not lane.depth:
+                del self._lanes[user_id]
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Method, that returns lanes metrics.
+
+        :return: dictionary with number of busy lanes, queue depth, wait time in seconds and dropped duplicates
+        """
+
+        return {
+            "lanes": len(self._lanes),
+            "queue_depth": self._queued,
+            "queue_depth_max": self._queued_max,
+            "handled": self._handled,
+            "dropped_duplicates": self._dropped,
+            "wait_avg": self._wait_total / self._handled if self._handled else 0.0,
+            "wait_max": self._wait_max,
+        }
+
+
+# Lanes instance, used by ``LaneMiddleware``
+USER_LANES: UserLanes = UserLanes()
@@ -0,0 +1,70 @@
+"""
+Module for lifecycle of bot messages, which are bound with user's session.
+
+Session tracks ids of messages in ``cur_q_msg``, ``cur_p_msg``, ``cur_a_msg`` and ``cur_s_msg`` slots. Messages are
+removed with a single ``deleteMessages`` call and slots are rewritten with a single write to storage.
+"""
+
+from typing import Final
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+
+from repositories.current import REPOSITORY
+from repositories.entries import UserSessionEntry
+
+# Maximum number of messages, which can be deleted with one ``deleteMessages`` call
+DELETE_MESSAGES_LIMIT: Final[int] = 100
+
+
+def session_msg_ids(user_session: UserSessionEntry, flags: str = "qpas") -> list[int]:
+    """
+    Function, that returns ids of messages, which are stored in specified slots of session.
+
+    :param user_session: current user's session
+    :param flags: string with flags of slots to read
+    :return: list of message ids, empty slots are skipped
+    """
+
+    return [
+        msg_id
+        for flag in flags
+        if (msg_id := getattr(user_session, f"cur_{flag}_msg")) is not None
+    ]
+
+
+async def delete_messages(bot: Bot, chat_id: int | str, message_ids: list[int]) -> None:
+    """
+    Function, that deletes messages in bulk via ``deleteMessages``. No request is made for empty list.
+
+    Messages, which can't be deleted (already deleted by user, older than 48 hours), are skipped silently.
+
+    :param bot: instance of ``aiogram.Bot``
+    :param chat_id: chat id, where messages are placed
+    :param message_ids: list of message ids
+    """
+
+    for i in range(0, len(message_ids), DELETE_MESSAGES_LIMIT):
+        try:
+            await bot.delete_messages(
+                chat_id=chat_id, message_ids=message_ids[i : i + DELETE_MESSAGES_LIMIT]
+            )
+        except TelegramBadRequest:
+            pass
+
+
+async def save_session_msgs(session_id: int, **msg_ids: int | None) -> None:
+    """
+    Function, that saves several message ids of session with a single write (``UPDATE`` for SQL storages).
+
+    Keyword names are flags of slots, ``q`` - Question, ``p`` - Poll, ``a`` - Answer result,
+    ``s`` - Summary. E.g. ``save_session_msgs(session_id, q=1, p=2, a=None)``.
+
+    :param session_id: identifier of session in ``sessions`` table
+    :param msg_ids: message ids by flags of slots, ``None`` clears the slot
+    """
+
+    if not msg_ids:
+        return
+
+    await REPOSITORY.save_session_msgs(session_id, msg_ids)
@@ -0,0 +1,339 @@
+"""
+Module for runtime metrics of the bot.
+
+Latency of updates and handlers is collected into histograms with fixed buckets, number of DB queries and Telegram API
+calls is counted per update. Metrics are rendered in Prometheus text format on ``/metrics``.
+"""
+
+import asyncio
+import bisect
+from contextvars import ContextVar
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.methods import TelegramMethod, Response
+from aiogram.methods.base import TelegramType
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Upper bounds of latency buckets in seconds
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# Upper bounds of buckets for number of calls per update
+CALLS_BUCKETS: tuple[float, ...] = (0, 1, 2, 3, 5, 8, 13, 21)
+
+
+class UpdateCounters:
+    """Counters of calls, made while one update is handled."""
+
+    __slots__ = ("db_queries", "api_calls", "paused")
+
+    def __init__(self) -> None:
+        """Creates zeroed counters."""
+
+        self.db_queries: int = 0
+        self.api_calls: int = 0
+        # Seconds of deliberate pauses, see ``pause``
+        self.paused: float = 0.0
+
+
+# Counters of the update, which is handled in current context
+UPDATE_COUNTERS: ContextVar[UpdateCounters | None] = ContextVar(
+    "update_counters", default=None
+)
+
+
+async def pause(seconds: float) -> None:
+    """
+    Function, that sleeps deliberately, e.g. to let user read the changelog. Pause is not counted as update latency.
+
+    :param seconds: duration of pause
+    """
+
+    await asyncio.sleep(seconds)
+    if (counters := UPDATE_COUNTERS.get()) is not None:
+        counters.paused += seconds
+
+
+class Histogram:
+    """Histogram with fixed cumulative buckets, same as Prometheus histogram."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        """
+        Creates empty histogram.
+
+        :param buckets: sorted upper bounds of buckets, ``+Inf`` bucket is added implicitly
+        """
+
+        self.buckets = buckets
+        self.counts: list[int] = [0] * (len(buckets) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Method, that adds value to histogram.
+
+        :param value: observed value
+        """
+
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Method, that estimates quantile with linear interpolation inside the bucket, like ``histogram_quantile``.
+
+        :param q: quantile from 0 to 1
+        :return: estimated value, upper bound of the last finite bucket if quantile falls into ``+Inf`` bucket
+        """
+
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class Metrics:
+    """Registry of bot metrics."""
+
+    def __init__(self) -> None:
+        """Creates empty registry."""
+
+        # Latency of whole update by event type
+        self.updates: dict[str, Histogram] = {}
+        # Latency of handler by event type and handler name
+        self.handlers: dict[tuple[str, str], Histogram] = {}
+        # Calls per update by event type
+        self.db_per_update: dict[str, Histogram] = {}
+        self.api_per_update: dict[str, Histogram] = {}
+        # Totals
+        self.db_queries: int = 0
+        self.api_calls: dict[str, int] = {}
+
+    def observe_update(
+        self, event_type: str, seconds: float, counters: UpdateCounters
+    ) -> None:
+        """
+        Method, that records handled update.
+
+        :param event_type: type of update, e.g. ``callback_query``
+        :param seconds: time spent on update, including pauses
+        :param counters: calls made while update was handled
+        """
+
+        self._histogram(self.updates, event_type, LATENCY_BUCKETS).observe(
+            seconds - counters.paused
+        )
+        self._histogram(self.db_per_update, event_type, CALLS_BUCKETS).observe(
+            counters.db_queries
+        )
+        self._histogram(self.api_per_update, event_type, CALLS_BUCKETS).observe(
+            counters.api_calls
+        )
+
+    def observe_handler(self, event_type: str, handler: str, seconds: float) -> None:
+        """
+        Method, that records time spent in handler.
+
+        :param event_type: type of update, e.g. ``callback_query``
+        :param handler: name of handler function
+        :param seconds: time spent in handler
+        """
+
+        self._histogram(self.handlers, (event_type, handler), LATENCY_BUCKETS).observe(
+            seconds
+        )
+
+    def count_db_query(self) -> None:
+        """Method, that counts executed DB query."""
+
+        self.db_queries += 1
+        if (counters := UPDATE_COUNTERS.get()) is not None:
+            counters.db_queries += 1
+
+    def count_api_call(self, method: str) -> None:
+        """
+        Method, that counts Telegram API call.
+
+        :param method: name of Bot API method
+        """
+
+        self.api_calls[method] = self.api_calls.get(method, 0) + 1
+        if (counters := UPDATE_COUNTERS.get()) is not None:
+            counters.api_calls += 1
+
+    def render(self) -> str:
+        """
+        Method, that renders metrics in Prometheus text exposition format.
+
+        Histograms are accompanied with ``*_quantile`` gauges for p50, p95 and p99.
+
+        :return: metrics text
+        """
+
+        lines: list[str] = []
+        self._render_histograms(
+            lines,
+            "bot_update_duration_seconds",
+            "Time spent on update, including middlewares",
+            {(k,): v for k, v in self.updates.items()},
+            ("event",),
+        )
+        self._render_histograms(
+            lines,
+            "bot_handler_duration_seconds",
+            "Time spent in handler",
+            self.handlers,
+            ("event", "handler"),
+        )
+        self._render_histograms(
+            lines,
+            "bot_update_db_queries",
+            "DB queries per update",
+            {(k,): v for k, v in self.db_per_update.items()},
+            ("event",),
+        )
+        self._render_histograms(
+            lines,
+            "bot_update_api_calls",
+            "Telegram API calls per update",
+            {(k,): v for k, v in self.api_per_update.items()},
+            ("event",),
+        )
+
+        lines.append("# HELP bot_db_queries_total Executed DB queries")
+        lines.append("# TYPE bot_db_queries_total counter")
+        lines.append(f"bot_db_queries_total {self.db_queries}")
+        lines.append("# HELP bot_api_calls_total Telegram API calls")
+        lines.append("# TYPE bot_api_calls_total counter")
+        for method, count in sorted(self.api_calls.items()):
+            lines.append(f'bot_api_calls_total{{method="{method}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram(
+        histograms: dict[Any, Histogram], key: Any, buckets: tuple[float, ...]
+    ) -> Histogram:
+        """
+        Method, that returns histogram by key and creates it on the first call.
+
+        :param histograms: dictionary of histograms
+        :param key: key of histogram
+        :param buckets: buckets of new histogram
+        :return: histogram
+        """
+
+        if (histogram := histograms.get(key)) is None:
+            histogram = histograms[key] = Histogram(buckets)
+        return histogram
+
+    @staticmethod
+    def _render_histograms(
+        lines: list[str],
+        name: str,
+        description: str,
+        histograms: dict[tuple[str, ...], Histogram],
+        label_names: tuple[str, ...],
+    ) -> None:
+        """
+        Method, that renders family of histograms.
+
+        :param lines: list, where lines are appended
+        :param name: metric name
+        :param description: metric help string
+        :param histograms: dictionary of label values and histograms
+        :param label_names: names of labels
+        """
+
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} histogram")
+        quantiles = []
+        for label_values, histogram in sorted(histograms.items()):
+            labels = ",".join(
+                f'{label}="{value}"' for label, value in zip(label_names, label_values)
+            )
+            cumulative = 0
+            for bound, count in zip(
+                (*histogram.buckets, "+Inf"), histogram.counts, strict=True
+            ):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+            for q in (0.5, 0.95, 0.99):
+                quantiles.append(
+                    f'{name}_quantile{{{labels},quantile="{q}"}} '
+                    f"{histogram.quantile(q)}"
+                )
+
+        lines.append(f"# HELP {name}_quantile Estimated quantiles of {name}")
+        lines.append(f"# TYPE {name}_quantile gauge")
+        lines.extend(quantiles)
+
+
+class ApiCallsCounter(BaseRequestMiddleware):
+    """Request middleware-class, that counts outbound Telegram API calls."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        """
+        Overrided function ``__call__`` from parent class.
+
+        :param make_request: next request maker in middlewares chain
+        :param bot: instance of ``aiogram.Bot``
+        :param method: outbound Telegram method
+        :return: Telegram response
+        """
+
+        METRICS.count_api_call(method.__api_method__)
+        return await make_request(bot, method)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Function, that counts queries, executed by engine.
+
+    :param engine: ``sqlalchemy.ext.asyncio.AsyncEngine`` instance
+    """
+
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda *_: METRICS.count_db_query(),
+    )
+
+
+# Metrics registry instance
+METRICS: Metrics = Metrics()
@@ -0,0 +1,131 @@
+"""
+Module for compact representation of users' theme progress.
+
+Progress of user is a single ``int`` bitset with two bits per theme id: bits ``2 * theme_id`` and ``2 * theme_id + 1``
+hold ``ThemeProgress`` value of the theme. Bitsets of recently active users are kept in ``PROGRESS_CACHE``, so page
+flips in sections don't query ``user_theme_progress`` table.
+"""
+
+from collections import OrderedDict
+from typing import Iterable
+
+from database.models import ThemeProgress
+
+# Bits per theme in progress bitset
+BITS_PER_THEME: int = 2
+# Mask of one theme state
+STATE_MASK: int = (1 << BITS_PER_THEME) - 1
+
+
+def pack_progress(progress: dict[int, ThemeProgress]) -> int:
+    """
+    Function, that packs progress of user into bitset.
+
+    :param progress: dictionary of theme ids and their states
+    :return: progress bitset
+    """
+
+    bits = 0
+    for theme_id, state in progress.items():
+        bits |= int(state) << (theme_id * BITS_PER_THEME)
+    return bits
+
+
+def theme_state(bits: int, theme_id: int) -> ThemeProgress:
+    """
+    Function, that reads state of theme from progress bitset.
+
+    :param bits: progress bitset
+    :param theme_id: integer theme's id in ``themes`` table
+    :return: state of theme
+    """
+
+    return ThemeProgress((bits >> (theme_id * BITS_PER_THEME)) & STATE_MASK)
+
+
+def raise_state(bits: int, theme_id: int, state: ThemeProgress) -> int:
+    """
+    Function, that sets state of theme in progress bitset, if it is higher than the current one.
+
+    :param bits: progress bitset
+    :param theme_id: integer theme's id in ``themes`` table
+    :param state: new state of theme
+    :return: updated progress bitset
+    """
+
+    if state <= theme_state(bits, theme_id):
+        return bits
+    shift = theme_id * BITS_PER_THEME
+    return bits & ~(STATE_MASK << shift) | (int(state) << shift)
+
+
+def page_bits(bits: int, theme_ids: Iterable[int]) -> int:
+    """
+    Function, that extracts states of specified themes into a dense bitset.
+
+    Result depends only on themes of one page, so it can be used as a key of page cache, shared by all users.
+
+    :param bits: progress bitset
+    :param theme_ids: ids of themes in order of their buttons
+    :return: bitset with state of i-th theme in bits ``2 * i`` and ``2 * i + 1``
+    """
+
+    result = 0
+    for i, theme_id in enumerate(theme_ids):
+        result |= theme_state(bits, theme_id) << (i * BITS_PER_THEME)
+    return result
+
+
+class ProgressCache:
+    """LRU cache of progress bitsets by user id."""
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        """
+        Creates empty cache.
+
+        :param maxsize: maximum number of users in cache, least recently used are evicted
+        """
+
+        self.maxsize = maxsize
+        self._bits: OrderedDict[int, int] = OrderedDict()
+
+    def get(self, user_id: int) -> int | None:
+        """
+        Method, that returns cached progress bitset of user.
+
+        :param user_id: identifier of user in ``users`` table
+        :return: progress bitset, ``None`` if user is not cached
+        """
+
+        if (bits := self._bits.get(user_id)) is not None:
+            self._bits.move_to_end(user_id)
+        return bits
+
+    def put(self, user_id: int, bits: int) -> None:
+        """
+        Method, that caches progress bitset of user.
+
+        :param user_id: identifier of user in ``users`` table
+        :param bits: progress bitset
+        """
+
+        self._bits[user_id] = bits
+        self._bits.move_to_end(user_id)
+        if len(self._bits) > self.maxsize:
+            self._bits.popitem(last=False)
+
+    def raise_state(self, user_id: int, theme_id: int, state: ThemeProgress) -> None:
+        """
+        Method, that applies progress transition to cached bitset. Users, which are not cached, are skipped.
+
+        :param user_id: identifier of user in ``users`` table
+        :param theme_id: integer theme's id in ``themes`` table
+        :param state: state of theme, saved in DB
+        """
+
+        if (bits := self._bits.get(user_id)) is not None:
+            self._bits[user_id] = raise_state(bits, theme_id, state)
+
+
+# Cache instance, filled by ``get_themes_progress`` and updated by ``update_themes_progress``
+PROGRESS_CACHE: ProgressCache = ProgressCache()
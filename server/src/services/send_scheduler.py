@@ -0,0 +1,401 @@
+"""
+Module for the outbound Telegram requests scheduler.
+
+Every request, which targets a chat (has ``chat_id``), waits for a token from the global bucket. Requests, which post
+new messages (``send*``, ``copy*``, ``forward*``), also wait for a token from the bucket of their chat, edits and
+deletes are not limited per chat. Waiting requests are queued by priority, so questions and polls go ahead of changelogs
+and alerts. ``TelegramRetryAfter`` puts the chat on backoff and the request is retried. Requests to a chat, which is
+limited or on backoff, are parked aside until the chat can be sent to again, so they are not looked at on every turn.
+
+Requests without ``chat_id`` (``answerCallbackQuery``, ``setWebhook``, etc.) are not limited.
+"""
+
+import asyncio
+import heapq
+import itertools
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from time import monotonic
+from typing import Any, Iterator
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import TelegramMethod, Response
+from aiogram.methods.base import TelegramType
+
+from config import SEND_GLOBAL_RATE, SEND_CHAT_RATE, SEND_CHAT_BURST, SEND_MAX_RETRIES
+from enums.logs import Logs
+from loggers.setup import LOGGER
+
+
+class Priority(IntEnum):
+    """Enum class with priorities of outbound requests. Lower value goes first."""
+
+    # Questions, polls and answer results
+    HIGH = 0
+    # Everything else
+    NORMAL = 1
+    # Changelogs and /heal alerts
+    LOW = 2
+
+
+# Prefixes of Telegram methods, which are limited by the bucket of target chat
+CHAT_LIMITED_METHODS: tuple[str, ...] = ("send", "copy", "forward")
+
+# Priority of requests, made in current context
+SEND_PRIORITY: ContextVar[Priority] = ContextVar(
+    "send_priority", default=Priority.NORMAL
+)
+
+
+@contextmanager
+def send_priority(priority: Priority) -> Iterator[None]:
+    """
+    Context manager, that sets priority for requests, made inside it.
+
+    :param priority: priority of requests
+    """
+
+    token = SEND_PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        SEND_PRIORITY.reset(token)
+
+
+class TokenBucket:
+    """Token bucket with continuous refill."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        """
+        Creates full bucket.
+
+        :param rate: tokens per second
+        :param capacity: maximum number of tokens (burst size)
+        :param now: current ``time.monotonic`` value
+        """
+
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """
+        Method, that refills the bucket and returns time before the next token is available.
+
+        :param now: current ``time.monotonic`` value
+        :return: seconds to wait, ``0`` if token is available
+        """
+
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        """Method, that takes one token. Must be called after ``delay`` returned ``0``."""
+
+        self.tokens -= 1
+
+
+class SendScheduler(BaseRequestMiddleware):
+    """Request middleware-class, that schedules outbound requests with global and per-chat rate limits."""
+
+    # Idle chat buckets are dropped, when there are more of them than this limit
+    PRUNE_THRESHOLD: int = 10_000
+
+    def __init__(
+        self,
+        global_rate: float = SEND_GLOBAL_RATE,
+        chat_rate: float = SEND_CHAT_RATE,
+        chat_burst: float = SEND_CHAT_BURST,
+        max_retries: int = SEND_MAX_RETRIES,
+    ) -> None:
+        """
+        Creates scheduler. Dispatcher loop is started with the first limited request.
+
+        :param global_rate: requests per second for the whole bot
+        :param chat_rate: requests per second for one chat
+        :param chat_burst: number of requests, which can be sent to one chat at once
+        :param max_retries: how many times request is retried after ``TelegramRetryAfter``
+        """
+
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+
+        self._global = TokenBucket(global_rate, global_rate, monotonic())
+        self._chats: dict[int | str, TokenBucket] = {}
+        self._backoff: dict[int | str, float] = {}
+        # Heap of (priority, sequence number, chat_id, whether chat bucket is used, future)
+        self._queue: list[tuple[int, int, int | str, bool, asyncio.Future]] = []
+        # Parked requests of limited chats, only the first of them is queued or waits in the heap of
+        # (time, when chat can be sent to, chat_id)
+        self._parked: dict[int | str, deque[tuple]] = {}
+        self._refills: list[tuple[float, int | str]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+        # Metrics
+        self._depth: list[int] = [0] * len(Priority)
+        self._sent: list[int] = [0] * len(Priority)
+        self._wait_total: list[float] = [0.0] * len(Priority)
+        self._wait_max: list[float] = [0.0] * len(Priority)
+        self._retries: int = 0
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        """
+        Overrided function ``__call__`` from parent class.
+
+        Waits for the turn of request and retries it on ``TelegramRetryAfter``.
+
+        :param make_request: next request maker in middlewares chain
+        :param bot: instance of ``aiogram.Bot``
+        :param method: outbound Telegram method
+        :return: Telegram response
+        """
+
+        if (chat_id := getattr(method, "chat_id", None)) is None:
+            return await make_request(bot, method)
+
+        priority = SEND_PRIORITY.get()
+        chat_limited = method.__api_method__.startswith(CHAT_LIMITED_METHODS)
+        for attempt in itertools.count():
+            await self._acquire(chat_id, priority, chat_limited)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                self._backoff[chat_id] = monotonic() + e.retry_after
+                self._retries += 1
+                LOGGER.warning(Logs.SEND_RETRY_AFTER, chat_id, e.retry_after)
+                if attempt >= self.max_retries:
+                    raise
+
+    def set_global_rate(self, global_rate: float) -> None:
+        """
+        Method, that changes global rate limit, e.g. when the limit of the bot is split between worker processes.
+
+        :param global_rate: requests per second for the whole bot
+        """
+
+        self._global = TokenBucket(global_rate, global_rate, monotonic())
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Method, that returns scheduler metrics.
+
+        :return: dictionary with queue depth, sent requests and wait time in seconds by priority
+        """
+
+        return {
+            "queue_depth": sum(self._depth),
+            "retry_after": self._retries,
+            "chats_on_backoff": len(self._backoff),
+            "chats_parked": len(self._parked),
+            "priorities": {
+                priority.name.lower(): {
+                    "queue_depth": self._depth[priority],
+                    "sent": self._sent[priority],
+                    "wait_avg": (
+                        self._wait_total[priority] / self._sent[priority]
+                        if self._sent[priority]
+                        else 0.0
+                    ),
+                    "wait_max": self._wait_max[priority],
+                }
+                for priority in Priority
+            },
+        }
+
+    async def _acquire(
+        self, chat_id: int | str, priority: Priority, chat_limited: bool
+    ) -> None:
+        """
+        Method, that puts request into the queue and waits until dispatcher loop lets it go.
+
+        :param chat_id: target chat of request
+        :param priority: priority of request
+        :param chat_limited: flag, whether request takes a token from the bucket of its chat
+        """
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._queue, (priority, next(self._seq), chat_id, chat_limited, future)
+        )
+        self._depth[priority] += 1
+        self._wakeup.set()
+
+        enqueued = monotonic()
+        # If caller is cancelled, future is cancelled too and dispatcher loop drops it
+        await future
+
+        waited = monotonic() - enqueued
+        self._sent[priority] += 1
+        self._wait_total[priority] += waited
+        self._wait_max[priority] = max(self._wait_max[priority], waited)
+
+    def _chat_delay(self, chat_id: int | str, chat_limited: bool, now: float) -> float:
+        """
+        Method, that returns time before request to specified chat can be sent.
+
+        :param chat_id: target chat
+        :param chat_limited: flag, whether request takes a token from the bucket of its chat
+        :param now: current ``time.monotonic`` value
+        :return: seconds to wait, ``0`` if request can be sent
+        """
+
+        if (until := self._backoff.get(chat_id)) is not None:
+            if until > now:
+                return until - now
+            del self._backoff[chat_id]
+
+        if not chat_limited:
+            return 0.0
+
+        if (bucket := self._chats.get(chat_id)) is None:
+            bucket = self._chats[chat_id] = TokenBucket(
+                self.chat_rate, self.chat_burst, now
+            )
+        return bucket.delay(now)
+
+    def _park(self, entry: tuple, ready_at: float) -> None:
+        """
+        Method, that parks queued request of limited chat until the chat can be sent to.
+
+        :param entry: queue entry of request
+        :param ready_at: ``time.monotonic`` value, when chat can be sent to
+        """
+
+        if (parked := self._parked.get(chat_id := entry[2])) is None:
+            parked = self._parked[chat_id] = deque()
+            heapq.heappush(self._refills, (ready_at, chat_id))
+        parked.append(entry)
+
+    def _unpark(self, now: float) -> None:
+        """
+        Method, that puts first parked requests of chats, which can be sent to again, back into the queue.
+
+        :param now: current ``time.monotonic`` value
+        """
+
+        while self._refills and self._refills[0][0] <= now:
+            _, chat_id = heapq.heappop(self._refills)
+            heapq.heappush(self._queue, self._parked[chat_id][0])
+
+    def _advance(self, chat_id: int | str) -> None:
+        """
+        Method, that drops first parked request of chat and puts the next one into the queue.
+
+        :param chat_id: target chat
+        """
+
+        parked = self._parked[chat_id]
+        parked.popleft()
+        if parked:
+            heapq.heappush(self._queue, parked[0])
+        else:
+            del self._parked[chat_id]
+
+    def _dispatch(self, now: float) -> float | None:
+        """
+        Method, that releases queued requests in priority order while there are tokens.
+
+        Requests to chats, which are limited or on backoff, are parked, so they don't block other chats. Only the first
+        parked request of chat is looked at again, when its chat can be sent to.
+
+        :param now: current ``time.monotonic`` value
+        :return: seconds before the next request can be released, ``None`` if nothing is queued
+        """
+
+        self._unpark(now)
+
+        next_delay = None
+        while self._queue:
+            if (global_delay := self._global.delay(now)) > 0:
+                next_delay = global_delay
+                break
+
+            entry = heapq.heappop(self._queue)
+            priority, _, chat_id, chat_limited, future = entry
+            parked = self._parked.get(chat_id)
+            is_head = parked is not None and parked[0] is entry
+
+            # Requests, queued after the chat was parked, wait behind parked ones
+            if chat_limited and parked is not None and not is_head:
+                parked.append(entry)
+                continue
+            if future.done():
+                self._depth[priority] -= 1
+                if is_head:
+                    self._advance(chat_id)
+                continue
+            if (chat_delay := self._chat_delay(chat_id, chat_limited, now)) > 0:
+                if is_head:
+                    heapq.heappush(self._refills, (now + chat_delay, chat_id))
+                else:
+                    self._park(entry, now + chat_delay)
+                continue
+
+            self._global.take()
+            if chat_limited:
+                self._chats[chat_id].take()
+            self._depth[priority] -= 1
+            future.set_result(None)
+            if is_head:
+                self._advance(chat_id)
+
+        if self._refills:
+            refill_delay = self._refills[0][0] - now
+            next_delay = (
+                refill_delay if next_delay is None else min(next_delay, refill_delay)
+            )
+
+        if len(self._chats) > self.PRUNE_THRESHOLD:
+            self._prune(now)
+        return next_delay
+
+    def _prune(self, now: float) -> None:
+        """
+        Method, that drops buckets of chats, which are full again.
+
+        :param now: current ``time.monotonic`` value
+        """
+
+        for chat_id in [
+            chat_id
+            for chat_id, bucket in self._chats.items()
+            if bucket.delay(now) == 0 and bucket.tokens >= bucket.capacity
+        ]:
+            del self._chats[chat_id]
+
+    async def _run(self) -> None:
+        """Dispatcher loop. Sleeps until tokens are refilled or new request is queued."""
+
+        while True:
+            self._wakeup.clear()
+            timeout = self._dispatch(monotonic())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+
+
+# Scheduler instance, registered as request middleware of ``aiogram.Bot``
+SEND_SCHEDULER: SendScheduler = SendScheduler()
@@ -0,0 +1,68 @@
+"""
+Module for sharding of updates between worker processes.
+
+Every update belongs to a shard by the id of its user, so all updates of one user are handled by the same worker, and
+per-user state (exam timers, progress cache, per-chat rate limits) stays inside one process.
+"""
+
+from typing import Any
+
+
+class Shard:
+    """Index of current worker process and total number of workers."""
+
+    __slots__ = ("index", "count")
+
+    def __init__(self, index: int = 0, count: int = 1) -> None:
+        """
+        Creates shard. Single-process mode is shard ``0`` of ``1``.
+
+        :param index: index of current worker
+        :param count: number of workers
+        """
+
+        self.index = index
+        self.count = count
+
+    def owns(self, user_id: int | str) -> bool:
+        """
+        Method, that checks if user belongs to current worker.
+
+        :param user_id: Telegram id of user
+        :return: ``True`` if updates of user are handled by current worker
+        """
+
+        return shard_of(user_id, self.count) == self.index
+
+
+# Shard of current process, set by worker on start
+CURRENT_SHARD: Shard = Shard()
+
+
+def shard_of(user_id: int | str | None, count: int) -> int:
+    """
+    Function, that returns index of worker, which handles updates of user.
+
+    :param user_id: Telegram id of user, updates without user go to the first worker
+    :param count: number of workers
+    :return: index of worker
+    """
+
+    return int(user_id) % count if user_id is not None else 0
+
+
+def update_user_id(update: dict[str, Any]) -> int | None:
+    """
+    Function, that extracts id of user from raw update.
+
+    :param update: update as it came from Bot API
+    :return: id of user (``from`` or ``user`` field), id of chat if there is no user, ``None`` if there is neither
+    """
+
+    for key, event in update.items():
+        if key == "update_id" or not isinstance(event, dict):
+            continue
+        for field in ("from", "user", "chat"):
+            if isinstance(value := event.get(field), dict) and "id" in value:
+                return value["id"]
+    return None
@@ -0,0 +1,156 @@
+"""
+Module for the exam timer service.
+
+One scheduler loop with a heap of deadlines replaces a sleeping ``asyncio.Task`` per exam. Deadlines themselves are
+persisted in ``sessions.exam_deadline``, so timers are rebuilt from DB after restart.
+"""
+
+import asyncio
+import heapq
+from datetime import datetime
+from time import time
+from typing import Awaitable, Callable
+
+from enums.logs import Logs
+from loggers.setup import LOGGER
+
+
+class ExamTimerService:
+    """Heap-based scheduler, which fires expired exam timers in batches."""
+
+    def __init__(self, batch_size: int = 100) -> None:
+        """
+        Creates stopped timer service.
+
+        :param batch_size: maximum number of timers passed to ``on_expire`` callback at once
+        """
+
+        self.batch_size = batch_size
+        # Heap of (deadline timestamp, telegram_id), may contain outdated entries
+        self._heap: list[tuple[float, str]] = []
+        # Actual deadline for each telegram_id
+        self._deadlines: dict[str, float] = {}
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._on_expire: Callable[[list[str]], Awaitable[None]] | None = None
+
+    def __contains__(self, telegram_id: str) -> bool:
+        """
+        Checks if there is a running timer for specified user.
+
+        :param telegram_id: string with user's unique Telegram id
+        :return: ``True`` if timer exists
+        """
+
+        return telegram_id in self._deadlines
+
+    def __len__(self) -> int:
+        """
+        Returns number of running timers.
+
+        :return: number of timers
+        """
+
+        return len(self._deadlines)
+
+    def schedule(self, telegram_id: str, deadline: datetime) -> None:
+        """
+        Method, that starts (or restarts) timer for specified user.
+
+        :param telegram_id: string with user's unique Telegram id
+        :param deadline: timezone-aware time, when exam must be stopped
+        """
+
+        timestamp = deadline.timestamp()
+        self._deadlines[telegram_id] = timestamp
+        heapq.heappush(self._heap, (timestamp, telegram_id))
+        if self._heap[0][1] == telegram_id:
+            # New deadline is the nearest one, scheduler loop must recalculate its sleep
+            self._wakeup.set()
+
+    def cancel(self, telegram_id: str) -> bool:
+        """
+        Method, that stops timer for specified user. Heap entry is left in place and skipped when popped.
+
+        :param telegram_id: string with user's unique Telegram id
+        :return: ``True`` if timer existed
+        """
+
+        return self._deadlines.pop(telegram_id, None) is not None
+
+    def remaining(self, telegram_id: str) -> float | None:
+        """
+        Method, that returns time left before the end of exam.
+
+        :param telegram_id: string with user's unique Telegram id
+        :return: seconds left or ``None`` if there is no timer for this user
+        """
+
+        if (deadline := self._deadlines.get(telegram_id)) is None:
+            return None
+        return deadline - time()
+
+    def start(self, on_expire: Callable[[list[str]], Awaitable[None]]) -> None:
+        """
+        Method, that starts the scheduler loop.
+
+        :param on_expire: coroutine function, which finalizes a batch of expired exams by telegram ids
+        """
+
+        self._on_expire = on_expire
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Method, that stops the scheduler loop. Deadlines stay in DB and are restored on next start."""
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _pop_expired(self, now: float) -> list[str]:
+        """
+        Method, that pops all expired timers from the heap.
+
+        :param now: current timestamp
+        :return: list of telegram ids with expired timers
+        """
+
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, telegram_id = heapq.heappop(self._heap)
+            # Skip cancelled and rescheduled timers
+            if self._deadlines.get(telegram_id) == deadline:
+                del self._deadlines[telegram_id]
+                expired.append(telegram_id)
+        return expired
+
+    async def _run(self) -> None:
+        """Scheduler loop. Sleeps until the nearest deadline or until a nearer one is scheduled."""
+
+        while True:
+            self._wakeup.clear()
+
+            expired = self._pop_expired(time())
+            for i in range(0, len(expired), self.batch_size):
+                batch = expired[i : i + self.batch_size]
+                try:
+                    await self._on_expire(batch)
+                except Exception as e:
+                    LOGGER.error(Logs.EXAM_TIMERS_FAILED, len(batch), e)
+
+            timeout = self._heap[0][0] - time() if self._heap else None
+            if timeout is not None and timeout <= 0:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+
+
+# Timer service instance shared by the whole application
+EXAM_TIMERS: ExamTimerService = ExamTimerService()
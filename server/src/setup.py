@@ -6,10 +6,13 @@ Creates :code:`aiogram.Dispatcher` and :code:`aiogram.Bot` instances and registe
 
 from aiogram import Dispatcher, Bot
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer, PRODUCTION
 from aiogram.enums import ParseMode
 from aiogram.filters import CommandStart, Command
 
-from config import TG_TOKEN as TOKEN
+from catalog.storage import load_catalog
+from config import TG_TOKEN as TOKEN, TG_API_SERVER
 from enums.strings import SlashCommands
 from handlers.buttons_handler import (
     pet_me_button_pressed,
@@ -24,13 +27,22 @@ from handlers.commands_handler import (
     command_exam_handler,
     command_restart_handler,
 )
-from handlers.exam_handler import exam
+from handlers.exam_handler import exam, start_exam_timers, stop_exam_timers
 from handlers.poll_handler import on_poll_answer
 from handlers.quiz_handler import quiz, hint_requested
 from handlers.utility_handlers import delete_msg_handler
 from middlewares.auth_middleware import AuthMiddleware
+from middlewares.context_middleware import ContextMiddleware
+from middlewares.lane_middleware import LaneMiddleware
 from middlewares.log_middleware import LoggingMiddleware
+from middlewares.metrics_middleware import (
+    UpdateMetricsMiddleware,
+    HandlerMetricsMiddleware,
+)
 from middlewares.update_middleware import ChangelogSeenMiddleware
+from repositories.current import REPOSITORY
+from services.metrics_service import ApiCallsCounter
+from services.send_scheduler import SEND_SCHEDULER
 
 
 def setup() -> tuple[Dispatcher, Bot]:
@@ -42,7 +54,26 @@ def setup() -> tuple[Dispatcher, Bot]:
     """
 
     dp: Dispatcher = Dispatcher()
-    bot: Bot = Bot(token=TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+    # Bot API server can be replaced, e.g. with fake server for load tests
+    api = TelegramAPIServer.from_base(TG_API_SERVER) if TG_API_SERVER else PRODUCTION
+    bot: Bot = Bot(
+        token=TOKEN,
+        session=AiohttpSession(api=api),
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
+    # Every outbound request goes through rate limits and priority queue
+    bot.session.middleware(SEND_SCHEDULER)
+    # Count API calls for ``/metrics``, DB queries are counted by storage
+    bot.session.middleware(ApiCallsCounter())
+
+    # Prepare storage before handling any update (e.g. open DB connections), see ``repositories``
+    dp.startup.register(REPOSITORY.start)
+    # Load read-only question bank into RAM before handling any update
+    dp.startup.register(load_catalog)
+    # Restore exam timers from DB and start the scheduler
+    dp.startup.register(start_exam_timers)
+    dp.shutdown.register(stop_exam_timers)
+    dp.shutdown.register(REPOSITORY.close)
 
     register_handlers(dp)
 
@@ -57,10 +88,17 @@ def register_handlers(dp: Dispatcher) -> None:
     """
 
     # Register middlewares
+    # Update metrics wrap everything, including loading of context
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    # Updates of one user are handled one by one, before context is loaded
+    dp.update.outer_middleware(LaneMiddleware())
+    # ContextMiddleware goes first, others rely on the context it loads
     for handler in [dp.message, dp.callback_query, dp.poll_answer]:
+        handler.outer_middleware(ContextMiddleware())
         handler.outer_middleware(LoggingMiddleware())
         handler.outer_middleware(AuthMiddleware())
         handler.outer_middleware(ChangelogSeenMiddleware())
+        handler.middleware(HandlerMetricsMiddleware(handler.event_name))
 
     # Register handlers
     dp.message.register(command_start_handler, CommandStart())
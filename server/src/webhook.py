@@ -0,0 +1,274 @@
+"""
+Module for webhook requests handling.
+
+Webhook request is acknowledged as soon as update is queued, so Telegram never waits for middlewares and handlers.
+Queued updates are handled by a fixed number of background tasks. Only one update of each user is handed to the tasks
+at once, the next ones wait in the queue of the user, so updates of one user never occupy several tasks waiting for
+the lane of the user (see ``services.lanes``). When queue is full, request waits for free place for a while
+(backpressure) and then is rejected with ``503``, so Telegram redelivers update later (load shedding). Updates, which
+are already acknowledged (forwarded by another worker or fetched with ``getUpdates``), go through the same queues, but
+wait for free place as long as needed. On shutdown new updates are rejected and queued and running ones are handled
+before connections are closed.
+"""
+
+import asyncio
+from collections import deque
+from time import monotonic
+from typing import Any
+
+from aiogram import Bot
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler
+from aiohttp import web
+
+from config import (
+    WEBHOOK_CONCURRENCY,
+    WEBHOOK_QUEUE_SIZE,
+    WEBHOOK_QUEUE_TIMEOUT,
+    WEBHOOK_DRAIN_TIMEOUT,
+)
+from enums.logs import Logs
+from loggers.setup import LOGGER
+from services.sharding import CURRENT_SHARD, update_user_id
+
+
+class BoundedRequestHandler(SimpleRequestHandler):
+    """Webhook handler-class extended from ``SimpleRequestHandler``, which handles updates with bounded task pool."""
+
+    def __init__(
+        self,
+        concurrency: int = WEBHOOK_CONCURRENCY,
+        queue_size: int = WEBHOOK_QUEUE_SIZE,
+        queue_timeout: float = WEBHOOK_QUEUE_TIMEOUT,
+        drain_timeout: float = WEBHOOK_DRAIN_TIMEOUT,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Creates handler. Pool tasks are started with the first update.
+
+        :param concurrency: number of updates, handled at once
+        :param queue_size: number of updates, which wait for a free task or for previous update of the same user
+        :param queue_timeout: seconds to wait for free place in full queue before update is rejected
+        :param drain_timeout: seconds to handle queued and running updates on shutdown
+        :param kwargs: arguments of ``SimpleRequestHandler``
+        """
+
+        super().__init__(handle_in_background=True, **kwargs)
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.drain_timeout = drain_timeout
+
+        # Updates, which can be handled right away, with ids of their users
+        self._queue: asyncio.Queue[tuple[int | None, dict[str, Any]]] = asyncio.Queue()
+        # Queues of users, whose update is in ``_queue`` or is running, with their next updates
+        self._users: dict[int, deque[dict[str, Any]]] = {}
+        # Free places for updates, which are accepted and are not running yet
+        self._places = asyncio.Semaphore(queue_size)
+        self._pool: list[asyncio.Task] = []
+        self._closing = False
+
+        # Metrics
+        self._queued: int = 0
+        self._accepted: int = 0
+        self._rejected: int = 0
+        self._running: int = 0
+        self._backpressure_total: float = 0.0
+        self._backpressure_max: float = 0.0
+
+    def register(self, app: web.Application, /, path: str, **kwargs: Any) -> None:
+        """
+        Overrided function ``register`` from parent class.
+
+        Also registers ``/stats/webhook`` route.
+
+        :param app: ``aiohttp.web.Application`` instance
+        :param path: path of webhook route
+        :param kwargs: arguments of route
+        """
+
+        super().register(app, path=path, **kwargs)
+        app.router.add_get("/stats/webhook", self._stats)
+
+    async def _handle_request_background(
+        self, bot: Bot, request: web.Request
+    ) -> web.Response:
+        """
+        Overrided function ``_handle_request_background`` from parent class.
+
+        :param bot: instance of ``aiogram.Bot``
+        :param request: incoming webhook request
+        :return: empty JSON response if update is queued, ``503`` response if it is rejected
+        """
+
+        return await self._enqueue(
+            bot, await request.json(loads=bot.session.json_loads)
+        )
+
+    async def _enqueue(self, bot: Bot, update: dict[str, Any]) -> web.Response:
+        """
+        Method, that queues update, waiting for free place if queue is full.
+
+        :param bot: instance of ``aiogram.Bot``
+        :param update: raw update
+        :return: empty JSON response if update is queued, ``503`` response if it is rejected
+        """
+
+        if self._closing:
+            return web.Response(status=503)
+
+        self._start_pool(bot)
+        if self._places.locked():
+            start = monotonic()
+            try:
+                await asyncio.wait_for(self._places.acquire(), self.queue_timeout)
+            except TimeoutError:
+                self._rejected += 1
+                LOGGER.warning(Logs.WEBHOOK_REJECTED, update.get("update_id"))
+                return web.Response(status=503)
+            finally:
+                waited = monotonic() - start
+                self._backpressure_total += waited
+                self._backpressure_max = max(self._backpressure_max, waited)
+        else:
+            await self._places.acquire()
+
+        self._put(update_user_id(update), update)
+        self._queued += 1
+        self._accepted += 1
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+    async def feed(self, bot: Bot, update: dict[str, Any]) -> None:
+        """
+        Method, that queues update, which is already acknowledged, waiting for free place as long as needed.
+
+        Such update can't be redelivered by Telegram, so it is never rejected.
+
+        :param bot: instance of ``aiogram.Bot``
+        :param update: raw update
+        """
+
+        self._start_pool(bot)
+        await self._places.acquire()
+        self._put(update_user_id(update), update)
+        self._queued += 1
+        self._accepted += 1
+
+    def _start_pool(self, bot: Bot) -> None:
+        """
+        Method, that starts pool tasks, if they are not started yet.
+
+        :param bot: instance of ``aiogram.Bot``
+        """
+
+        if not self._pool:
+            self._pool = [
+                asyncio.create_task(self._work(bot)) for _ in range(self.concurrency)
+            ]
+
+    def _put(self, user_id: int | None, update: dict[str, Any]) -> None:
+        """
+        Method, that hands update to the pool or puts it into the queue of its user, if previous update of the user is
+        not handled yet.
+
+        :param user_id: id of user, ``None`` for updates without user, they are handed to the pool right away
+        :param update: raw update
+        """
+
+        if user_id is None:
+            self._queue.put_nowait((None, update))
+        elif (waiting := self._users.get(user_id)) is not None:
+            waiting.append(update)
+        else:
+            self._users[user_id] = deque()
+            self._queue.put_nowait((user_id, update))
+
+    def _next(self, user_id: int | None) -> None:
+        """
+        Method, that hands the next update of user to the pool, when previous one is handled.
+
+        :param user_id: id of user, ``None`` for updates without user
+        """
+
+        if user_id is None:
+            return
+        if waiting := self._users[user_id]:
+            self._queue.put_nowait((user_id, waiting.popleft()))
+        else:
+            del self._users[user_id]
+
+    async def _work(self, bot: Bot) -> None:
+        """
+        Pool task. Handles queued updates one by one until cancelled.
+
+        :param bot: instance of ``aiogram.Bot``
+        """
+
+        while True:
+            user_id, update = await self._queue.get()
+            self._queued -= 1
+            self._places.release()
+            self._running += 1
+            try:
+                await self._background_feed_update(bot=bot, update=update)
+            except Exception:  # noqa
+                # Errors are already logged by dispatcher
+                pass
+            finally:
+                self._running -= 1
+                # Next update is queued before this one is done, so ``close`` waits for it too
+                self._next(user_id)
+                self._queue.task_done()
+
+    async def close(self) -> None:
+        """
+        Overrided function ``close`` from parent class.
+
+        Drains queue, then closes bot session.
+        """
+
+        await self.drain()
+        await super().close()
+
+    async def drain(self) -> None:
+        """Method, that rejects new updates and waits for queued and running ones, then stops pool."""
+
+        self._closing = True
+        start = monotonic()
+        try:
+            await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+            LOGGER.info(Logs.WEBHOOK_DRAINED, monotonic() - start)
+        except TimeoutError:
+            LOGGER.error(Logs.WEBHOOK_DRAIN_TIMEOUT, self._queued + self._running)
+        for task in self._pool:
+            task.cancel()
+        await asyncio.gather(*self._pool, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Method, that returns handler metrics.
+
+        :return: dictionary with queue depth, users with queued or running updates, running updates, accepted and
+            rejected updates and backpressure time
+        """
+
+        return {
+            "queue_depth": self._queued,
+            "queue_size": self.queue_size,
+            "users": len(self._users),
+            "running": self._running,
+            "concurrency": self.concurrency,
+            "accepted": self._accepted,
+            "rejected": self._rejected,
+            "backpressure_total": self._backpressure_total,
+            "backpressure_max": self._backpressure_max,
+        }
+
+    async def _stats(self, _request: web.Request) -> web.Response:
+        """
+        Handler for ``/stats/webhook`` route.
+
+        :param _request: incoming HTTP request
+        :return: JSON response with handler metrics
+        """
+
+        return web.json_response({"worker": CURRENT_SHARD.index, **self.stats()})
@@ -0,0 +1,274 @@
+"""
+Module for multi-process mode.
+
+``--workers N`` starts N worker processes, each with its own event loop, ``aiogram.Dispatcher``, DB pool and caches.
+Update goes to the worker chosen by the id of its user (see ``services.sharding``), so updates of one user are always
+handled by one process in order of arrival.
+
+Webhook mode: workers share the port (``SO_REUSEPORT``). Worker, which received update of another shard, forwards it to
+the owner through the owner's inbox queue.
+
+Polling mode: main process fetches updates with ``getUpdates`` and puts them into inboxes of workers.
+
+Updates from inbox are handled by ``BoundedRequestHandler`` of the worker, like updates, received by its webhook.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+from multiprocessing.queues import Queue
+from typing import Any
+
+from aiogram import Bot
+from aiogram.utils.backoff import Backoff, BackoffConfig
+from aiogram.webhook.aiohttp_server import setup_application
+from aiohttp import web
+
+from config import (
+    BASE_WEBHOOK_URL,
+    WEBHOOK_PATH,
+    WEBHOOK_SECRET,
+    WEB_SERVER_HOST,
+    WEB_SERVER_PORT,
+    METRICS_PORT,
+    SEND_GLOBAL_RATE,
+)
+from enums.logs import Logs
+from loggers.setup import LOGGER
+from routes import add_stats_routes, start_stats_server
+from services.send_scheduler import SEND_SCHEDULER
+from services.sharding import CURRENT_SHARD, shard_of, update_user_id
+from setup import setup
+from webhook import BoundedRequestHandler
+
+# Timeout of ``getUpdates`` long polling in seconds
+POLLING_TIMEOUT: int = 30
+
+
+async def set_webhook(bot: Bot) -> None:
+    """
+    Function, which sets webhook for the bot.
+
+    Runs on dispatcher startup.
+
+    :param bot: instance of ``aiogram.Bot``
+    """
+
+    await bot.set_webhook(
+        url=f"{BASE_WEBHOOK_URL}{WEBHOOK_PATH}", secret_token=WEBHOOK_SECRET
+    )
+
+
+class ShardedRequestHandler(BoundedRequestHandler):
+    """Webhook handler-class extended from ``BoundedRequestHandler``, which forwards updates of other shards."""
+
+    def __init__(self, inboxes: list[Queue], **kwargs: Any) -> None:
+        """
+        Creates handler.
+
+        :param inboxes: inbox queues of all workers
+        :param kwargs: arguments of ``BoundedRequestHandler``
+        """
+
+        super().__init__(**kwargs)
+        self.inboxes = inboxes
+
+    async def _handle_request_background(
+        self, bot: Bot, request: web.Request
+    ) -> web.Response:
+        """
+        Overrided function ``_handle_request_background`` from parent class.
+
+        Queues update of own shard and forwards other updates to their workers.
+
+        :param bot: instance of ``aiogram.Bot``
+        :param request: incoming webhook request
+        :return: empty JSON response, ``503`` response if update of own shard is rejected
+        """
+
+        update = await request.json(loads=bot.session.json_loads)
+        shard = shard_of(update_user_id(update), len(self.inboxes))
+        if shard == CURRENT_SHARD.index:
+            return await self._enqueue(bot, update)
+        self.inboxes[shard].put(update)
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+
+async def _consume_inbox(
+    handler: BoundedRequestHandler, bot: Bot, inbox: Queue
+) -> None:
+    """
+    Function, that queues updates from inbox queue into handler of current worker until ``None`` is received.
+
+    Updates of a user, forwarded by other workers or fetched by polling fetcher, share the queue of the user and the
+    free places with updates, received by webhook of current worker, so they are handled in order and within limits.
+
+    :param handler: ``BoundedRequestHandler`` of current worker
+    :param bot: ``aiogram.Bot`` instance
+    :param inbox: inbox queue of current worker
+    """
+
+    loop = asyncio.get_running_loop()
+    while (update := await loop.run_in_executor(None, inbox.get)) is not None:
+        await handler.feed(bot, update)
+
+
+async def _worker_main(
+    index: int, count: int, inboxes: list[Queue], webhook: bool
+) -> None:
+    """
+    Main coroutine of worker process.
+
+    :param index: index of worker
+    :param count: number of workers
+    :param inboxes: inbox queues of all workers
+    :param webhook: run webhook server or consume updates from polling fetcher
+    """
+
+    CURRENT_SHARD.index, CURRENT_SHARD.count = index, count
+    # Bot API limit is shared between workers
+    SEND_SCHEDULER.set_global_rate(SEND_GLOBAL_RATE / count)
+
+    dp, bot = setup()
+    runners = []
+    if METRICS_PORT is not None:
+        runners.append(await start_stats_server(WEB_SERVER_HOST, METRICS_PORT + index))
+
+    loop = asyncio.get_running_loop()
+    inbox = inboxes[index]
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        # Sentinel stops inbox consumer
+        loop.add_signal_handler(sig, inbox.put, None)
+
+    if webhook:
+        if index == 0:
+            dp.startup.register(set_webhook)
+        app = web.Application()
+        handler = ShardedRequestHandler(
+            inboxes=inboxes, dispatcher=dp, bot=bot, secret_token=WEBHOOK_SECRET
+        )
+        handler.register(app, path=WEBHOOK_PATH)
+        add_stats_routes(app)
+        setup_application(app, dp, bot=bot)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(
+            runner, host=WEB_SERVER_HOST, port=WEB_SERVER_PORT, reuse_port=True
+        ).start()
+        runners.insert(0, runner)
+    else:
+        handler = BoundedRequestHandler(dispatcher=dp, bot=bot)
+        await dp.emit_startup(bot=bot, dispatcher=dp, bots=[bot])
+
+    LOGGER.info(Logs.WORKER_STARTED, index + 1, count, os.getpid())
+    try:
+        await _consume_inbox(handler, bot, inbox)
+    finally:
+        # Webhook runner drains handler and emits shutdown of dispatcher on cleanup
+        for runner in runners:
+            await runner.cleanup()
+        if not webhook:
+            await handler.drain()
+            await dp.emit_shutdown(bot=bot, dispatcher=dp, bots=[bot])
+            await bot.session.close()
+        LOGGER.info(Logs.WORKER_STOPPED, index + 1, count)
+
+
+def run_worker(index: int, count: int, inboxes: list[Queue], webhook: bool) -> None:
+    """
+    Entry point of worker process.
+
+    :param index: index of worker
+    :param count: number of workers
+    :param inboxes: inbox queues of all workers
+    :param webhook: run webhook server or consume updates from polling fetcher
+    """
+
+    # Shutdown is started by sentinel in inbox, see ``_worker_main``
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_worker_main(index, count, inboxes, webhook))
+
+
+async def _fetch_updates(inboxes: list[Queue]) -> None:
+    """
+    Function, that fetches updates with ``getUpdates`` and distributes them between workers.
+
+    :param inboxes: inbox queues of all workers
+    """
+
+    dp, bot = setup()
+    allowed_updates = dp.resolve_used_update_types()
+    backoff = Backoff(config=BackoffConfig(1.0, 5.0, 1.3, 0.1))
+    offset = None
+    try:
+        while True:
+            try:
+                updates = await bot.get_updates(
+                    offset=offset,
+                    timeout=POLLING_TIMEOUT,
+                    allowed_updates=allowed_updates,
+                    request_timeout=POLLING_TIMEOUT + 10,
+                )
+            except Exception as e:
+                LOGGER.error(Logs.POLLING_FAILED, e)
+                await backoff.asleep()
+                continue
+
+            backoff.reset()
+            for update in updates:
+                raw = update.model_dump(mode="json", exclude_unset=True, by_alias=True)
+                inboxes[shard_of(update_user_id(raw), len(inboxes))].put(raw)
+                offset = update.update_id + 1
+    finally:
+        await bot.session.close()
+
+
+def run_workers(count: int, webhook: bool) -> None:
+    """
+    Function, that starts worker processes and waits for them.
+
+    In polling mode current process fetches updates for workers. ``SIGINT`` and ``SIGTERM`` stop workers gracefully.
+
+    :param count: number of workers
+    :param webhook: run in webhook mode or in polling mode
+    """
+
+    # Workers are spawned, not forked: logging thread and connections of parent process must not be inherited
+    context = multiprocessing.get_context("spawn")
+    inboxes = [context.Queue() for _ in range(count)]
+    processes = [
+        context.Process(
+            target=run_worker,
+            args=(index, count, inboxes, webhook),
+            name=f"worker-{index + 1}",
+        )
+        for index in range(count)
+    ]
+    for process in processes:
+        process.start()
+
+    def stop(*_: Any) -> None:
+        for inbox in inboxes:
+            inbox.put(None)
+
+    if webhook:
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+    else:
+
+        async def fetch() -> None:
+            task = asyncio.current_task()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, task.cancel)
+            try:
+                await _fetch_updates(inboxes)
+            except asyncio.CancelledError:
+                pass
+
+        asyncio.run(fetch())
+        stop()
+
+    for process in processes:
+        process.join()